@@ -5,6 +5,8 @@ from .result_management import (
     print_h5_tree,
     extract_dataset_from_h5,
     extract_datasets_from_h5group,
+    H5ResultReader,
+    export_summary_to_excel,
 )
 from .diagnostics import get_infeasible_constraints
 from .data_preprocessing import *
@@ -1,3 +1,5 @@
+from pyomo.core.base.component import Component
+
 from .utilities import get_attribute_from_dict
 
 
@@ -39,6 +41,41 @@ class ModelComponent:
 
         self.big_m_transformation_required = 0
 
+    def __getstate__(self):
+        """
+        Returns the state of the component for pickling
+
+        Pyomo components that are stored on the component during model construction
+        (e.g. sets and variables) are not pickled. They are recreated, when the
+        model is constructed again.
+        """
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if not isinstance(value, Component)
+        }
+
+    def get_model_components(self) -> dict:
+        """
+        Returns the pyomo components stored on the component during model construction
+
+        :return: pyomo components by attribute name
+        :rtype: dict
+        """
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if isinstance(value, Component)
+        }
+
+    def set_model_components(self, model_components: dict):
+        """
+        Stores pyomo components on the component (e.g. after unpickling a model)
+
+        :param dict model_components: pyomo components by attribute name
+        """
+        self.__dict__.update(model_components)
+
 
 class Economics:
     """
@@ -170,6 +207,11 @@ class ComponentOptions:
                     component_data["Performance"], "allow_only_one_direction_precise", 1
                 )
 
+        # Formulation of network arcs (arc blocks or compact)
+        self.compact_formulation = get_attribute_from_dict(
+            component_data["Performance"], "compact_formulation", 0
+        )
+
         # other technology specific options
         self.other = {}
 
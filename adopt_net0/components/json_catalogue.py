@@ -0,0 +1,139 @@
+import copy
+import json
+import os
+from pathlib import Path
+
+import logging
+
+log = logging.getLogger(__name__)
+
+_catalogues = {}
+
+
+class JsonCatalogue:
+    """
+    Index of all json files in a data directory and its subdirectories
+
+    The directory tree is scanned once and json files are parsed on first access.
+    The index is renewed, if a directory of the tree is modified (i.e. files are
+    added, removed or renamed), and a parsed file is read again, if the file itself
+    is modified.
+
+    If several files have the same name, the first file found is used (as with
+    os.walk).
+    """
+
+    def __init__(self, root: Path | str):
+        """
+        Constructor
+
+        :param Path, str root: root of the data directory
+        """
+        self.root = Path(root).resolve()
+        self._directory_mtimes = {}
+        self._paths = {}
+        self._paths_lower = {}
+        self._data = {}
+        self._scan()
+
+    def _scan(self):
+        """
+        Scans the directory tree and indexes all json files by name
+        """
+        self._directory_mtimes = {}
+        self._paths = {}
+        self._paths_lower = {}
+        for path, subdirs, files in os.walk(self.root):
+            self._directory_mtimes[path] = os.stat(path).st_mtime_ns
+            for file in files:
+                if file.lower().endswith(".json"):
+                    name = file[:-5]
+                    self._paths.setdefault(name, Path(path) / file)
+                    self._paths_lower.setdefault(name.lower(), Path(path) / file)
+
+    def _is_outdated(self) -> bool:
+        """
+        Checks if a directory of the tree has been modified since the last scan
+
+        :return: True, if the directory tree needs to be scanned again
+        :rtype: bool
+        """
+        if not self._directory_mtimes:
+            return True
+        try:
+            return any(
+                os.stat(path).st_mtime_ns != mtime
+                for path, mtime in self._directory_mtimes.items()
+            )
+        except FileNotFoundError:
+            return True
+
+    def names(self) -> list:
+        """
+        Returns the names of all json files in the catalogue
+
+        :return: names of json files (without file extension)
+        :rtype: list
+        """
+        if self._is_outdated():
+            self._scan()
+        return list(self._paths.keys())
+
+    def get_path(self, name: str, case_sensitive: bool = True) -> Path | None:
+        """
+        Returns the path of the json file with the given name
+
+        :param str name: name of the json file (without file extension)
+        :param bool case_sensitive: if False, the name is matched case-insensitively
+        :return: path of the json file or None, if there is no such file
+        :rtype: Path | None
+        """
+        if self._is_outdated():
+            self._scan()
+        if case_sensitive:
+            return self._paths.get(name)
+        else:
+            return self._paths_lower.get(name.lower())
+
+    def get_data(self, name: str) -> dict | None:
+        """
+        Returns the parsed data of the json file with the given name
+
+        A copy of the data is returned, so that it can be modified by the caller.
+
+        :param str name: name of the json file (without file extension)
+        :return: data of the json file or None, if there is no such file
+        :rtype: dict | None
+        """
+        path = self.get_path(name)
+        if path is None:
+            return None
+
+        mtime = os.stat(path).st_mtime_ns
+        if path not in self._data or self._data[path][0] != mtime:
+            with open(path) as json_file:
+                try:
+                    data = json.load(json_file)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Json file {path} is not valid: {e}")
+            if not isinstance(data, dict):
+                raise ValueError(f"Json file {path} does not contain a json object")
+            self._data[path] = (mtime, data)
+
+        return copy.deepcopy(self._data[path][1])
+
+
+def get_json_catalogue(root: Path | str) -> JsonCatalogue:
+    """
+    Returns the catalogue of a data directory
+
+    Catalogues are created once per directory and shared by all callers.
+
+    :param Path, str root: root of the data directory
+    :return: catalogue of the data directory
+    :rtype: JsonCatalogue
+    """
+    root = Path(root).resolve()
+    if root not in _catalogues:
+        _catalogues[root] = JsonCatalogue(root)
+    return _catalogues[root]
@@ -6,6 +6,11 @@ from ..utilities import (
     determine_variable_scaling,
     determine_constraint_scaling,
 )
+from ...result_management.utilities import (
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
+)
 
 import pandas as pd
 import copy
@@ -78,6 +83,13 @@ class Network(ModelComponent):
     node_from, node_to). For each arc, the following components are defined. Each
     variable is indexed by the timestep :math:`t` (here left out for convenience).
 
+    If ``compact_formulation`` is set to 1 in the performance data of a network, all
+    arcs are modelled in a single block ``arcs_compact`` instead of one block per
+    arc. Its components have the same names as in the arc blocks, but are
+    additionally indexed by the arc (e.g. ``var_flow[t, node_from, node_to]``), which
+    speeds up the construction of networks with many arcs. Use
+    ``get_arc_component`` to access arc components independent of the formulation.
+
     - Decision Variables:
 
         * ``var_size``: Size :math:`S`
@@ -287,32 +299,38 @@ class Network(ModelComponent):
         if self.component_options.energyconsumption:
             b_netw = self._define_energyconsumption_parameters(b_netw)
 
-        def arc_block_init(b_arc, node_from, node_to):
-            """
-            Constructs each arc as a block
-            """
+        if self.component_options.compact_formulation:
+            b_netw = self._define_arcs_compact(b_netw)
+        else:
 
-            b_arc.big_m_transformation_required = 0
-            b_arc = self._define_size_arc(b_arc, b_netw, node_from, node_to)
-            b_arc = self._define_capex_variables_arc(b_arc, b_netw)
-            b_arc = self._define_capex_constraints_arc(
-                b_arc, b_netw, node_from, node_to
-            )
-            b_arc = self._define_flow(b_arc, b_netw)
-            b_arc = self._define_opex_arc(b_arc, b_netw)
-            b_arc = self._define_emissions_arc(b_arc, b_netw)
+            def arc_block_init(b_arc, node_from, node_to):
+                """
+                Constructs each arc as a block
+                """
 
-            if self.component_options.energyconsumption:
-                b_arc = self._define_energyconsumption_arc(b_arc, b_netw)
+                b_arc.big_m_transformation_required = 0
+                b_arc = self._define_size_arc(b_arc, b_netw, node_from, node_to)
+                b_arc = self._define_capex_variables_arc(b_arc, b_netw)
+                b_arc = self._define_capex_constraints_arc(
+                    b_arc, b_netw, node_from, node_to
+                )
+                b_arc = self._define_flow(b_arc, b_netw)
+                b_arc = self._define_opex_arc(b_arc, b_netw)
+                b_arc = self._define_emissions_arc(b_arc, b_netw)
 
-            if b_arc.big_m_transformation_required:
-                b_arc = perform_disjunct_relaxation(b_arc)
+                if self.component_options.energyconsumption:
+                    b_arc = self._define_energyconsumption_arc(b_arc, b_netw)
 
-            # LOG
-            log_msg = f"\t\t - Constructing Arc {node_from} - {node_to} " f"completed"
-            log.info(log_msg)
+                if b_arc.big_m_transformation_required:
+                    b_arc = perform_disjunct_relaxation(b_arc)
+
+                # LOG
+                log_msg = (
+                    f"\t\t - Constructing Arc {node_from} - {node_to} " f"completed"
+                )
+                log.info(log_msg)
 
-        b_netw.arc_block = pyo.Block(b_netw.set_arcs, rule=arc_block_init)
+            b_netw.arc_block = pyo.Block(b_netw.set_arcs, rule=arc_block_init)
 
         # CONSTRAINTS FOR BIDIRECTIONAL NETWORKS
         if self.component_options.allow_only_one_direction:
@@ -919,6 +937,449 @@ class Network(ModelComponent):
 
         return b_arc
 
+    def _define_arcs_compact(self, b_netw):
+        """
+        Constructs all arcs in a single block (compact formulation)
+
+        Instead of one block per arc, all arc variables and constraints are indexed
+        by the arcs (and the timesteps). Names of the components are the same as in
+        the arc blocks.
+
+        :param b_netw: pyomo network block
+        :return: pyomo network block
+        """
+        b_netw.arcs_compact = pyo.Block()
+        b_arcs = b_netw.arcs_compact
+
+        # Timesteps and arcs as one set, so that the cross product is only
+        # flattened once for all time dependent components
+        b_arcs.set_t_arcs = pyo.Set(
+            initialize=[(t, *arc) for t in self.set_t for arc in b_netw.set_arcs],
+            dimen=3,
+        )
+
+        b_arcs.big_m_transformation_required = 0
+        b_arcs = self._define_size_compact(b_arcs, b_netw)
+        b_arcs = self._define_capex_variables_compact(b_arcs, b_netw)
+        b_arcs = self._define_capex_constraints_compact(b_arcs, b_netw)
+        b_arcs = self._define_flow_compact(b_arcs, b_netw)
+        b_arcs = self._define_opex_compact(b_arcs, b_netw)
+        b_arcs = self._define_emissions_compact(b_arcs, b_netw)
+
+        if self.component_options.energyconsumption:
+            b_arcs = self._define_energyconsumption_compact(b_arcs, b_netw)
+
+        if b_arcs.big_m_transformation_required:
+            b_arcs = perform_disjunct_relaxation(b_arcs)
+
+        # LOG
+        log_msg = f"\t\t - Constructing {len(b_netw.set_arcs)} arcs completed"
+        log.info(log_msg)
+
+        return b_netw
+
+    def _define_size_compact(self, b_arcs, b_netw):
+        """
+        Defines the size of all arcs (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+        coeff_ti = self.processed_coeff.time_independent
+
+        if self.component_options.size_is_int:
+            size_domain = pyo.NonNegativeIntegers
+        else:
+            size_domain = pyo.NonNegativeReals
+
+        def init_size_max(para, node_from, node_to):
+            return coeff_ti["size_max_arcs"].at[node_from, node_to]
+
+        b_arcs.para_size_max = pyo.Param(
+            b_netw.set_arcs, domain=size_domain, initialize=init_size_max
+        )
+
+        def init_distance(para, node_from, node_to):
+            return self.distance.at[node_from, node_to]
+
+        b_arcs.distance = pyo.Param(b_netw.set_arcs, initialize=init_distance)
+
+        if self.existing:
+            # Existing network
+            if not self.component_options.decommission:
+                # Decommissioning not possible
+                def init_size(para, node_from, node_to):
+                    return b_netw.para_size_initial[node_from, node_to]
+
+                b_arcs.var_size = pyo.Param(
+                    b_netw.set_arcs,
+                    domain=size_domain,
+                    initialize=init_size,
+                    mutable=True,
+                )
+            else:
+                # Decommissioning possible
+                def init_size_bounds(var, node_from, node_to):
+                    return (
+                        b_netw.para_size_min,
+                        b_netw.para_size_initial[node_from, node_to],
+                    )
+
+                b_arcs.var_size = pyo.Var(
+                    b_netw.set_arcs, domain=size_domain, bounds=init_size_bounds
+                )
+        else:
+            # New network
+            def init_size_bounds(var, node_from, node_to):
+                return (b_netw.para_size_min, b_arcs.para_size_max[node_from, node_to])
+
+            b_arcs.var_size = pyo.Var(
+                b_netw.set_arcs, domain=size_domain, bounds=init_size_bounds
+            )
+
+        return b_arcs
+
+    def _define_capex_variables_compact(self, b_arcs, b_netw):
+        """
+        Defines the capex variables of all arcs (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+
+        def init_capex_bounds(var, node_from, node_to):
+            max_capex = (
+                b_netw.para_capex_gamma1
+                + b_netw.para_capex_gamma2 * b_arcs.para_size_max[node_from, node_to]
+                + b_netw.para_capex_gamma3 * b_arcs.distance[node_from, node_to]
+                + b_netw.para_capex_gamma4
+                * b_arcs.para_size_max[node_from, node_to]
+                * b_arcs.distance[node_from, node_to]
+            )
+            return (0, max_capex)
+
+        # CAPEX auxilliary (used to calculate theoretical CAPEX)
+        b_arcs.var_capex_aux = pyo.Var(b_netw.set_arcs, bounds=init_capex_bounds)
+
+        if self.existing and not self.component_options.decommission:
+            b_arcs.var_capex = pyo.Param(
+                b_netw.set_arcs, domain=pyo.NonNegativeReals, initialize=0, mutable=True
+            )
+        else:
+            b_arcs.var_capex = pyo.Var(b_netw.set_arcs, bounds=init_capex_bounds)
+
+        return b_arcs
+
+    def _define_capex_constraints_compact(self, b_arcs, b_netw):
+        """
+        Defines the capex of all arcs and corresponding constraints (compact
+        formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+
+        def init_capex(const, node_from, node_to):
+            return (
+                b_arcs.var_capex_aux[node_from, node_to]
+                == b_netw.para_capex_gamma1
+                + b_netw.para_capex_gamma2 * b_arcs.var_size[node_from, node_to]
+                + b_netw.para_capex_gamma3 * b_arcs.distance[node_from, node_to]
+                + b_netw.para_capex_gamma4
+                * b_arcs.var_size[node_from, node_to]
+                * b_arcs.distance[node_from, node_to]
+            )
+
+        # CAPEX aux:
+        if self.existing and not self.component_options.decommission:
+            b_arcs.const_capex_aux = pyo.Constraint(b_netw.set_arcs, rule=init_capex)
+        else:
+            b_arcs.big_m_transformation_required = 1
+            s_indicators = range(0, 2)
+
+            def init_installation(dis, node_from, node_to, ind):
+                if ind == 0:  # network not installed
+                    dis.const_capex_aux = pyo.Constraint(
+                        expr=b_arcs.var_capex_aux[node_from, node_to] == 0
+                    )
+                    dis.const_not_installed = pyo.Constraint(
+                        expr=b_arcs.var_size[node_from, node_to] == 0
+                    )
+                else:  # network installed
+                    dis.const_capex_aux = pyo.Constraint(
+                        expr=init_capex(dis, node_from, node_to)
+                    )
+
+            b_arcs.dis_installation = gdp.Disjunct(
+                b_netw.set_arcs, s_indicators, rule=init_installation
+            )
+
+            def bind_disjunctions(dis, node_from, node_to):
+                return [
+                    b_arcs.dis_installation[node_from, node_to, i] for i in s_indicators
+                ]
+
+            b_arcs.disjunction_installation = gdp.Disjunction(
+                b_netw.set_arcs, rule=bind_disjunctions
+            )
+
+        # CAPEX and CAPEX aux
+        if self.existing and self.component_options.decommission:
+
+            def init_capex_decommissioning(const, node_from, node_to):
+                return (
+                    b_arcs.var_capex[node_from, node_to]
+                    == (
+                        b_netw.para_size_initial[node_from, node_to]
+                        - b_arcs.var_size[node_from, node_to]
+                    )
+                    * b_netw.para_decommissioning_cost
+                )
+
+            b_arcs.const_capex = pyo.Constraint(
+                b_netw.set_arcs, rule=init_capex_decommissioning
+            )
+        elif not self.existing:
+
+            def init_capex_new(const, node_from, node_to):
+                return (
+                    b_arcs.var_capex[node_from, node_to]
+                    == b_arcs.var_capex_aux[node_from, node_to]
+                )
+
+            b_arcs.const_capex = pyo.Constraint(b_netw.set_arcs, rule=init_capex_new)
+
+        return b_arcs
+
+    def _define_flow_compact(self, b_arcs, b_netw):
+        """
+        Defines the flow through all arcs and respective losses (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+        rated_capacity = self.input_parameters.rated_power
+        coeff_ti = self.processed_coeff.time_independent
+        size_max = b_arcs.para_size_max.extract_values()
+        distance = b_arcs.distance.extract_values()
+        flow_min = b_netw.para_size_min * rated_capacity
+
+        def init_flow_bounds(var, t, node_from, node_to):
+            return (flow_min, size_max[node_from, node_to] * rated_capacity)
+
+        b_arcs.var_flow = pyo.Var(
+            b_arcs.set_t_arcs,
+            domain=pyo.NonNegativeReals,
+            bounds=init_flow_bounds,
+        )
+        b_arcs.var_losses = pyo.Var(
+            b_arcs.set_t_arcs,
+            domain=pyo.NonNegativeReals,
+            bounds=init_flow_bounds,
+        )
+
+        # Losses
+        def init_flowlosses(const, t, node_from, node_to):
+            return (
+                b_arcs.var_losses[t, node_from, node_to]
+                == b_arcs.var_flow[t, node_from, node_to]
+                * coeff_ti["loss"]
+                * distance[node_from, node_to]
+            )
+
+        b_arcs.const_flowlosses = pyo.Constraint(
+            b_arcs.set_t_arcs, rule=init_flowlosses
+        )
+
+        # Flow-size-constraint
+        def init_size_const_high(const, t, node_from, node_to):
+            return (
+                b_arcs.var_flow[t, node_from, node_to]
+                <= b_arcs.var_size[node_from, node_to] * rated_capacity
+            )
+
+        b_arcs.const_flow_size_high = pyo.Constraint(
+            b_arcs.set_t_arcs, rule=init_size_const_high
+        )
+
+        def init_size_const_low(const, t, node_from, node_to):
+            return (
+                b_arcs.var_size[node_from, node_to]
+                * rated_capacity
+                * coeff_ti["min_transport"]
+                <= b_arcs.var_flow[t, node_from, node_to]
+            )
+
+        b_arcs.const_flow_size_low = pyo.Constraint(
+            b_arcs.set_t_arcs, rule=init_size_const_low
+        )
+        return b_arcs
+
+    def _define_energyconsumption_compact(self, b_arcs, b_netw):
+        """
+        Defines the energyconsumption for all arcs (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+        rated_capacity = self.input_parameters.rated_power
+        size_max = b_arcs.para_size_max.extract_values()
+        distance = b_arcs.distance.extract_values()
+
+        b_arcs.set_t_consumed_carriers_arcs = pyo.Set(
+            initialize=[
+                (t, car, *arc)
+                for t in self.set_t
+                for car in b_netw.set_consumed_carriers
+                for arc in b_netw.set_arcs
+            ],
+            dimen=4,
+        )
+
+        def init_consumption_bounds(var, t, car, node_from, node_to):
+            return (b_netw.para_size_min, size_max[node_from, node_to] * rated_capacity)
+
+        b_arcs.var_consumption_send = pyo.Var(
+            b_arcs.set_t_consumed_carriers_arcs,
+            domain=pyo.NonNegativeReals,
+            bounds=init_consumption_bounds,
+        )
+        b_arcs.var_consumption_receive = pyo.Var(
+            b_arcs.set_t_consumed_carriers_arcs,
+            domain=pyo.NonNegativeReals,
+            bounds=init_consumption_bounds,
+        )
+
+        # Sending node
+        def init_consumption_send(const, t, car, node_from, node_to):
+            return (
+                b_arcs.var_consumption_send[t, car, node_from, node_to]
+                == b_arcs.var_flow[t, node_from, node_to] * b_netw.para_send_kflow[car]
+                + b_arcs.var_flow[t, node_from, node_to]
+                * b_netw.para_send_kflowDistance[car]
+                * distance[node_from, node_to]
+            )
+
+        b_arcs.const_consumption_send = pyo.Constraint(
+            b_arcs.set_t_consumed_carriers_arcs,
+            rule=init_consumption_send,
+        )
+
+        # Receiving node
+        def init_consumption_receive(const, t, car, node_from, node_to):
+            return (
+                b_arcs.var_consumption_receive[t, car, node_from, node_to]
+                == b_arcs.var_flow[t, node_from, node_to]
+                * b_netw.para_receive_kflow[car]
+                + b_arcs.var_flow[t, node_from, node_to]
+                * b_netw.para_receive_kflowDistance[car]
+                * distance[node_from, node_to]
+            )
+
+        b_arcs.const_consumption_receive = pyo.Constraint(
+            b_arcs.set_t_consumed_carriers_arcs,
+            rule=init_consumption_receive,
+        )
+
+        return b_arcs
+
+    def _define_opex_compact(self, b_arcs, b_netw):
+        """
+        Defines OPEX of all arcs (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+        b_arcs.var_opex_variable = pyo.Var(b_arcs.set_t_arcs)
+
+        def init_opex_variable(const, t, node_from, node_to):
+            return (
+                b_arcs.var_opex_variable[t, node_from, node_to]
+                == b_arcs.var_flow[t, node_from, node_to] * b_netw.para_opex_variable
+            )
+
+        b_arcs.const_opex_variable = pyo.Constraint(
+            b_arcs.set_t_arcs, rule=init_opex_variable
+        )
+        return b_arcs
+
+    def _define_emissions_compact(self, b_arcs, b_netw):
+        """
+        Defines emissions of all arcs (compact formulation)
+
+        :param b_arcs: pyomo block containing all arcs
+        :param b_netw: pyomo network block
+        :return: pyomo block containing all arcs
+        """
+        coeff_ti = self.processed_coeff.time_independent
+
+        b_arcs.var_emissions = pyo.Var(b_arcs.set_t_arcs)
+
+        def init_arc_emissions(const, t, node_from, node_to):
+            return (
+                b_arcs.var_emissions[t, node_from, node_to]
+                == b_arcs.var_flow[t, node_from, node_to] * coeff_ti["emissionfactor"]
+                + b_arcs.var_losses[t, node_from, node_to] * coeff_ti["loss2emissions"]
+            )
+
+        b_arcs.const_arc_emissions = pyo.Constraint(
+            b_arcs.set_t_arcs, rule=init_arc_emissions
+        )
+
+        return b_arcs
+
+    def get_arc_component(self, b_netw, name: str, node_from: str, node_to: str):
+        """
+        Returns a component of an arc, independent of the network formulation
+
+        For the arc block formulation, the component of the respective arc block is
+        returned. For the compact formulation, components indexed by arc only are
+        returned as component data, components with further indices (e.g.
+        timesteps) as reference indexed by the remaining indices.
+
+        :param b_netw: pyomo network block
+        :param str name: name of the component (e.g. var_size, var_flow)
+        :param str node_from: node from which arc comes
+        :param str node_to: node to which arc goes
+        :return: pyomo component of the arc
+        """
+        if self.component_options.compact_formulation:
+            component = b_netw.arcs_compact.component(name)
+            if component.dim() == 2:
+                return component[node_from, node_to]
+            else:
+                index = (slice(None),) * (component.dim() - 2) + (node_from, node_to)
+                return pyo.Reference(component[index])
+        else:
+            return b_netw.arc_block[node_from, node_to].component(name)
+
+    def _get_arc_data(self, b_netw, name: str, node_from: str, node_to: str, *index):
+        """
+        Returns a variable or parameter of an arc at an index (e.g. a timestep),
+        independent of the network formulation
+
+        :param b_netw: pyomo network block
+        :param str name: name of the variable or parameter
+        :param str node_from: node from which arc comes
+        :param str node_to: node to which arc goes
+        :param index: further indices of the component (e.g. timestep, carrier)
+        :return: pyomo component data
+        """
+        if self.component_options.compact_formulation:
+            return b_netw.arcs_compact.component(name)[(*index, node_from, node_to)]
+        else:
+            component = b_netw.arc_block[node_from, node_to].component(name)
+            if index:
+                return component[index]
+            else:
+                return component
+
     def _define_bidirectional_constraints(self, b_netw):
         """
         Defines constraints necessary, in case one arc can transport in two directions.
@@ -932,10 +1393,9 @@ class Network(ModelComponent):
         if self.component_options.decommission or not self.existing:
 
             def init_size_bidirectional(const, node_from, node_to):
-                return (
-                    b_netw.arc_block[node_from, node_to].var_size
-                    == b_netw.arc_block[node_to, node_from].var_size
-                )
+                return self._get_arc_data(
+                    b_netw, "var_size", node_from, node_to
+                ) == self._get_arc_data(b_netw, "var_size", node_to, node_from)
 
             b_netw.const_size_bidirectional = pyo.Constraint(
                 b_netw.set_arcs_unique, rule=init_size_bidirectional
@@ -946,9 +1406,10 @@ class Network(ModelComponent):
         # Cut according to Germans work
         def init_cut_bidirectional(const, t, node_from, node_to):
             return (
-                b_netw.arc_block[node_from, node_to].var_flow[t]
-                + b_netw.arc_block[node_to, node_from].var_flow[t]
-                <= b_netw.arc_block[node_from, node_to].var_size * rated_capacity
+                self._get_arc_data(b_netw, "var_flow", node_from, node_to, t)
+                + self._get_arc_data(b_netw, "var_flow", node_to, node_from, t)
+                <= self._get_arc_data(b_netw, "var_size", node_from, node_to)
+                * rated_capacity
             )
 
         b_netw.const_cut_bidirectional = pyo.Constraint(
@@ -963,14 +1424,24 @@ class Network(ModelComponent):
                 if ind == 0:
 
                     def init_bidirectional1(const):
-                        return b_netw.arc_block[node_from, node_to].var_flow[t] == 0
+                        return (
+                            self._get_arc_data(
+                                b_netw, "var_flow", node_from, node_to, t
+                            )
+                            == 0
+                        )
 
                     dis.const_flow_zero = pyo.Constraint(rule=init_bidirectional1)
 
                 else:
 
                     def init_bidirectional2(const):
-                        return b_netw.arc_block[node_to, node_from].var_flow[t] == 0
+                        return (
+                            self._get_arc_data(
+                                b_netw, "var_flow", node_to, node_from, t
+                            )
+                            == 0
+                        )
 
                     dis.const_flow_zero = pyo.Constraint(rule=init_bidirectional2)
 
@@ -1008,7 +1479,7 @@ class Network(ModelComponent):
 
         def init_capex(const):
             return (
-                sum(b_netw.arc_block[arc].var_capex for arc in arc_set)
+                sum(self._get_arc_data(b_netw, "var_capex", *arc) for arc in arc_set)
                 == b_netw.var_capex
             )
 
@@ -1031,7 +1502,9 @@ class Network(ModelComponent):
         def init_opex_fixed(const):
             return (
                 b_netw.para_opex_fixed
-                * sum(b_netw.arc_block[arc].var_capex_aux for arc in arc_set)
+                * sum(
+                    self._get_arc_data(b_netw, "var_capex_aux", *arc) for arc in arc_set
+                )
                 == b_netw.var_opex_fixed
             )
 
@@ -1040,7 +1513,7 @@ class Network(ModelComponent):
         def init_opex_variable(const, t):
             return (
                 sum(
-                    b_netw.arc_block[arc].var_opex_variable[t]
+                    self._get_arc_data(b_netw, "var_opex_variable", *arc, t)
                     for arc in b_netw.set_arcs
                 )
                 == b_netw.var_opex_variable[t]
@@ -1059,8 +1532,8 @@ class Network(ModelComponent):
 
         def init_inflow(const, t, car, node):
             return b_netw.var_inflow[t, car, node] == sum(
-                b_netw.arc_block[from_node, node].var_flow[t]
-                - b_netw.arc_block[from_node, node].var_losses[t]
+                self._get_arc_data(b_netw, "var_flow", from_node, node, t)
+                - self._get_arc_data(b_netw, "var_losses", from_node, node, t)
                 for from_node in b_netw.set_receives_from[node]
             )
 
@@ -1079,7 +1552,7 @@ class Network(ModelComponent):
 
         def init_outflow(const, t, car, node):
             return b_netw.var_outflow[t, car, node] == sum(
-                b_netw.arc_block[node, to_node].var_flow[t]
+                self._get_arc_data(b_netw, "var_flow", node, to_node, t)
                 for to_node in b_netw.set_sends_to[node]
             )
 
@@ -1098,7 +1571,7 @@ class Network(ModelComponent):
 
         def init_netw_emissions(const, t, node):
             return b_netw.var_netw_emissions_pos[t, node] == sum(
-                b_netw.arc_block[from_node, node].var_emissions[t]
+                self._get_arc_data(b_netw, "var_emissions", from_node, node, t)
                 for from_node in b_netw.set_receives_from[node]
             )
 
@@ -1117,10 +1590,14 @@ class Network(ModelComponent):
 
         def init_network_consumption(const, t, car, node):
             return b_netw.var_consumption[t, car, node] == sum(
-                b_netw.arc_block[node, to_node].var_consumption_send[t, car]
+                self._get_arc_data(
+                    b_netw, "var_consumption_send", node, to_node, t, car
+                )
                 for to_node in b_netw.set_sends_to[node]
             ) + sum(
-                b_netw.arc_block[from_node, node].var_consumption_receive[t, car]
+                self._get_arc_data(
+                    b_netw, "var_consumption_receive", from_node, node, t, car
+                )
                 for from_node in b_netw.set_receives_from[node]
             )
 
@@ -1143,10 +1620,12 @@ class Network(ModelComponent):
         coeff_ti = self.processed_coeff.time_independent
 
         for arc_name in model_block.set_arcs:
-            arc = model_block.arc_block[arc_name]
             str = "".join(arc_name)
             arc_group = h5_group.create_group(str)
 
+            def get_arc_component(name):
+                return self.get_arc_component(model_block, name, *arc_name)
+
             arc_group.create_dataset(
                 "para_capex_gamma1", data=model_block.para_capex_gamma1.value
             )
@@ -1162,24 +1641,27 @@ class Network(ModelComponent):
             arc_group.create_dataset("network", data=self.name)
             arc_group.create_dataset("fromNode", data=arc_name[0])
             arc_group.create_dataset("toNode", data=arc_name[1])
-            arc_group.create_dataset("size", data=arc.var_size.value)
-            arc_group.create_dataset("capex", data=arc.var_capex.value)
+            arc_group.create_dataset("size", data=get_arc_component("var_size").value)
+            arc_group.create_dataset("capex", data=get_arc_component("var_capex").value)
             arc_group.create_dataset(
                 "opex_fixed",
-                data=[model_block.para_opex_fixed.value * arc.var_capex_aux.value],
+                data=[
+                    model_block.para_opex_fixed.value
+                    * get_arc_component("var_capex_aux").value
+                ],
             )
+            total_flow = get_values(get_arc_component("var_flow"), self.set_t).sum()
+            total_losses = get_values(get_arc_component("var_losses"), self.set_t).sum()
             arc_group.create_dataset(
                 "opex_variable",
-                data=sum(arc.var_opex_variable[t].value for t in self.set_t),
-            )
-            arc_group.create_dataset(
-                "total_flow", data=sum(arc.var_flow[t].value for t in self.set_t)
+                data=get_values(
+                    get_arc_component("var_opex_variable"), self.set_t
+                ).sum(),
             )
+            arc_group.create_dataset("total_flow", data=total_flow)
             total_emissions = (
-                sum(arc.var_flow[t].value for t in self.set_t)
-                * coeff_ti["emissionfactor"]
-                + sum(arc.var_losses[t].value for t in self.set_t)
-                * coeff_ti["loss2emissions"]
+                total_flow * coeff_ti["emissionfactor"]
+                + total_losses * coeff_ti["loss2emissions"]
             )
             arc_group.create_dataset("total_emissions", data=total_emissions)
 
@@ -1191,32 +1673,40 @@ class Network(ModelComponent):
         :param h5_group: h5 group to write to
         """
         for arc_name in model_block.set_arcs:
-            arc = model_block.arc_block[arc_name]
             str = "".join(arc_name)
             arc_group = h5_group.create_group(str)
 
-            arc_group.create_dataset(
-                "flow", data=[arc.var_flow[t].value for t in self.set_t]
+            def get_arc_component(name):
+                return self.get_arc_component(model_block, name, *arc_name)
+
+            create_time_series_dataset(
+                arc_group, "flow", get_values(get_arc_component("var_flow"), self.set_t)
             )
-            arc_group.create_dataset(
-                "losses", data=[arc.var_losses[t].value for t in self.set_t]
+            create_time_series_dataset(
+                arc_group,
+                "losses",
+                get_values(get_arc_component("var_losses"), self.set_t),
             )
 
-            if arc.find_component("var_consumption_send"):
+            if self.component_options.energyconsumption:
+                consumption_send = get_values_by_carrier(
+                    get_arc_component("var_consumption_send"),
+                    self.set_t,
+                    model_block.set_consumed_carriers,
+                )
+                consumption_receive = get_values_by_carrier(
+                    get_arc_component("var_consumption_receive"),
+                    self.set_t,
+                    model_block.set_consumed_carriers,
+                )
                 for car in model_block.set_consumed_carriers:
-
-                    arc_group.create_dataset(
-                        "consumption_send" + car,
-                        data=[
-                            arc.var_consumption_send[t, car].value for t in self.set_t
-                        ],
+                    create_time_series_dataset(
+                        arc_group, "consumption_send" + car, consumption_send[car]
                     )
-                    arc_group.create_dataset(
+                    create_time_series_dataset(
+                        arc_group,
                         "consumption_receive" + car,
-                        data=[
-                            arc.var_consumption_receive[t, car].value
-                            for t in self.set_t
-                        ],
+                        consumption_receive[car],
                     )
 
     def scale_model(self, b_netw, model, config: dict):
@@ -1235,10 +1725,11 @@ class Network(ModelComponent):
         model = determine_variable_scaling(model, b_netw, f, f_global)
         model = determine_constraint_scaling(model, b_netw, f, f_global)
 
-        for arc in b_netw.arc_block:
-            b_arc = b_netw.arc_block[arc]
+        if not self.component_options.compact_formulation:
+            for arc in b_netw.arc_block:
+                b_arc = b_netw.arc_block[arc]
 
-            model = determine_variable_scaling(model, b_arc, f, f_global)
-            model = determine_constraint_scaling(model, b_arc, f, f_global)
+                model = determine_variable_scaling(model, b_arc, f, f_global)
+                model = determine_constraint_scaling(model, b_arc, f, f_global)
 
         return model
@@ -0,0 +1,236 @@
+import functools
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pvlib
+from scipy.interpolate import interp1d
+from timezonefinder import TimezoneFinder
+
+import logging
+
+log = logging.getLogger(__name__)
+
+CAPACITY_FACTOR_CACHE_FOLDER = "capacity_factors"
+WT_DATA_PATH = (
+    Path(__file__).parent.parent.parent.parent
+    / "data/technology_data/RES/WT_data/WT_data.csv"
+)
+MAX_MEMORY_CACHE_SIZE = 256
+
+_memory_cache = {}
+_disk_cache_path = None
+
+
+def set_capacity_factor_cache_path(cache_path: Path | None):
+    """
+    Sets the directory to store capacity factors in
+
+    :param Path, None cache_path: cache directory, if None, capacity factors are only
+        cached in memory
+    """
+    global _disk_cache_path
+    _disk_cache_path = None if cache_path is None else Path(cache_path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_module_database() -> pd.DataFrame:
+    """
+    Returns the CEC module database of pvlib (loaded once per process)
+
+    :return: module database
+    :rtype: pd.DataFrame
+    """
+    return pvlib.pvsystem.retrieve_sam("CECMod")
+
+
+@functools.lru_cache(maxsize=None)
+def get_turbine_database() -> pd.DataFrame:
+    """
+    Returns the wind turbine power curves (loaded once per process)
+
+    :return: wind turbine data
+    :rtype: pd.DataFrame
+    """
+    return pd.read_csv(WT_DATA_PATH, delimiter=";")
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(lon: float, lat: float) -> str:
+    """
+    Returns the time zone of a location
+
+    :param float lon: longitude
+    :param float lat: latitude
+    :return: time zone
+    :rtype: str
+    """
+    return _get_timezone_finder().timezone_at(lng=lon, lat=lat)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_timezone_finder() -> TimezoneFinder:
+    """
+    Returns a timezone finder (initialized once per process)
+
+    :return: timezone finder
+    :rtype: TimezoneFinder
+    """
+    return TimezoneFinder()
+
+
+def calculate_pv_capacity_factors(
+    climate_data: pd.DataFrame, location: dict, system_data: dict
+) -> tuple:
+    """
+    Calculates capacity factors and specific area requirements of a PV system
+
+    :param pd.DataFrame climate_data: dataframe containing climate data
+    :param dict location: location of the system (lon, lat, alt)
+    :param dict system_data: contains data on tilt, surface_azimuth,
+        module_name, inverter efficiency
+    :return: capacity factors, specific area requirements
+    :rtype: tuple
+    """
+    lon = float(location["lon"])
+    lat = float(location["lat"])
+    alt = float(location["alt"])
+
+    def calculate():
+        module = get_module_database()[system_data["module_name"]]
+
+        # Define temperature losses of module
+        temperature_model_parameters = pvlib.temperature.TEMPERATURE_MODEL_PARAMETERS[
+            "sapm"
+        ]["open_rack_glass_glass"]
+
+        # Create PV model chain
+        inverter_parameters = {
+            "pdc0": 5000,
+            "eta_inv_nom": system_data["inverter_eff"],
+        }
+        system = pvlib.pvsystem.PVSystem(
+            surface_tilt=system_data["tilt"],
+            surface_azimuth=system_data["surface_azimuth"],
+            module_parameters=module,
+            inverter_parameters=inverter_parameters,
+            temperature_model_parameters=temperature_model_parameters,
+        )
+        pv_location = pvlib.location.Location(
+            lat, lon, tz=get_timezone(lon, lat), altitude=alt
+        )
+        pv_model = pvlib.modelchain.ModelChain(
+            system, pv_location, spectral_model="no_loss", aoi_model="physical"
+        )
+
+        # Run system with climate data
+        pv_model.run_model(climate_data)
+
+        # Calculate cap factors
+        power = pv_model.results.ac.p_mp
+        capacity_factor = round(power / module.STC, 3).values
+        specific_area = module.STC / module.A_c / 1000 / 1000
+
+        return capacity_factor, specific_area
+
+    return _get_cached(
+        climate_data,
+        {"type": "pv", "location": [lon, lat, alt], "system": system_data},
+        calculate,
+    )
+
+
+def calculate_wt_capacity_factors(
+    climate_data: pd.DataFrame, name: str, hubheight: float
+) -> tuple:
+    """
+    Calculates capacity factors of a wind turbine
+
+    The power curves are located in ``data/technology_data/RES/WT_data``
+
+    :param pd.DataFrame climate_data: dataframe containing climate data
+    :param str name: name of the wind turbine
+    :param float hubheight: hubheight of wind turbine
+    :return: capacity factors, rated power in kW
+    :rtype: tuple
+    """
+    wt_data = get_turbine_database()
+
+    # match WT with data
+    if name in wt_data["TurbineName"].values:
+        turbine_name = name
+    else:
+        turbine_name = "WindTurbine_Onshore_1500"
+        warnings.warn(
+            "TurbineName not in csv, standard WindTurbine_Onshore_1500 selected."
+        )
+    wt_data = wt_data[wt_data["TurbineName"] == turbine_name]
+
+    def calculate():
+        # Load wind speed and correct for height
+        ws = climate_data["ws10"].to_numpy()
+
+        alpha = 1 / 7
+        if hubheight > 0:
+            ws = ws * (hubheight / 10) ** alpha
+
+        # Make power curve
+        rated_power = wt_data.iloc[0]["RatedPowerkW"]
+        x = np.linspace(0, 35, 71)
+        y = wt_data.iloc[:, 13:84].to_numpy()
+
+        f = interp1d(x, y)
+        capacity_factor = f(np.maximum(ws, 0)) / rated_power
+
+        return capacity_factor[0].round(3), rated_power
+
+    return _get_cached(
+        climate_data[["ws10"]],
+        {"type": "wt", "turbine": turbine_name, "hubheight": hubheight},
+        calculate,
+    )
+
+
+def _get_cached(climate_data: pd.DataFrame, settings: dict, calculate) -> tuple:
+    """
+    Returns capacity factors from the cache or calculates them
+
+    Capacity factors are keyed on a hash of the climate data and the settings
+    (location and system parameters). They are cached in memory and, if a cache
+    path is set, on disk.
+
+    :param pd.DataFrame climate_data: climate data the capacity factors depend on
+    :param dict settings: location and system parameters
+    :param calculate: function calculating the capacity factors
+    :return: capacity factors and further results of calculate
+    :rtype: tuple
+    """
+    # Imported here to avoid a circular import (data_management imports components)
+    from ....data_management.caching import (
+        get_data_frame_hash,
+        read_cached_object,
+        write_cached_object,
+    )
+
+    key = get_data_frame_hash(climate_data, settings)
+    if key in _memory_cache:
+        result = _memory_cache[key]
+    else:
+        result = None
+        if _disk_cache_path is not None:
+            cache_file = (
+                _disk_cache_path / CAPACITY_FACTOR_CACHE_FOLDER / (key + ".pkl")
+            )
+            result = read_cached_object(cache_file)
+        if result is None:
+            result = calculate()
+            if _disk_cache_path is not None:
+                write_cached_object(cache_file, result)
+
+        if len(_memory_cache) >= MAX_MEMORY_CACHE_SIZE:
+            del _memory_cache[next(iter(_memory_cache))]
+        _memory_cache[key] = result
+
+    capacity_factor, other = result
+    return capacity_factor.copy(), other
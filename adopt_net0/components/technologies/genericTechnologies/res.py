@@ -1,14 +1,18 @@
-import warnings
-import pvlib
-from timezonefinder import TimezoneFinder
 import pandas as pd
-from pathlib import Path
 import pyomo.environ as pyo
-from scipy.interpolate import interp1d
 import numpy as np
 
+from .capacity_factors import (
+    calculate_pv_capacity_factors,
+    calculate_wt_capacity_factors,
+)
 from ..technology import Technology
 from ...utilities import get_attribute_from_dict
+from ....result_management.utilities import (
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
+)
 
 
 class Res(Technology):
@@ -84,6 +88,8 @@ class Res(Technology):
         """
         Calculates capacity factors and specific area requirements for a PV system using pvlib
 
+        Capacity factors are cached per location, climate data and system parameters.
+
         :param pd.Dataframe climate_data: dataframe containing climate data
         :param dict location: dict containing location details
         :param PV_type: (optional) can specify a certain type of module, angle, ...
@@ -97,51 +103,6 @@ class Res(Technology):
         else:
             system_data = kwargs["system_data"]
 
-        def define_pv_system(location: dict, system_data: dict):
-            """
-            defines the pv system
-            :param dict location: location information (latitude, longitude, altitude,
-            time zone)
-            :param dict system_data: contains data on tilt, surface_azimuth,
-            module_name, inverter efficiency
-            :return: returns PV model chain, peak power, specific area requirements
-            """
-            module_database = pvlib.pvsystem.retrieve_sam("CECMod")
-            module = module_database[system_data["module_name"]]
-
-            # Define temperature losses of module
-            temperature_model_parameters = (
-                pvlib.temperature.TEMPERATURE_MODEL_PARAMETERS["sapm"][
-                    "open_rack_glass_glass"
-                ]
-            )
-
-            # Create PV model chain
-            inverter_parameters = {
-                "pdc0": 5000,
-                "eta_inv_nom": system_data["inverter_eff"],
-            }
-            system = pvlib.pvsystem.PVSystem(
-                surface_tilt=system_data["tilt"],
-                surface_azimuth=system_data["surface_azimuth"],
-                module_parameters=module,
-                inverter_parameters=inverter_parameters,
-                temperature_model_parameters=temperature_model_parameters,
-            )
-
-            pv_model = pvlib.modelchain.ModelChain(
-                system, location, spectral_model="no_loss", aoi_model="physical"
-            )
-            peakpower = module.STC
-            specific_area = module.STC / module.A_c / 1000 / 1000
-
-            return pv_model, peakpower, specific_area
-
-        # Define parameters for convinience
-        lon = location["lon"]
-        lat = location["lat"]
-        alt = location["alt"]
-
         if (
             (np.isnan(location["lon"]))
             or (np.isnan(location["lat"]))
@@ -152,23 +113,12 @@ class Res(Technology):
                 "location in the NodeLocations.csv file"
             )
 
-        # Get location
-        tf = TimezoneFinder()
-        tz = tf.timezone_at(lng=lon, lat=lat)
-        location = pvlib.location.Location(lat, lon, tz=tz, altitude=alt)
-
-        # Initialize pv_system
-        pv_model, peakpower, specific_area = define_pv_system(location, system_data)
-
-        # Run system with climate data
-        pv_model.run_model(climate_data)
-
-        # Calculate cap factors
-        power = pv_model.results.ac.p_mp
-        capacity_factor = round(power / peakpower, 3)
+        capacity_factor, specific_area = calculate_pv_capacity_factors(
+            climate_data, location, system_data
+        )
 
         # Coefficients
-        self.processed_coeff.time_dependent_full["capfactor"] = capacity_factor.values
+        self.processed_coeff.time_dependent_full["capfactor"] = capacity_factor
         self.processed_coeff.time_independent["specific_area"] = specific_area
 
     def _perform_fitting_ST(self, climate_data: pd.DataFrame):
@@ -189,51 +139,12 @@ class Res(Technology):
         :param pd.Dataframe climate_data: dataframe containing climate data
         :param float hubheight: hubheight of wind turbine
         """
-        # Load data for wind turbine type
-        wt_path = Path(__file__).parent.parent.parent.parent
-        wt_data_path = wt_path / "data/technology_data/RES/WT_data/WT_data.csv"
-        wt_data = pd.read_csv(wt_data_path, delimiter=";")
-
-        # match WT with data
-        if self.name in wt_data["TurbineName"]:
-            wt_data = wt_data[wt_data["TurbineName"] == self.name]
-        else:
-            wt_data = wt_data[wt_data["TurbineName"] == "WindTurbine_Onshore_1500"]
-            warnings.warn(
-                "TurbineName not in csv, standard WindTurbine_Onshore_1500 selected."
-            )
-
-        # Load wind speed and correct for height
-        ws = climate_data["ws10"]
-
-        # TODO: make power exponent choice possible
-        # TODO: Make different heights possible
-        alpha = 1 / 7
-        # if data.node_data.windPowerExponent(node) >= 0
-        #     alpha = data.node_data.windPowerExponent(node);
-        # else:
-        #     if data.node_data.offshore(node) == 1:
-        #         alpha = 0.45;
-        #     else:
-        #         alpha = 1 / 7;
-
-        if hubheight > 0:
-            ws = ws * (hubheight / 10) ** alpha
-
-        # Make power curve
-        rated_power = wt_data.iloc[0]["RatedPowerkW"]
-        x = np.linspace(0, 35, 71)
-        y = wt_data.iloc[:, 13:84]
-        y = y.to_numpy()
-
-        f = interp1d(x, y)
-        ws[ws < 0] = 0
-        capacity_factor = f(ws) / rated_power
+        capacity_factor, rated_power = calculate_wt_capacity_factors(
+            climate_data, self.name, hubheight
+        )
 
         # Coefficients
-        self.processed_coeff.time_dependent_full["capfactor"] = capacity_factor[
-            0
-        ].round(3)
+        self.processed_coeff.time_dependent_full["capfactor"] = capacity_factor
         # Rated Power
         self.input_parameters.rated_power = rated_power / 1000
 
@@ -349,28 +260,30 @@ class Res(Technology):
         rated_power = self.input_parameters.rated_power
         capfactor = self.processed_coeff.time_dependent_used["capfactor"]
 
-        h5_group.create_dataset(
-            "max_out",
-            data=[
-                capfactor[t - 1] * model_block.var_size.value * rated_power
-                for t in self.set_t_performance
-            ],
+        max_out = (
+            np.asarray(capfactor, dtype=float)[
+                np.asarray(list(self.set_t_performance)) - 1
+            ]
+            * model_block.var_size.value
+            * rated_power
         )
+        create_time_series_dataset(h5_group, "max_out", max_out)
 
-        h5_group.create_dataset("cap_factor", data=capfactor)
+        create_time_series_dataset(h5_group, "cap_factor", capfactor)
 
         if self.component_options.other["curtailment"] == 2:
-            h5_group.create_dataset(
+            create_time_series_dataset(
+                h5_group,
                 "units_on",
-                data=[model_block.var_size_on[t].value for t in self.set_t_performance],
+                get_values(model_block.var_size_on, self.set_t_performance),
             )
 
-        for car in model_block.set_output_carriers:
-            h5_group.create_dataset(
-                "curtailment_" + car,
-                data=[
-                    capfactor[t - 1] * model_block.var_size.value * rated_power
-                    - model_block.var_output[t, car].value
-                    for t in self.set_t_performance
-                ],
+        outputs = get_values_by_carrier(
+            model_block.var_output,
+            self.set_t_performance,
+            model_block.set_output_carriers,
+        )
+        for car in outputs:
+            create_time_series_dataset(
+                h5_group, "curtailment_" + car, max_out - outputs[car]
             )
@@ -10,6 +10,7 @@ from ....components.utilities import (
     link_full_resolution_to_clustered,
 )
 from ...component import InputParameters
+from ....result_management.utilities import create_time_series_dataset, get_values
 
 
 class Sink(Technology):
@@ -357,9 +358,10 @@ class Sink(Technology):
         """
         super(Sink, self).write_results_tec_operation(h5_group, model_block)
 
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "storage_level",
-            data=[model_block.var_storage_level[t].value for t in self.set_t_full],
+            get_values(model_block.var_storage_level, self.set_t_full),
         )
 
     def write_results_tec_design(self, h5_group: h5py.Group, model_block: pyo.Block):
@@ -11,6 +11,7 @@ from ....components.utilities import (
     get_attribute_from_dict,
     link_full_resolution_to_clustered,
 )
+from ....result_management.utilities import create_time_series_dataset, get_values
 
 
 class Stor(Technology):
@@ -714,9 +715,10 @@ class Stor(Technology):
         """
         super(Stor, self).write_results_tec_operation(h5_group, model_block)
 
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "storage_level",
-            data=[model_block.var_storage_level[t].value for t in self.set_t_full],
+            get_values(model_block.var_storage_level, self.set_t_full),
         )
 
     def _define_ramping_rates(self, b_tec, data, sequence_storage):
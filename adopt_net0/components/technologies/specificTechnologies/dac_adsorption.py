@@ -1,18 +1,86 @@
+import functools
 import pyomo.environ as pyo
 import pyomo.gdp as gdp
-import copy
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from scipy.interpolate import griddata
+from scipy.interpolate import LinearNDInterpolator
 
 from ..utilities import fit_piecewise_function
 from ..technology import Technology
+from ....result_management.utilities import create_time_series_dataset, get_values
 
 import logging
 
 log = logging.getLogger(__name__)
 
+PERFORMANCE_DATA_PATH = (
+    Path(__file__).parent.parent.parent.parent
+    / "data/technology_data/CO2Capture/DAC_adsorption_data/dac_adsorption_performance.txt"
+)
+PERFORMANCE_VARIABLES = ["CO2_Out", "E_tot", "E_el"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_performance_interpolators(performance_data_path: Path) -> tuple:
+    """
+    Reads the DAC performance data and creates interpolators of the performance
+
+    The performance of all operating points is interpolated linearly on the ambient
+    temperature and humidity. Operating points sharing the same grid of temperature
+    and humidity share one interpolator (and thus one triangulation). The result is
+    cached, so that the triangulation is only computed once per performance table.
+
+    :param Path performance_data_path: path to performance data
+    :return: minimal temperature in the performance data, number of operating
+        points and a list of tuples (operating points, interpolator). Interpolators
+        return an array of shape (timesteps, operating points, variables)
+    :rtype: tuple
+    """
+    performance_data = pd.read_csv(performance_data_path, sep=",")
+    performance_data = performance_data.rename(
+        columns={"T": "temp_air", "RH": "humidity"}
+    )
+
+    # Unit Conversion of input data
+    performance_data.E_tot = performance_data.E_tot.multiply(
+        performance_data.CO2_Out / 3600
+    )  # in MWh / h
+    performance_data.E_el = performance_data.E_el.multiply(
+        performance_data.CO2_Out / 3600
+    )  # in MWh / h
+    performance_data.E_th = performance_data.E_th.multiply(
+        performance_data.CO2_Out / 3600
+    )  # in MWh / h
+    performance_data.CO2_Out = performance_data.CO2_Out / 1000  # in t / h
+
+    # Group operating points by grid
+    grids = {}
+    for point, point_data in performance_data.groupby("Point"):
+        grid = tuple(map(tuple, point_data[["temp_air", "humidity"]].to_numpy()))
+        grids.setdefault(grid, []).append(point)
+
+    interpolators = []
+    for grid, points in grids.items():
+        values = np.stack(
+            [
+                performance_data.loc[
+                    performance_data.Point == point, PERFORMANCE_VARIABLES
+                ].to_numpy()
+                for point in points
+            ],
+            axis=1,
+        )
+        interpolators.append(
+            (np.array(points), LinearNDInterpolator(np.array(grid), values))
+        )
+
+    return (
+        min(performance_data.temp_air),
+        len(performance_data.Point.unique()),
+        interpolators,
+    )
+
 
 class DacAdsorption(Technology):
     """
@@ -55,59 +123,21 @@ class DacAdsorption(Technology):
         nr_segments = self.input_parameters.performance_data["nr_segments"]
 
         # Read performance data from file
-        performance_data_path = Path(__file__).parent.parent.parent.parent
-        performance_data_path = (
-            performance_data_path
-            / "data/technology_data/CO2Capture/DAC_adsorption_data/dac_adsorption_performance.txt"
+        min_temp_air, nr_points, interpolators = get_performance_interpolators(
+            PERFORMANCE_DATA_PATH
         )
 
-        performance_data = pd.read_csv(performance_data_path, sep=",")
-        performance_data = performance_data.rename(
-            columns={"T": "temp_air", "RH": "humidity"}
-        )
-
-        # Unit Conversion of input data
-        performance_data.E_tot = performance_data.E_tot.multiply(
-            performance_data.CO2_Out / 3600
-        )  # in MWh / h
-        performance_data.E_el = performance_data.E_el.multiply(
-            performance_data.CO2_Out / 3600
-        )  # in MWh / h
-        performance_data.E_th = performance_data.E_th.multiply(
-            performance_data.CO2_Out / 3600
-        )  # in MWh / h
-        performance_data.CO2_Out = performance_data.CO2_Out / 1000  # in t / h
-
-        # Get humidity and temperature
-        RH = copy.deepcopy(climate_data["rh"])
-        T = copy.deepcopy(climate_data["temp_air"])
-
-        # Set minimum temperature
-        T.loc[T < min(performance_data.temp_air)] = min(performance_data.temp_air)
+        # Get humidity and temperature (with minimum temperature)
+        RH = climate_data["rh"].to_numpy()
+        T = np.maximum(climate_data["temp_air"].to_numpy(), min_temp_air)
 
         # Derive performance points for each timestep
-        def interpolate_performance_point(t, rh, point_data, var):
-            zi = griddata(
-                (point_data.temp_air, point_data.humidity),
-                point_data[var],
-                (T, RH),
-                method="linear",
-            )
-            return zi
-
-        CO2_Out = np.empty(shape=(len(T), len(performance_data.Point.unique())))
-        E_tot = np.empty(shape=(len(T), len(performance_data.Point.unique())))
-        E_el = np.empty(shape=(len(T), len(performance_data.Point.unique())))
-        for point in performance_data.Point.unique():
-            CO2_Out[:, point - 1] = interpolate_performance_point(
-                T, RH, performance_data.loc[performance_data.Point == point], "CO2_Out"
-            )
-            E_tot[:, point - 1] = interpolate_performance_point(
-                T, RH, performance_data.loc[performance_data.Point == point], "E_tot"
-            )
-            E_el[:, point - 1] = interpolate_performance_point(
-                T, RH, performance_data.loc[performance_data.Point == point], "E_el"
-            )
+        performance = np.empty(shape=(len(T), nr_points, len(PERFORMANCE_VARIABLES)))
+        for points, interpolator in interpolators:
+            performance[:, points - 1, :] = interpolator(T, RH)
+        CO2_Out = performance[:, :, PERFORMANCE_VARIABLES.index("CO2_Out")]
+        E_tot = performance[:, :, PERFORMANCE_VARIABLES.index("E_tot")]
+        E_el = performance[:, :, PERFORMANCE_VARIABLES.index("E_el")]
 
         # Derive piecewise definition
         alpha = np.empty(shape=(len(T), nr_segments))
@@ -442,17 +472,12 @@ class DacAdsorption(Technology):
         """
         super(DacAdsorption, self).write_results_tec_operation(h5_group, model_block)
 
-        h5_group.create_dataset(
-            "modules_on",
-            data=[
-                model_block.var_modules_on[self.sequence[t - 1]].value
-                for t in self.set_t_performance
-            ],
+        sequence = [self.sequence[t - 1] for t in self.set_t_performance]
+        create_time_series_dataset(
+            h5_group, "modules_on", get_values(model_block.var_modules_on, sequence)
         )
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "ohmic_heating",
-            data=[
-                model_block.var_input_ohmic[self.sequence[t - 1]].value
-                for t in self.set_t_performance
-            ],
+            get_values(model_block.var_input_ohmic, sequence),
         )
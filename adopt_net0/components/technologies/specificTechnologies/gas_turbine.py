@@ -6,6 +6,7 @@ import pandas as pd
 
 from ..technology import Technology
 from ...utilities import link_full_resolution_to_clustered
+from ....result_management.utilities import create_time_series_dataset, get_values
 
 
 class GasTurbine(Technology):
@@ -388,9 +389,10 @@ class GasTurbine(Technology):
         """
         super(GasTurbine, self).write_results_tec_operation(h5_group, model_block)
 
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "modules_on",
-            data=[model_block.var_units_on[t].value for t in self.set_t_performance],
+            get_values(model_block.var_units_on, self.set_t_performance),
         )
 
     def _define_ramping_rates(self, b_tec, data):
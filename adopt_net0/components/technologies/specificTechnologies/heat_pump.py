@@ -5,7 +5,11 @@ import numpy as np
 import statsmodels.api as sm
 import pandas as pd
 
-from ..utilities import fit_piecewise_function, fit_linear_function
+from ..utilities import (
+    fit_linear_function_vectorised,
+    fit_piecewise_function_vectorised,
+    sig_figs_array,
+)
 from ..technology import Technology
 from ...utilities import link_full_resolution_to_clustered
 
@@ -96,77 +100,46 @@ class HeatPump(Technology):
 
         log.info("Deriving performance data for Heat Pump...")
 
-        if (
-            self.component_options.performance_function_type == 1
-            or self.component_options.performance_function_type == 2
-        ):  # Linear performance function
-            size_alpha = 1
-        elif self.component_options.performance_function_type == 3:
-            size_alpha = 2
-        else:
+        if self.component_options.performance_function_type not in [1, 2, 3]:
             raise Exception(
                 "performance_function_type must be an integer between 1 and 3"
             )
 
-        fit = {}
-        fit["out"] = {}
-        alpha1 = np.empty(shape=(time_steps, size_alpha))
-        alpha2 = np.empty(shape=(time_steps, size_alpha))
-        bp_x = np.empty(shape=(time_steps, size_alpha + 1))
-
-        for idx, cop_t in enumerate(cop):
-            if idx % 100 == 1:
-                print("\rComplete: ", round(idx / time_steps, 2) * 100, "%", end="")
-
-            if self.component_options.performance_function_type == 1:
-                x = np.linspace(
-                    self.input_parameters.performance_data["min_part_load"], 1, 9
-                )
-                y = (x / (1 - 0.9 * (1 - x))) * cop_t * x
-                coeff = fit_linear_function(x, y)
-                alpha1[idx, :] = coeff[0]
+        # Fit performance once for each unique COP and for all COPs at once
+        cop_unique, cop_index = np.unique(
+            np.asarray(cop, dtype=float), return_inverse=True
+        )
+        cop_index = cop_index.reshape(-1)
 
-            elif self.component_options.performance_function_type == 2:
-                x = np.linspace(
-                    self.input_parameters.performance_data["min_part_load"], 1, 9
-                )
-                y = (x / (1 - 0.9 * (1 - x))) * cop_t * x
-                x = sm.add_constant(x)
-                coeff = fit_linear_function(x, y)
-                alpha1[idx, :] = coeff[1]
-                alpha2[idx, :] = coeff[0]
-
-            elif (
-                self.component_options.performance_function_type == 3
-            ):  # piecewise performance function
-                y = {}
-                x = np.linspace(
-                    self.input_parameters.performance_data["min_part_load"], 1, 9
-                )
-                y["out"] = (x / (1 - 0.9 * (1 - x))) * cop_t * x
-                time_step_fit = fit_piecewise_function(x, y, 2)
-                alpha1[idx, :] = time_step_fit["out"]["alpha1"]
-                alpha2[idx, :] = time_step_fit["out"]["alpha2"]
-                bp_x[idx, :] = time_step_fit["out"]["bp_x"]
-        print("Complete: ", 100, "%")
+        x = np.linspace(self.input_parameters.performance_data["min_part_load"], 1, 9)
+        y = (x / (1 - 0.9 * (1 - x))) * x * cop_unique[:, np.newaxis]
 
-        # Coefficients
+        fit = {}
         fit["coeff"] = {}
         if self.component_options.performance_function_type == 1:
-            fit["coeff"]["alpha1"] = alpha1.round(5)
+            coeff = fit_linear_function_vectorised(x, y)
+            fit["coeff"]["alpha1"] = coeff[cop_index].round(5)
 
         elif (
             self.component_options.performance_function_type == 2
         ):  # Linear performance function
-            fit["coeff"]["alpha1"] = alpha1.round(5)
-            fit["coeff"]["alpha2"] = alpha2.round(5)
+            coeff = fit_linear_function_vectorised(sm.add_constant(x), y)
+            fit["coeff"]["alpha1"] = coeff[cop_index, 1:].round(5)
+            fit["coeff"]["alpha2"] = coeff[cop_index, :1].round(5)
 
         elif (
             self.component_options.performance_function_type == 3
         ):  # Piecewise performance function
-            fit["coeff"]["alpha1"] = alpha1.round(5)
-            fit["coeff"]["alpha2"] = alpha2.round(5)
-            fit["coeff"]["bp_x"] = bp_x.round(5)
+            piecewise_fit = fit_piecewise_function_vectorised(x, y, 2)
+            fit["coeff"]["alpha1"] = sig_figs_array(piecewise_fit["alpha1"], 4)[
+                cop_index
+            ].round(5)
+            fit["coeff"]["alpha2"] = sig_figs_array(piecewise_fit["alpha2"], 4)[
+                cop_index
+            ].round(5)
+            fit["coeff"]["bp_x"] = np.tile(
+                sig_figs_array(piecewise_fit["bp_x"], 4).round(5), (time_steps, 1)
+            )
 
         # Coefficients
         self.processed_coeff.time_dependent_full = fit["coeff"]
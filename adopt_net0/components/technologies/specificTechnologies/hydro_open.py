@@ -5,6 +5,11 @@ import pandas as pd
 
 from ...utilities import get_attribute_from_dict, link_full_resolution_to_clustered
 from ..technology import Technology
+from ....result_management.utilities import (
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
+)
 
 
 class HydroOpen(Technology):
@@ -391,17 +396,19 @@ class HydroOpen(Technology):
         """
         super(HydroOpen, self).write_results_tec_operation(h5_group, model_block)
 
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "spilling",
-            data=[model_block.var_spilling[t].value for t in self.set_t_performance],
+            get_values(model_block.var_spilling, self.set_t_performance),
         )
-        for car in model_block.set_input_carriers:
-            h5_group.create_dataset(
-                "storage_level_" + car,
-                data=[
-                    model_block.var_storage_level[t, car].value
-                    for t in self.set_t_performance
-                ],
+        storage_level = get_values_by_carrier(
+            model_block.var_storage_level,
+            self.set_t_performance,
+            model_block.set_input_carriers,
+        )
+        for car in storage_level:
+            create_time_series_dataset(
+                h5_group, "storage_level_" + car, storage_level[car]
             )
 
     def _define_ramping_rates(self, b_tec, data):
@@ -12,6 +12,11 @@ from ..utilities import (
     determine_constraint_scaling,
 )
 from .utilities import set_capex_model
+from ...result_management.utilities import (
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
+)
 from .ccs import fit_ccs_coeff
 
 import logging
@@ -1230,9 +1235,7 @@ class Technology(ModelComponent):
         h5_group.create_dataset("capex_tot", data=[model_block.var_capex_tot.value])
         h5_group.create_dataset(
             "opex_variable",
-            data=[
-                sum(model_block.var_opex_variable[t].value for t in self.set_t_global)
-            ],
+            data=[get_values(model_block.var_opex_variable, self.set_t_global).sum()],
         )
         h5_group.create_dataset(
             "opex_fixed_tot", data=[model_block.var_opex_fixed_tot.value]
@@ -1240,19 +1243,13 @@ class Technology(ModelComponent):
         h5_group.create_dataset(
             "emissions_pos",
             data=[
-                sum(
-                    model_block.var_tec_emissions_pos[t].value
-                    for t in self.set_t_global
-                )
+                get_values(model_block.var_tec_emissions_pos, self.set_t_global).sum()
             ],
         )
         h5_group.create_dataset(
             "emissions_neg",
             data=[
-                sum(
-                    model_block.var_tec_emissions_neg[t].value
-                    for t in self.set_t_global
-                )
+                get_values(model_block.var_tec_emissions_neg, self.set_t_global).sum()
             ],
         )
         if self.component_options.ccs_possible:
@@ -1278,82 +1275,61 @@ class Technology(ModelComponent):
         :param model_block: pyomo network block
         :param h5_group: h5 group to write to
         """
-
-        for car in model_block.set_input_carriers_all:
-            if model_block.find_component("var_input"):
-                h5_group.create_dataset(
-                    f"{car}_input",
-                    data=[
-                        model_block.var_input_tot[t, car].value
-                        for t in self.set_t_global
-                    ],
-                )
-        for car in model_block.set_output_carriers_all:
-            h5_group.create_dataset(
-                f"{car}_output",
-                data=[
-                    model_block.var_output_tot[t, car].value for t in self.set_t_global
-                ],
+        if model_block.find_component("var_input"):
+            inputs = get_values_by_carrier(
+                model_block.var_input_tot,
+                self.set_t_global,
+                model_block.set_input_carriers_all,
             )
-        h5_group.create_dataset(
+            for car in inputs:
+                create_time_series_dataset(h5_group, f"{car}_input", inputs[car])
+        outputs = get_values_by_carrier(
+            model_block.var_output_tot,
+            self.set_t_global,
+            model_block.set_output_carriers_all,
+        )
+        for car in outputs:
+            create_time_series_dataset(h5_group, f"{car}_output", outputs[car])
+        create_time_series_dataset(
+            h5_group,
             "emissions_pos",
-            data=[
-                model_block.var_tec_emissions_pos[t].value for t in self.set_t_global
-            ],
+            get_values(model_block.var_tec_emissions_pos, self.set_t_global),
         )
-        h5_group.create_dataset(
+        create_time_series_dataset(
+            h5_group,
             "emissions_neg",
-            data=[
-                model_block.var_tec_emissions_neg[t].value for t in self.set_t_global
-            ],
+            get_values(model_block.var_tec_emissions_neg, self.set_t_global),
         )
-        if model_block.find_component("var_x"):
-            h5_group.create_dataset(
-                "var_x",
-                data=[
-                    0 if x is None else x
-                    for x in [
-                        model_block.var_x[t].value for t in self.set_t_performance
-                    ]
-                ],
-            )
-        if model_block.find_component("var_y"):
-            h5_group.create_dataset(
-                "var_y",
-                data=[
-                    0 if x is None else x
-                    for x in [
-                        model_block.var_y[t].value for t in self.set_t_performance
-                    ]
-                ],
-            )
-        if model_block.find_component("var_z"):
-            h5_group.create_dataset(
-                "var_z",
-                data=[
-                    0 if x is None else x
-                    for x in [
-                        model_block.var_z[t].value for t in self.set_t_performance
-                    ]
-                ],
-            )
+        for var in ["var_x", "var_y", "var_z"]:
+            if model_block.find_component(var):
+                create_time_series_dataset(
+                    h5_group,
+                    var,
+                    np.nan_to_num(
+                        get_values(
+                            model_block.find_component(var), self.set_t_performance
+                        )
+                    ),
+                )
 
         if model_block.find_component("set_input_carriers_ccs"):
-            for car in model_block.set_input_carriers_ccs:
-                h5_group.create_dataset(
-                    f"{car}_var_input_ccs",
-                    data=[
-                        model_block.var_input_ccs[t, car].value
-                        for t in self.set_t_performance
-                    ],
+            inputs_ccs = get_values_by_carrier(
+                model_block.var_input_ccs,
+                self.set_t_performance,
+                model_block.set_input_carriers_ccs,
+            )
+            for car in inputs_ccs:
+                create_time_series_dataset(
+                    h5_group, f"{car}_var_input_ccs", inputs_ccs[car]
                 )
-            for car in model_block.set_output_carriers_ccs:
-                h5_group.create_dataset(
-                    f"{car}_var_output_ccs",
-                    data=[
-                        model_block.var_output_ccs[t, car].value
-                        for t in self.set_t_performance
-                    ],
+            outputs_ccs = get_values_by_carrier(
+                model_block.var_output_ccs,
+                self.set_t_performance,
+                model_block.set_output_carriers_ccs,
+            )
+            for car in outputs_ccs:
+                create_time_series_dataset(
+                    h5_group, f"{car}_var_output_ccs", outputs_ccs[car]
                 )
 
     def scale_model(self, b_tec, model, config):
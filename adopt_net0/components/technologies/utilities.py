@@ -1,11 +1,11 @@
-import json
-import os
 import pwlf
 import numpy as np
 from math import floor, log10
 from statsmodels import api as sm
 from pathlib import Path
 
+from ..json_catalogue import get_json_catalogue
+
 
 def open_json(tec: str, load_path: str | Path) -> dict:
     """
@@ -16,20 +16,10 @@ def open_json(tec: str, load_path: str | Path) -> dict:
     :return: dict with technology data from json
     :rtype: dict
     """
-    # Read in JSON files
-    for path, subdirs, files in os.walk(load_path):
-        if "technology_data" in locals():
-            break
-        else:
-            for name in files:
-                if (tec + ".json") == name:
-                    filepath = os.path.join(path, name)
-                    with open(filepath) as json_file:
-                        technology_data = json.load(json_file)
-                    break
+    technology_data = get_json_catalogue(load_path).get_data(tec)
 
     # Assign name
-    if "technology_data" in locals():
+    if technology_data is not None:
         technology_data["Name"] = tec
     else:
         raise Exception("There is no json data file for technology " + tec)
@@ -132,6 +122,71 @@ def fit_piecewise_function(X: np.array, Y: np.array, nr_segments: int) -> dict:
     return fit
 
 
+def fit_linear_function_vectorised(x: np.array, Y: np.array) -> np.array:
+    """
+    Fits linear models to multiple y-series with the same x data at once
+
+    Gives the same coefficients as fit_linear_function for each y-series, but solves
+    a single least squares problem for all series.
+
+    :param np.array x: x data (one-dimensional for a regression through the origin,
+        add a constant with sm.add_constant to fit an intercept)
+    :param np.array Y: y data, one series per row
+    :return: coefficients of OLS regression, one row per series
+    :rtype: np.array
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+
+    coeff = np.linalg.lstsq(x, Y.T, rcond=None)[0]
+    return coeff.T
+
+
+def fit_piecewise_function_vectorised(
+    x: np.array, Y: np.array, nr_segments: int, bp_x: np.array = None
+) -> dict:
+    """
+    Fits piecewise defined functions with shared breakpoints to multiple y-series
+    at once
+
+    If no breakpoints are given, they are determined once with pwlf for the mean of
+    all y-series. For fixed breakpoints, the fit is a linear least squares problem
+    that is solved for all series at once.
+
+    :param np.array x: x-values of data
+    :param np.array Y: y-values of data, one series per row
+    :param int nr_segments: number of segments on piecewise defined function
+    :param np.array bp_x: x-values of breakpoints (optional)
+    :return: x breakpoints (shared), y breakpoints, slope (alpha1) and intercept
+        (alpha2) parameters with one row per series
+    :rtype: dict
+    """
+    x = np.asarray(x, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+
+    if bp_x is None:
+        my_pwlf = pwlf.PiecewiseLinFit(x, Y.mean(axis=0))
+        bp_x = my_pwlf.fit(nr_segments)
+    bp_x = np.asarray(bp_x, dtype=float)
+
+    def basis(x_values):
+        # Continuous piecewise linear function with breakpoints bp_x
+        return np.column_stack(
+            [np.ones_like(x_values), x_values - bp_x[0]]
+            + [np.maximum(x_values - bp, 0) for bp in bp_x[1:-1]]
+        )
+
+    beta = np.linalg.lstsq(basis(x), Y.T, rcond=None)[0]
+    bp_y = (basis(bp_x) @ beta).T
+
+    alpha1 = np.diff(bp_y, axis=1) / np.diff(bp_x)  # Slope
+    alpha2 = bp_y[:, :-1] - alpha1 * bp_x[:-1]  # Intercept
+
+    return {"bp_x": bp_x, "bp_y": bp_y, "alpha1": alpha1, "alpha2": alpha2}
+
+
 def sig_figs(x: float, precision: int):
     """
     Rounds a number to number of significant figures
@@ -151,3 +206,19 @@ def sig_figs(x: float, precision: int):
         rounded = round(x, -int(floor(log10(abs(x)))) + (precision - 1))
 
     return rounded
+
+
+def sig_figs_array(x: np.array, precision: int) -> np.array:
+    """
+    Rounds all numbers of an array to a number of significant figures
+
+    :param np.array x: numbers to round
+    :param int precision: rounding precision
+    :return: rounded numbers
+    :rtype: np.array
+    """
+    x = np.asarray(x, dtype=float)
+    magnitude = np.floor(np.log10(np.abs(np.where(x == 0, 1, x))))
+    factor = 10 ** (int(precision) - 1 - magnitude)
+
+    return np.round(x * factor) / factor
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas as pd
+import pyomo
+
+import logging
+
+log = logging.getLogger(__name__)
+
+TIME_SERIES_CACHE_FILE = "time_series.h5"
+TIME_SERIES_COLUMN_LEVELS = ["InvestmentPeriod", "Node", "Key1", "Carrier", "Key2"]
+CLUSTERING_CACHE_FOLDER = "clustering"
+TECHNOLOGY_CACHE_FOLDER = "technologies"
+MODEL_CACHE_FOLDER = "models"
+MODEL_CONFIG_SECTIONS = ["energybalance", "economic", "performance"]
+MODEL_OPTIMIZATION_OPTIONS = ["timestaging", "typicaldays", "multiyear", "monte_carlo"]
+PACKAGE_PATH = Path(__file__).parent.parent
+
+
+def get_cache_path(data_path: Path, model_config: dict) -> Path:
+    """
+    Returns the directory to store cached data in
+
+    Uses the cache path specified in the model configuration or the folder
+    '.cache' in the input data folder, if no cache path is specified.
+
+    :param Path data_path: path of the input data folder
+    :param dict model_config: model configuration
+    :return: path to cache directory
+    :rtype: Path
+    """
+    cache_path = model_config["caching"]["cache_path"]["value"]
+    if cache_path:
+        return Path(cache_path)
+    else:
+        return Path(data_path) / ".cache"
+
+
+def get_file_signature(files: list, root: Path, extra: dict = None) -> str:
+    """
+    Computes a signature of a list of files based on their modification time and size
+
+    The signature changes, if any of the files is modified, added or removed.
+
+    :param list files: list of file paths to include in the signature
+    :param Path root: root directory, file paths are stored relative to it
+    :param dict extra: additional (json serializable) information to include in the
+        signature
+    :return: hex digest of the signature
+    :rtype: str
+    """
+    signature = []
+    for file in files:
+        stat = os.stat(file)
+        signature.append(
+            [
+                Path(file).relative_to(root).as_posix(),
+                stat.st_mtime_ns,
+                stat.st_size,
+            ]
+        )
+    if extra is not None:
+        signature.append(extra)
+
+    return hashlib.sha256(json.dumps(signature).encode()).hexdigest()
+
+
+def read_time_series_cache(
+    cache_file: Path, signature: str, start_period: int = None, end_period: int = None
+) -> pd.DataFrame | None:
+    """
+    Reads time series from the cache, if the cache is valid
+
+    Only the rows between start_period and end_period are read from disk.
+
+    :param Path cache_file: path to cache file
+    :param str signature: signature of the input files the cache needs to match
+    :param int start_period: first row to read
+    :param int end_period: last row to read (exclusive)
+    :return: time series with column names as in the input data folder or None, if
+        no valid cache exists
+    :rtype: pd.DataFrame | None
+    """
+    if not os.path.isfile(cache_file):
+        return None
+
+    try:
+        with h5py.File(cache_file, "r") as f:
+            if f.attrs["signature"] != signature:
+                log.debug("Time series cache outdated, reading from csv files")
+                return None
+
+            values = f["values"][start_period:end_period]
+            columns = pd.MultiIndex.from_arrays(
+                [f["columns"][level].asstr()[:] for level in TIME_SERIES_COLUMN_LEVELS],
+                names=TIME_SERIES_COLUMN_LEVELS,
+            )
+    except (OSError, KeyError) as e:
+        log.warning(f"Could not read time series cache {cache_file}: {e}")
+        return None
+
+    return pd.DataFrame(values, columns=columns)
+
+
+def write_time_series_cache(cache_file: Path, signature: str, data: pd.DataFrame):
+    """
+    Writes time series to the cache
+
+    Values are stored as a single chunked two-dimensional array (timesteps x
+    columns), column labels are stored per level of the column index.
+
+    :param Path cache_file: path to cache file
+    :param str signature: signature of the input files
+    :param pd.DataFrame data: time series to cache (full length, not shortened)
+    """
+    try:
+        os.makedirs(cache_file.parent, exist_ok=True)
+        with h5py.File(cache_file, "w") as f:
+            f.attrs["signature"] = signature
+            f.create_dataset(
+                "values",
+                data=data.to_numpy(dtype=np.float64),
+                chunks=True,
+                compression="gzip",
+                compression_opts=4,
+            )
+            columns = f.create_group("columns")
+            for level in TIME_SERIES_COLUMN_LEVELS:
+                columns.create_dataset(
+                    level,
+                    data=data.columns.get_level_values(level).astype(str).to_list(),
+                    dtype=h5py.string_dtype(),
+                )
+    except OSError as e:
+        log.warning(f"Could not write time series cache {cache_file}: {e}")
+
+
+def get_data_frame_hash(data: pd.DataFrame, settings: dict = None) -> str:
+    """
+    Computes a hash of a data frame (values, index and column names) and settings
+
+    :param pd.DataFrame data: data frame to hash
+    :param dict settings: additional (json serializable) settings to include in the
+        hash
+    :return: hex digest of the hash
+    :rtype: str
+    """
+    data_hash = hashlib.sha256()
+    data_hash.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    data_hash.update(json.dumps([str(c) for c in data.columns]).encode())
+    if settings is not None:
+        data_hash.update(json.dumps(settings, sort_keys=True).encode())
+    return data_hash.hexdigest()
+
+
+def get_technology_hash(tec_data, node_hash: str) -> str:
+    """
+    Computes a hash of all inputs required to fit a technology
+
+    The unfitted technology contains the data of its json file (including ccs data)
+    as well as the existing status and initial size.
+
+    :param Technology tec_data: unfitted technology
+    :param str node_hash: hash of the climate data and location of the node
+    :return: hex digest of the hash
+    :rtype: str
+    """
+    tec_hash = hashlib.sha256()
+    tec_hash.update(pickle.dumps(tec_data, protocol=pickle.HIGHEST_PROTOCOL))
+    tec_hash.update(node_hash.encode())
+    return tec_hash.hexdigest()
+
+
+def get_model_hash(data, model_config: dict) -> str:
+    """
+    Computes a hash of all inputs required to construct a model
+
+    The hash covers:
+
+    - the preprocessed input data (topology, time series, fitted technologies and
+      networks, node locations, energy balance options and the results of the time
+      aggregation)
+    - the configuration sections the model construction depends on (energy balance,
+      economic, performance and the time aggregation, multiyear and Monte Carlo
+      options)
+    - the installed pyomo version and the source files of adopt_net0
+
+    Solver options, reporting options and the objective are not part of the hash, as
+    they are only used when solving the model.
+
+    :param DataHandle data: data handle with all input data read
+    :param dict model_config: model configuration
+    :return: hex digest of the hash
+    :rtype: str
+    """
+    model_hash = hashlib.sha256()
+    for attribute in [
+        "topology",
+        "time_series",
+        "energybalance_options",
+        "technology_data",
+        "network_data",
+        "node_locations",
+        "k_means_specs",
+        "averaged_specs",
+    ]:
+        model_hash.update(
+            pickle.dumps(getattr(data, attribute), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    settings = {section: model_config[section] for section in MODEL_CONFIG_SECTIONS}
+    settings["optimization"] = {
+        option: model_config["optimization"][option]
+        for option in MODEL_OPTIMIZATION_OPTIONS
+    }
+    model_hash.update(json.dumps(settings, sort_keys=True).encode())
+
+    source_files = sorted(PACKAGE_PATH.rglob("*.py"))
+    model_hash.update(
+        get_file_signature(
+            source_files, PACKAGE_PATH, extra={"pyomo": pyomo.__version__}
+        ).encode()
+    )
+    return model_hash.hexdigest()
+
+
+def read_cached_object(cache_file: Path, pickler=pickle):
+    """
+    Reads a pickled object from the cache
+
+    :param Path cache_file: path to cache file
+    :param pickler: module to unpickle the object with (pickle or dill)
+    :return: cached object or None, if the cache file does not exist or cannot be read
+    """
+    if not os.path.isfile(cache_file):
+        return None
+
+    try:
+        with open(cache_file, "rb") as f:
+            return pickler.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        log.warning(f"Could not read cache file {cache_file}: {e}")
+        return None
+
+
+def write_cached_object(cache_file: Path, obj, pickler=pickle):
+    """
+    Pickles an object to the cache
+
+    The object is first written to a temporary file that is then renamed, so that
+    other processes never read a partially written cache file.
+
+    :param Path cache_file: path to cache file
+    :param obj: object to cache
+    :param pickler: module to pickle the object with (pickle or dill, dill is
+        required for pyomo models)
+    """
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        os.makedirs(cache_file.parent, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            pickler.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        log.warning(f"Could not write cache file {cache_file}: {e}")
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
@@ -1,9 +1,11 @@
+import copy
+import functools
 import numpy as np
 import pandas as pd
 from pathlib import Path
-import tsam.timeseriesaggregation as tsam
 
 from .utilities import *
+from .caching import *
 from ..components.networks import *
 import logging
 
@@ -109,6 +111,56 @@ class DataHandle:
         if self.model_config["optimization"]["timestaging"]["value"] != 0:
             self._average_data()
 
+    def get_time_window(self, start: int, end: int):
+        """
+        Returns a copy of the data handle containing the full resolution data of the
+        timesteps start to end only
+
+        Used to construct the models of the windows of a rolling horizon dispatch.
+        Time series and time dependent technology performances are cut to the
+        window, the fraction of the year modelled is scaled to the length of the
+        window. Clustered and averaged data are not copied.
+
+        :param int start: first timestep of the window (counted from 0)
+        :param int end: timestep after the last timestep of the window
+        :return: data handle of the window
+        :rtype: DataHandle
+        """
+        nr_timesteps = len(self.topology["time_index"]["full"])
+
+        window = DataHandle()
+        window.data_path = self.data_path
+        window.start_period = (self.start_period or 0) + start
+        window.end_period = (self.start_period or 0) + end
+
+        window.topology = copy.deepcopy(
+            {key: value for key, value in self.topology.items() if key != "time_index"}
+        )
+        window.topology["time_index"] = {
+            "full": self.topology["time_index"]["full"][start:end]
+        }
+        window.topology["fraction_of_year_modelled"] = (
+            self.topology["fraction_of_year_modelled"] * (end - start) / nr_timesteps
+        )
+        window.time_series["full"] = self.time_series["full"].iloc[start:end]
+
+        window.node_locations = self.node_locations
+        window.energybalance_options = copy.deepcopy(self.energybalance_options)
+        window.model_config = copy.deepcopy(self.model_config)
+        window.monte_carlo_specs = copy.deepcopy(self.monte_carlo_specs)
+
+        # Pyomo components stored on technologies and networks are not copied
+        window.technology_data = copy.deepcopy(self.technology_data)
+        for investment_period in window.technology_data:
+            for node in window.technology_data[investment_period]:
+                for tec_data in window.technology_data[investment_period][
+                    node
+                ].values():
+                    _cut_time_dependent_coefficients(tec_data, start, end)
+        window.network_data = copy.deepcopy(self.network_data)
+
+        return window
+
     def _read_topology(self):
         """
         Reads topology
@@ -158,6 +210,7 @@ class DataHandle:
         # Open json
         with open(self.data_path / "ConfigModel.json") as json_file:
             self.model_config = json.load(json_file)
+        self.model_config = complete_model_configuration(self.model_config)
 
         # Log success
         log_msg = "Model Configuration read successfully"
@@ -167,94 +220,78 @@ class DataHandle:
     def _read_time_series(self):
         """
         Reads all time-series data and shortens time series accordingly
+
+        If caching of time series is enabled in the model configuration, the time
+        series are read from a binary cache in case none of the csv files changed
+        since the cache has been written. Otherwise, the csv files are read and the
+        cache is (re)written.
         """
+        # Collect all files to read
+        files = {}
+        for investment_period in self.topology["investment_periods"]:
+            for node in self.topology["nodes"]:
+                node_path = self.data_path / investment_period / "node_data" / node
+                files[(investment_period, node, "CarbonCost", "global")] = (
+                    node_path / "CarbonCost.csv"
+                )
+                files[(investment_period, node, "ClimateData", "global")] = (
+                    node_path / "ClimateData.csv"
+                )
+                for carrier in self.topology["carriers"]:
+                    files[(investment_period, node, "CarrierData", carrier)] = (
+                        node_path / "carrier_data" / (carrier + ".csv")
+                    )
 
-        def replace_nan_in_list(ls: list) -> list:
-            """
-            Replaces nan with zeros and writes warning to logger
+        data = None
+        use_cache = self.model_config["caching"]["time_series"]["value"]
+        if use_cache:
+            cache_file = (
+                get_cache_path(self.data_path, self.model_config)
+                / TIME_SERIES_CACHE_FILE
+            )
+            signature = get_file_signature(
+                list(files.values()),
+                self.data_path,
+                extra=[
+                    self.topology["investment_periods"],
+                    self.topology["nodes"],
+                    self.topology["carriers"],
+                ],
+            )
+            data = read_time_series_cache(
+                cache_file, signature, self.start_period, self.end_period
+            )
+            if data is not None:
+                log.info("Time series read from cache")
+
+        if data is None:
+            # Read all csv files, shortened only after writing the cache
+            data = {}
+            for key, file in files.items():
+                data[key] = pd.read_csv(file, sep=";", index_col=0).reset_index(
+                    drop=True
+                )
+            data = pd.concat(data, axis=1).astype(float)
+            data.columns.set_names(TIME_SERIES_COLUMN_LEVELS, inplace=True)
 
-            :param list ls: List
-            :return list: returns list with nan replaces by zero
-            :rtype: list
-            """
-            if any(np.isnan(x) for x in ls):
-                ls = [0 if np.isnan(x) else x for x in ls]
+            # Replace nan with zeros
+            columns_with_nan = data.columns[data.isna().any()]
+            for investment_period, node, var, carrier, key in columns_with_nan:
                 log.debug(
                     f"Found NaN values in data for investment period {investment_period},"
                     f" node {node}, key1 {var}, carrier {carrier}, key2 {key}."
                     f" Replaced with zeros."
                 )
-                return ls
-            else:
-                return ls
+            if len(columns_with_nan) > 0:
+                data = data.fillna(0)
 
-        # Initialize data dict
-        data = {}
+            if use_cache:
+                write_time_series_cache(cache_file, signature, data)
 
-        # Loop through all investment_periods and nodes
-        for investment_period in self.topology["investment_periods"]:
-            for node in self.topology["nodes"]:
+            data = data.iloc[self.start_period : self.end_period]
 
-                # Carbon Costs
-                var = "CarbonCost"
-                carrier = "global"
-                carbon_cost = pd.read_csv(
-                    self.data_path
-                    / investment_period
-                    / "node_data"
-                    / node
-                    / "CarbonCost.csv",
-                    sep=";",
-                    index_col=0,
-                ).to_dict(orient="list")
-                for key in carbon_cost.keys():
-                    data[(investment_period, node, var, carrier, key)] = (
-                        replace_nan_in_list(carbon_cost[key])
-                    )
-
-                # Climate Data
-                var = "ClimateData"
-                carrier = "global"
-                climate_data = pd.read_csv(
-                    self.data_path
-                    / investment_period
-                    / "node_data"
-                    / node
-                    / "ClimateData.csv",
-                    sep=";",
-                    index_col=0,
-                ).to_dict(orient="list")
-                for key in climate_data.keys():
-                    data[(investment_period, node, var, carrier, key)] = (
-                        replace_nan_in_list(climate_data[key])
-                    )
-
-                # Carrier Data
-                var = "CarrierData"
-                carrier = "global"
-                for carrier in self.topology["carriers"]:
-                    carrier_data = pd.read_csv(
-                        self.data_path
-                        / investment_period
-                        / "node_data"
-                        / node
-                        / "carrier_data"
-                        / (carrier + ".csv"),
-                        sep=";",
-                        index_col=0,
-                    ).to_dict(orient="list")
-                    for key in carrier_data.keys():
-                        data[(investment_period, node, var, carrier, key)] = (
-                            replace_nan_in_list(carrier_data[key])
-                        )
-
-        # Post-process data dict to dataframe and shorten
-        data = pd.DataFrame(data)
-        data = data.iloc[self.start_period : self.end_period]
+        # Post-process data
         data.index = self.topology["time_index"]["full"]
-        data.columns.set_names(
-            ["InvestmentPeriod", "Node", "Key1", "Carrier", "Key2"], inplace=True
-        )
         self.time_series["full"] = data
 
         # Log success
@@ -301,19 +338,47 @@ class DataHandle:
         """
         Reads all technology data and fits it
 
-        :param str aggregation_model: specifies the aggregation type and thus the dict key to write the data to
+        Technologies are fitted independently of each other. Fits are keyed on a hash
+        of the technology data, the climate data and the location of the node, so
+        that identical technologies in several nodes and investment periods are only
+        fitted once (each of them receives a copy of the fitted technology). If
+        caching of technologies is enabled in the model configuration, fits are also
+        stored on disk and reused in subsequent runs. If more than one preprocessing
+        worker is specified in the model configuration, the fitting is performed in a
+        pool of processes.
         """
         # Technology data always fitted based on full resolution
         aggregation_model = "full"
 
+        use_cache = self.model_config["caching"]["technologies"]["value"]
+        cache_path = (
+            get_cache_path(self.data_path, self.model_config) / TECHNOLOGY_CACHE_FOLDER
+        )
+        if self.model_config["caching"]["capacity_factors"]["value"]:
+            capacity_factor_cache_path = get_cache_path(
+                self.data_path, self.model_config
+            )
+        else:
+            capacity_factor_cache_path = None
+
         # Initialize technology_data dict
         technology_data = {}
+        technology_hashes = []
+        technologies_to_fit = {}
 
         # Loop through all investment_periods and nodes
         for investment_period in self.topology["investment_periods"]:
             technology_data[investment_period] = {}
             for node in self.topology["nodes"]:
                 technology_data[investment_period][node] = {}
+                climate_data = self.time_series[aggregation_model][investment_period][
+                    node
+                ]["ClimateData"]["global"]
+                location = self.node_locations.loc[node, :]
+                node_hash = get_data_frame_hash(
+                    climate_data,
+                    {str(key): float(value) for key, value in location.items()},
+                )
 
                 # Get technologies at node
                 with open(
@@ -335,13 +400,16 @@ class DataHandle:
                         / node
                         / "technology_data",
                     )
-                    tec_data.fit_technology_performance(
-                        self.time_series[aggregation_model][investment_period][node][
-                            "ClimateData"
-                        ]["global"],
-                        self.node_locations.loc[node, :],
+                    tec_hash = get_technology_hash(tec_data, node_hash)
+                    technology_hashes.append(
+                        ((investment_period, node, technology), tec_hash)
+                    )
+                    technologies_to_fit[tec_hash] = (
+                        tec_data,
+                        climate_data,
+                        location,
+                        capacity_factor_cache_path,
                     )
-                    technology_data[investment_period][node][technology] = tec_data
 
                 # Existing technologies
                 for technology in technologies_at_node["existing"]:
@@ -357,15 +425,42 @@ class DataHandle:
                     tec_data.input_parameters.size_initial = technologies_at_node[
                         "existing"
                     ][technology]
-                    tec_data.fit_technology_performance(
-                        self.time_series[aggregation_model][investment_period][node][
-                            "ClimateData"
-                        ]["global"],
-                        self.node_locations.loc[node, :],
+                    tec_hash = get_technology_hash(tec_data, node_hash)
+                    technology_hashes.append(
+                        ((investment_period, node, technology + "_existing"), tec_hash)
+                    )
+                    technologies_to_fit[tec_hash] = (
+                        tec_data,
+                        climate_data,
+                        location,
+                        capacity_factor_cache_path,
                     )
-                    technology_data[investment_period][node][
-                        technology + "_existing"
-                    ] = tec_data
+
+        # Read fitted technologies from cache
+        fitted_technologies = {}
+        if use_cache:
+            for tec_hash in list(technologies_to_fit.keys()):
+                tec_data = read_cached_object(cache_path / (tec_hash + ".pkl"))
+                if tec_data is not None:
+                    fitted_technologies[tec_hash] = tec_data
+                    del technologies_to_fit[tec_hash]
+            log.info(f"{len(fitted_technologies)} fitted technologies read from cache")
+
+        # Fit technologies
+        fitted = map_in_parallel(
+            fit_technology,
+            list(technologies_to_fit.values()),
+            self.model_config["parallelization"]["preprocessing_workers"]["value"],
+        )
+        for tec_hash, tec_data in zip(technologies_to_fit.keys(), fitted):
+            fitted_technologies[tec_hash] = tec_data
+            if use_cache:
+                write_cached_object(cache_path / (tec_hash + ".pkl"), tec_data)
+
+        for (investment_period, node, technology), tec_hash in technology_hashes:
+            technology_data[investment_period][node][technology] = copy.deepcopy(
+                fitted_technologies[tec_hash]
+            )
 
         self.technology_data = technology_data
 
@@ -575,54 +670,41 @@ class DataHandle:
         Cluster full resolution input data
 
         Uses the package tsam to cluster all time-dependent input data (time series
-        and time dependent technology performance).
+        and time dependent technology performance). If caching of the clustering is
+        enabled in the model configuration, clustering results are reused for
+        identical full resolution data and clustering settings.
         """
         nr_clusters = self.model_config["optimization"]["typicaldays"]["N"]["value"]
         hours_per_day = self.topology["hours_per_day"]["full"]
 
         self.topology["time_index"]["clustered"] = range(0, nr_clusters * hours_per_day)
 
+        # Cluster to typical days
+        clustering = self._perform_aggregation(
+            functools.partial(
+                perform_k_means_clustering,
+                nr_clusters=nr_clusters,
+                hours_per_day=hours_per_day,
+            ),
+            {
+                "method": "k_means",
+                "N": nr_clusters,
+                "hours_per_day": hours_per_day,
+            },
+        )
+
         clustered_resolution = {}
         for investment_period in self.topology["investment_periods"]:
             self.k_means_specs[investment_period] = {}
-            self.k_means_specs[investment_period]["sequence"] = []
-            self.k_means_specs[investment_period]["factors"] = []
-
-            full_res_data_matrix = self._collect_full_res_data(investment_period)
-
-            # Cluster to typical days
-            aggregation = tsam.TimeSeriesAggregation(
-                full_res_data_matrix,
-                noTypicalPeriods=nr_clusters,
-                hoursPerPeriod=hours_per_day,
-                noSegments=hours_per_day,
-                clusterMethod="k_means",
-            )
-
-            typPeriods = aggregation.createTypicalPeriods()
-
-            # Determine help variables
-            cluster_order = aggregation._clusterOrder
-            cluster_no_occ = aggregation._clusterPeriodNoOccur
-            clustered_index = typPeriods.index
-            clustered_index = clustered_index.set_names(["Day", "Hour"])
-            clustered_index = clustered_index.to_frame().reset_index(drop=True)
-            clustered_index = clustered_index["Day"].reset_index()
-            clustered_index["index"] = clustered_index["index"] + 1
-
-            # Determine Sequence
-            for d in cluster_order:
-                self.k_means_specs[investment_period]["sequence"].extend(
-                    (clustered_index[clustered_index["Day"] == d]["index"].to_list())
-                )
-
-            # Determine Factors (how many times does a clustered hour occur)
-            self.k_means_specs[investment_period]["factors"] = (
-                clustered_index["Day"].map(cluster_no_occ).to_list()
-            )
+            self.k_means_specs[investment_period]["sequence"] = clustering[
+                investment_period
+            ]["sequence"]
+            self.k_means_specs[investment_period]["factors"] = clustering[
+                investment_period
+            ]["factors"]
 
             # Write time series
-            typPeriods = typPeriods.reset_index()
+            typPeriods = clustering[investment_period]["typical_periods"]
             clustered_resolution[investment_period] = typPeriods["time_series"]
 
             # Write technology performance
@@ -644,19 +726,34 @@ class DataHandle:
         Averages full resolution input data
 
         Uses the package tsam to average all time-dependent input data (time series
-        and time dependent technology performance).
+        and time dependent technology performance). If caching of the clustering is
+        enabled in the model configuration, averaging results are reused for
+        identical full resolution data and averaging settings.
         """
         nr_timesteps_averaged = self.model_config["optimization"]["timestaging"][
             "value"
         ]
         nr_timesteps_full = len(self.topology["time_index"]["full"])
         resolution_full = self.topology["resolution_in_h"]["full"]
-        hours_per_day = self.topology["hours_per_day"]["full"]
 
         self.topology["time_index"]["averaged"] = range(
             0, int(nr_timesteps_full / nr_timesteps_averaged)
         )
 
+        # Average data
+        averaging = self._perform_aggregation(
+            functools.partial(
+                perform_averaging,
+                nr_timesteps_averaged=nr_timesteps_averaged,
+                resolution=resolution_full,
+            ),
+            {
+                "method": "averaging",
+                "N": nr_timesteps_averaged,
+                "resolution": resolution_full,
+            },
+        )
+
         averaged_resolution = {}
         for investment_period in self.topology["investment_periods"]:
             self.averaged_specs[investment_period] = {}
@@ -664,20 +761,7 @@ class DataHandle:
                 "nr_timesteps_averaged"
             ] = nr_timesteps_averaged
 
-            full_res_data_matrix = self._collect_full_res_data(investment_period)
-
-            # Cluster to typical days
-            aggregation = tsam.TimeSeriesAggregation(
-                full_res_data_matrix,
-                noTypicalPeriods=int(nr_timesteps_full / nr_timesteps_averaged),
-                hoursPerPeriod=1,
-                noSegments=1,
-                resolution=resolution_full,
-                clusterMethod="averaging",
-            )
-
-            typPeriods = aggregation.createTypicalPeriods()
-
+            typPeriods = averaging[investment_period]
             typPeriods.index = self.topology["time_index"]["averaged"]
             averaged_resolution[investment_period] = typPeriods["time_series"]
 
@@ -694,3 +778,84 @@ class DataHandle:
         # Log success
         log_msg = "Averaged data successfully"
         log.info(log_msg)
+
+    def _perform_aggregation(self, aggregate, settings: dict) -> dict:
+        """
+        Performs a time aggregation for all investment periods
+
+        Investment periods are aggregated independently of each other. If more than
+        one preprocessing worker is specified in the model configuration, the
+        aggregation is performed in a pool of processes. If caching of the clustering
+        is enabled, the results are cached on disk keyed on a hash of the full
+        resolution data and the aggregation settings.
+
+        :param aggregate: picklable function taking the full resolution data matrix of
+            an investment period and returning the aggregation results
+        :param dict settings: aggregation settings
+        :return: aggregation results per investment period
+        :rtype: dict
+        """
+        use_cache = self.model_config["caching"]["clustering"]["value"]
+        cache_path = (
+            get_cache_path(self.data_path, self.model_config) / CLUSTERING_CACHE_FOLDER
+        )
+
+        aggregation = {}
+        to_aggregate = {}
+        for investment_period in self.topology["investment_periods"]:
+            full_res_data_matrix = self._collect_full_res_data(investment_period)
+
+            if use_cache:
+                cache_file = cache_path / (
+                    get_data_frame_hash(full_res_data_matrix, settings) + ".pkl"
+                )
+                aggregation[investment_period] = read_cached_object(cache_file)
+                if aggregation[investment_period] is not None:
+                    log.info(
+                        f"Time aggregation ({settings['method']}) of investment period"
+                        f" {investment_period} read from cache"
+                    )
+                    continue
+            else:
+                cache_file = None
+
+            to_aggregate[investment_period] = (full_res_data_matrix, cache_file)
+
+        aggregated = map_in_parallel(
+            aggregate,
+            [
+                (full_res_data_matrix,)
+                for full_res_data_matrix, _ in to_aggregate.values()
+            ],
+            self.model_config["parallelization"]["preprocessing_workers"]["value"],
+        )
+        for (investment_period, (_, cache_file)), result in zip(
+            to_aggregate.items(), aggregated
+        ):
+            aggregation[investment_period] = result
+            if cache_file is not None:
+                write_cached_object(cache_file, result)
+
+        return aggregation
+
+
+def _cut_time_dependent_coefficients(tec_data, start: int, end: int):
+    """
+    Cuts the full resolution time dependent coefficients of a technology (and of its
+    CCS component) to the timesteps start to end
+
+    :param tec_data: technology
+    :param int start: first timestep (counted from 0)
+    :param int end: timestep after the last timestep
+    """
+    coeff_td = tec_data.processed_coeff.time_dependent_full
+    for series in coeff_td:
+        if isinstance(coeff_td[series], (pd.Series, pd.DataFrame)):
+            coeff_td[series] = coeff_td[series].iloc[start:end]
+            if isinstance(coeff_td[series].index, pd.RangeIndex):
+                coeff_td[series] = coeff_td[series].reset_index(drop=True)
+        else:
+            coeff_td[series] = coeff_td[series][start:end]
+
+    if getattr(tec_data, "ccs_component", None) is not None:
+        _cut_time_dependent_coefficients(tec_data.ccs_component, start, end)
@@ -1,10 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import pvlib
+import tsam.timeseriesaggregation as tsam
 import os
 import json
 
 from ..components.technologies import *
+from ..components.technologies.technology import Technology
+from ..components.json_catalogue import get_json_catalogue
+from ..components.technologies.genericTechnologies.capacity_factors import (
+    set_capacity_factor_cache_path,
+)
+from ..data_preprocessing.template_creation import initialize_configuration_templates
 
 import logging
 
@@ -86,27 +94,20 @@ def read_tec_data(tec_name: str, load_path: Path):
 
 def open_json(tec: str, load_path: Path) -> dict:
     """
-    Loops through load_path and subdirectories and returns json with name tec + ".json"
+    Returns json with name tec + ".json" from load_path or its subdirectories
+
+    The json files are looked up in the catalogue of load_path, so that the
+    directory tree is only scanned once.
 
     :param str tec: name of technology to read json for
     :param Path load_path: directory path to loop through all subdirectories and search for tec + ".json"
     :return: Dictionary containing the json data
     :rtype: dict
     """
-    # Read in JSON files
-    for path, subdirs, files in os.walk(load_path):
-        if "data" in locals():
-            break
-        else:
-            for name in files:
-                if (tec + ".json") == name:
-                    filepath = os.path.join(path, name)
-                    with open(filepath) as json_file:
-                        data = json.load(json_file)
-                    break
+    data = get_json_catalogue(load_path).get_data(tec)
 
     # Assign name
-    if "data" in locals():
+    if data is not None:
         data["Name"] = tec
     else:
         raise Exception("There is no json data file for technology " + tec)
@@ -114,6 +115,164 @@ def open_json(tec: str, load_path: Path) -> dict:
     return data
 
 
+def fit_technology(
+    tec_data: Technology,
+    climate_data: pd.DataFrame,
+    location: pd.Series,
+    capacity_factor_cache_path: Path = None,
+) -> Technology:
+    """
+    Fits the performance of a technology
+
+    :param Technology tec_data: technology to fit
+    :param pd.DataFrame climate_data: climate data of the node
+    :param pd.Series location: location of the node (lon, lat, alt)
+    :param Path capacity_factor_cache_path: directory to cache capacity factors of
+        renewable technologies in, if None, they are only cached in memory
+    :return: fitted technology
+    :rtype: Technology
+    """
+    set_capacity_factor_cache_path(capacity_factor_cache_path)
+    tec_data.fit_technology_performance(climate_data, location)
+    return tec_data
+
+
+def map_in_parallel(function, arguments: list, nr_workers: int) -> list:
+    """
+    Calls a function for a list of arguments, optionally in a pool of processes
+
+    If nr_workers is larger than one, the function calls are distributed to a
+    process pool. The function and its arguments need to be picklable in this case.
+
+    :param function: function to call
+    :param list arguments: list of tuples of positional arguments, one per call
+    :param int nr_workers: number of worker processes
+    :return: list of return values (in the order of arguments)
+    :rtype: list
+    """
+    nr_workers = min(nr_workers, len(arguments))
+    if nr_workers > 1:
+        with ProcessPoolExecutor(max_workers=nr_workers) as executor:
+            return list(executor.map(function, *zip(*arguments)))
+    else:
+        return [function(*args) for args in arguments]
+
+
+def perform_k_means_clustering(
+    full_res_data_matrix: pd.DataFrame, nr_clusters: int, hours_per_day: int
+) -> dict:
+    """
+    Clusters full resolution data into typical days
+
+    Uses the package tsam to cluster all time-dependent input data (time series
+    and time dependent technology performance) with k-means.
+
+    :param pd.DataFrame full_res_data_matrix: full resolution data of one investment
+        period
+    :param int nr_clusters: number of typical days
+    :param int hours_per_day: number of timesteps per day
+    :return: dict with keys "typical_periods" (clustered data), "sequence" (clustered
+        timestep for each full resolution timestep) and "factors" (number of
+        occurrences of each clustered timestep)
+    :rtype: dict
+    """
+    aggregation = tsam.TimeSeriesAggregation(
+        full_res_data_matrix,
+        noTypicalPeriods=nr_clusters,
+        hoursPerPeriod=hours_per_day,
+        noSegments=hours_per_day,
+        clusterMethod="k_means",
+    )
+
+    typPeriods = aggregation.createTypicalPeriods()
+
+    # Determine help variables
+    cluster_order = aggregation._clusterOrder
+    cluster_no_occ = aggregation._clusterPeriodNoOccur
+    clustered_index = typPeriods.index
+    clustered_index = clustered_index.set_names(["Day", "Hour"])
+    clustered_index = clustered_index.to_frame().reset_index(drop=True)
+    clustered_index = clustered_index["Day"].reset_index()
+    clustered_index["index"] = clustered_index["index"] + 1
+
+    # Determine Sequence
+    sequence = []
+    for d in cluster_order:
+        sequence.extend(
+            (clustered_index[clustered_index["Day"] == d]["index"].to_list())
+        )
+
+    # Determine Factors (how many times does a clustered hour occur)
+    factors = clustered_index["Day"].map(cluster_no_occ).to_list()
+
+    return {
+        "typical_periods": typPeriods.reset_index(),
+        "sequence": sequence,
+        "factors": factors,
+    }
+
+
+def perform_averaging(
+    full_res_data_matrix: pd.DataFrame,
+    nr_timesteps_averaged: int,
+    resolution: float,
+) -> pd.DataFrame:
+    """
+    Averages full resolution data over a number of timesteps
+
+    Uses the package tsam to average all time-dependent input data (time series
+    and time dependent technology performance).
+
+    :param pd.DataFrame full_res_data_matrix: full resolution data of one investment
+        period
+    :param int nr_timesteps_averaged: number of timesteps to average
+    :param float resolution: resolution of the full resolution data in hours
+    :return: averaged data
+    :rtype: pd.DataFrame
+    """
+    aggregation = tsam.TimeSeriesAggregation(
+        full_res_data_matrix,
+        noTypicalPeriods=int(len(full_res_data_matrix) / nr_timesteps_averaged),
+        hoursPerPeriod=1,
+        noSegments=1,
+        resolution=resolution,
+        clusterMethod="averaging",
+    )
+
+    return aggregation.createTypicalPeriods()
+
+
+def complete_model_configuration(model_config: dict) -> dict:
+    """
+    Adds settings missing in the model configuration with their default values
+
+    Model configurations created with an older version of the package might not
+    contain all settings. Missing settings are taken from the configuration template.
+
+    :param dict model_config: model configuration as read from ConfigModel.json
+    :return: model configuration containing all settings
+    :rtype: dict
+    """
+
+    def complete_dict(d: dict, template: dict, parent_key: str):
+        for key in template:
+            if key not in d:
+                d[key] = template[key]
+                log.debug(
+                    f"Setting {parent_key}{key} not found in model configuration, "
+                    f"using default"
+                )
+            elif (
+                isinstance(template[key], dict)
+                and isinstance(d[key], dict)
+                and "value" not in template[key]
+            ):
+                complete_dict(d[key], template[key], parent_key + key + "/")
+
+    complete_dict(model_config, initialize_configuration_templates(), "")
+    return model_config
+
+
 def check_input_data_consistency(path: Path):
     """
     Checks if the topology is consistent with the input data.
@@ -8,6 +8,8 @@ import requests
 from timezonefinder import TimezoneFinder
 from pathlib import Path
 
+from ..components.json_catalogue import get_json_catalogue
+
 
 def load_climate_data_from_api(folder_path: str | Path, dataset: str = "JRC"):
     """
@@ -260,10 +262,7 @@ def find_json_path(data_path: str | Path, name: str) -> Path | None:
     :param str name: Name of the technology.
     :return: Path to the JSON file if found, otherwise None.
     """
-    for root, dirs, files in os.walk(data_path.resolve()):
-        for file in files:
-            if file.lower() == f"{name.lower()}.json":
-                return Path(root) / Path(file)
+    return get_json_catalogue(data_path).get_path(name, case_sensitive=False)
 
 
 def import_jrc_climate_data(
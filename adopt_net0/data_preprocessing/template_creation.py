@@ -307,6 +307,10 @@ def initialize_configuration_templates() -> dict:
                     ],
                     "value": ["Technologies"],
                 },
+                "seed": {
+                    "description": "Seed of the random number generator. Run i is seeded with seed + i, so that results are reproducible and independent of the number of sweep workers (-1 = not seeded).",
+                    "value": -1,
+                },
             },
             "pareto_points": {"description": "Number of Pareto points.", "value": 5},
             "timestaging": {
@@ -331,6 +335,16 @@ def initialize_configuration_templates() -> dict:
                     "value": ["RES", "STOR", "Hydro_Open"],
                 },
             },
+            "rolling_horizon": {
+                "window": {
+                    "description": "Number of timesteps committed in each window of a rolling horizon (see solve_rolling_horizon).",
+                    "value": 168,
+                },
+                "lookahead": {
+                    "description": "Number of timesteps each window of a rolling horizon looks ahead. The operation of the look-ahead is not committed.",
+                    "value": 24,
+                },
+            },
             "multiyear": {
                 "description": "Enable multiyear analysis, if turned off max time horizon is 1 year.",
                 "options": [0, 1],
@@ -413,6 +427,11 @@ def initialize_configuration_templates() -> dict:
                 "description": "Path to save the summary file path to.",
                 "value": "./userData/",
             },
+            "summary_format": {
+                "description": "File format of the summary. Rows are appended to sqlite files without rewriting the file and several processes can write to it at the same time. Use export_summary_to_excel to convert it to excel.",
+                "options": ["xlsx", "sqlite"],
+                "value": "xlsx",
+            },
             "save_path": {
                 "description": "Option to define the save path.",
                 "value": "./userData/",
@@ -426,6 +445,16 @@ def initialize_configuration_templates() -> dict:
                 "options": [0, 1, 2],
                 "value": 0,
             },
+            "profile_construction": {
+                "description": "If 1, records wall time, memory and the number of variables, constraints, nonzeros and disjuncts of each technology, network and node block and each balance during model construction. The report is written to construction_profile.json and construction_profile.csv in the result folder. Tracing memory slows down the model construction.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "compression": {
+                "description": "Compression filter of time series in the h5 result files.",
+                "options": ["gzip", "lzf", "none"],
+                "value": "gzip",
+            },
         },
         "energybalance": {
             "violation": {
@@ -462,6 +491,16 @@ def initialize_configuration_templates() -> dict:
                 "options": [0, 1],
                 "value": 0,
             },
+            "in_place": {
+                "description": "Determines if the model is scaled in place instead of solving a scaled copy of the model. If 1, no copy of the model is created and the model can be solved with gurobi_persistent.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "automatic": {
+                "description": "Determines if the scaling factors are derived automatically from the coefficient ranges of the model (geometric mean scaling). If 1, the derived factors replace the factors of the technology and network json files and the global scaling factors of energy and cost variables. The coefficient ranges before and after scaling are written to scaling_report.csv.",
+                "options": [0, 1],
+                "value": 0,
+            },
             "scaling_factors": {
                 "energy_vars": {
                     "description": "Scaling factor used for all energy variables.",
@@ -477,6 +516,47 @@ def initialize_configuration_templates() -> dict:
                 },
             },
         },
+        "parallelization": {
+            "preprocessing_workers": {
+                "description": "Number of worker processes used to fit technologies and to cluster or average the time series of investment periods. If 1, all preprocessing is done in the main process.",
+                "value": 1,
+            },
+            "sweep_workers": {
+                "description": "Number of worker processes used to solve Monte Carlo runs or Pareto points in parallel. Each worker constructs its own model. If 1, all runs are solved in the main process.",
+                "value": 1,
+            },
+        },
+        "caching": {
+            "time_series": {
+                "description": "Determines if the time series of the input data folder are cached in a binary file. The cache is renewed automatically if any of the underlying csv files changes.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "clustering": {
+                "description": "Determines if the results of clustering and averaging the time series are cached. Cached results are reused, if the full resolution data and the settings of the time aggregation are identical.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "technologies": {
+                "description": "Determines if fitted technologies are cached. Cached fits are reused, if the technology data, the climate data and the location of the node are identical.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "capacity_factors": {
+                "description": "Determines if capacity factors of renewable technologies (photovoltaic and wind turbines) are cached. Cached capacity factors are reused, if the climate data, the location and the system parameters are identical.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "model": {
+                "description": "Determines if the constructed model (including balances) is cached. The cached model is reused by quick_solve, if the input data, the configuration of the energy balance, economics, performance, time aggregation and multiyear analysis as well as the source code of the package are identical.",
+                "options": [0, 1],
+                "value": 0,
+            },
+            "cache_path": {
+                "description": "Directory to store cached data in. If empty, the folder '.cache' in the input data folder is used.",
+                "value": "",
+            },
+        },
     }
 
     return configuration_template
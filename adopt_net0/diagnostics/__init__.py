@@ -1 +1,3 @@
 from .check_infeasibilities import get_infeasible_constraints
+from .construction_profiler import ConstructionProfiler
+from .scaling_analyser import ScalingAnalyser
@@ -0,0 +1,186 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentSet
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.gdp import Disjunct
+
+import logging
+
+log = logging.getLogger(__name__)
+
+PROFILE_FILE_NAME = "construction_profile"
+
+
+class ConstructionProfiler:
+    """
+    Records wall time, memory and model size of the construction steps of a model
+
+    For each construction step (e.g. a technology, network or node block or a
+    balance), the following is recorded:
+
+    - time: wall time in s
+    - memory: memory allocated during the step (and not released) in MB
+    - memory_peak: peak memory allocated during the step in MB
+    - variables, constraints, nonzeros, disjuncts: number of variables, active
+      constraints, variables in active constraints and disjuncts added to the
+      model during the step
+
+    Memory is traced with tracemalloc, which slows down the model construction. The
+    profiler is thus only enabled, if specified in the model configuration.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Constructor
+
+        :param bool enabled: if False, nothing is recorded
+        """
+        self.enabled = enabled
+        self.entries = []
+
+    def reset(self):
+        """
+        Deletes all recorded entries
+        """
+        self.entries = []
+
+    @contextmanager
+    def profile(self, kind: str, name: str, block):
+        """
+        Context manager recording a construction step
+
+        :param str kind: kind of construction step (e.g. technology, network, node,
+            balance)
+        :param str name: name of the construction step (e.g. period1/node1/PV)
+        :param block: pyomo block that the components of the construction step are
+            added to (or one of its parents)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        components_before = ComponentSet(_get_components(block))
+        stop_tracing = not tracemalloc.is_tracing()
+        if stop_tracing:
+            tracemalloc.start()
+        memory_start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        try:
+            yield
+            duration = time.perf_counter() - start
+            memory_end, memory_peak = tracemalloc.get_traced_memory()
+        finally:
+            if stop_tracing:
+                tracemalloc.stop()
+
+        entry = {
+            "kind": kind,
+            "name": name,
+            "time": duration,
+            "memory": (memory_end - memory_start) / 1024**2,
+            "memory_peak": (memory_peak - memory_start) / 1024**2,
+        }
+        entry.update(
+            _count_components(
+                c for c in _get_components(block) if c not in components_before
+            )
+        )
+        self.entries.append(entry)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns all recorded entries
+
+        :return: one row per construction step
+        :rtype: pd.DataFrame
+        """
+        return pd.DataFrame(
+            self.entries,
+            columns=[
+                "kind",
+                "name",
+                "time",
+                "memory",
+                "memory_peak",
+                "variables",
+                "constraints",
+                "nonzeros",
+                "disjuncts",
+            ],
+        )
+
+    def write_report(self, save_path: Path | str):
+        """
+        Writes the recorded entries to construction_profile.json and
+        construction_profile.csv
+
+        :param Path, str save_path: folder to write the report to
+        """
+        save_path = Path(save_path)
+        with open(save_path / (PROFILE_FILE_NAME + ".json"), "w") as f:
+            json.dump(self.entries, f, indent=4)
+        self.to_dataframe().to_csv(
+            save_path / (PROFILE_FILE_NAME + ".csv"), index=False
+        )
+
+    def log_summary(self, nr_entries: int = 5):
+        """
+        Logs the construction steps that took the longest
+
+        :param int nr_entries: number of construction steps to log
+        """
+        profile = self.to_dataframe().sort_values("time", ascending=False)
+        for entry in profile.head(nr_entries).itertuples():
+            log.info(
+                f"Constructing {entry.kind} {entry.name} took {entry.time:.2f}s "
+                f"({entry.variables} variables, {entry.constraints} constraints)"
+            )
+
+
+def _get_components(block):
+    """
+    Returns all variables, constraints and disjuncts of a block and its sub-blocks
+
+    :param block: pyomo block
+    :return: generator of pyomo components
+    """
+    return block.component_objects(
+        ctype=(pyo.Var, pyo.Constraint, Disjunct), descend_into=(pyo.Block, Disjunct)
+    )
+
+
+def _count_components(components) -> dict:
+    """
+    Counts variables, active constraints, nonzeros and disjuncts of pyomo components
+
+    References to components and constraints of inactive blocks (e.g. disjuncts
+    that have been transformed) are not counted.
+
+    :param components: iterable of pyomo components
+    :return: dict with number of variables, constraints, nonzeros and disjuncts
+    :rtype: dict
+    """
+    counts = {"variables": 0, "constraints": 0, "nonzeros": 0, "disjuncts": 0}
+    for component in components:
+        if component.is_reference():
+            continue
+        if component.ctype is pyo.Var:
+            counts["variables"] += len(component)
+        elif component.ctype is pyo.Constraint:
+            for constraint in component.values():
+                if constraint.active and constraint.parent_block().active:
+                    counts["constraints"] += 1
+                    counts["nonzeros"] += sum(
+                        1 for _ in identify_variables(constraint.body)
+                    )
+        elif component.ctype is Disjunct:
+            counts["disjuncts"] += len(component)
+    return counts
@@ -0,0 +1,343 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pyomo.common.collections import ComponentMap
+from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+
+import logging
+
+log = logging.getLogger(__name__)
+
+SCALING_REPORT_FILE_NAME = "scaling_report"
+# Blocks that coefficient ranges are reported for
+BLOCK_KINDS = {
+    "tech_blocks_active": "technology",
+    "network_block": "network",
+    "node_blocks": "node",
+}
+
+
+class ScalingAnalyser:
+    """
+    Analyses the coefficient ranges of a model and derives scaling factors
+
+    The active constraints of the model are compiled into a sparse matrix. For each
+    technology, network and node block (and for all other top-level components of
+    the model), the following is reported:
+
+    - constraints, variables: number of constraints and variables of the block
+    - min_coefficient, max_coefficient: smallest and largest absolute non-zero
+      coefficient of the constraints of the block
+    - coefficient_range: orders of magnitude between the smallest and largest
+      coefficient
+    - min_rhs, max_rhs: smallest and largest absolute non-zero right hand side
+    - min_bound, max_bound: smallest and largest absolute non-zero variable bound
+
+    Scaling factors are derived with geometric mean scaling: rows and columns of the
+    constraint matrix are scaled alternately, such that the geometric mean of the
+    smallest and largest coefficient of each row and column is one. Factors are
+    rounded to powers of ten and integer variables are not scaled. The factors are
+    defined in the same way as the ``scaling_factor`` suffix of pyomo (i.e. a
+    variable x is replaced by x / factor).
+    """
+
+    def __init__(self, model):
+        """
+        Constructor
+
+        :param model: pyomo model (unscaled)
+        """
+        self.model = model
+        self.scaling_factors = ComponentMap()
+        self._matrix = None
+
+    def compile(self) -> dict:
+        """
+        Compiles the active constraints of the model into a sparse matrix
+
+        The matrix is compiled once and reused for all analyses.
+
+        :return: dict with matrix (A), right hand side (rhs), constraints of the
+            rows, variables of the columns and their block (kind and name)
+        :rtype: dict
+        """
+        if self._matrix is not None:
+            return self._matrix
+
+        standard_form = LinearStandardFormCompiler().write(self.model, mixed_form=True)
+        constraints = [row.constraint for row in standard_form.rows]
+        columns = standard_form.columns
+
+        # Blocks are numbered in the order they are found
+        block_names = {}
+        blocks = {}
+        row_blocks = [
+            blocks.setdefault(_get_block_name(con, block_names), len(blocks))
+            for con in constraints
+        ]
+        column_blocks = [
+            blocks.setdefault(_get_block_name(var, block_names), len(blocks))
+            for var in columns
+        ]
+
+        self._matrix = {
+            "A": abs(standard_form.A).tocoo(),
+            "rhs": np.abs(np.array(standard_form.rhs, dtype=float)),
+            "constraints": constraints,
+            "columns": columns,
+            "blocks": list(blocks),
+            "row_blocks": np.array(row_blocks, dtype=int),
+            "column_blocks": np.array(column_blocks, dtype=int),
+            "x_lb": np.array([np.nan if v.lb is None else abs(v.lb) for v in columns]),
+            "x_ub": np.array([np.nan if v.ub is None else abs(v.ub) for v in columns]),
+            "integer": np.array([v.is_integer() for v in columns], dtype=bool),
+        }
+        return self._matrix
+
+    def analyse(self, scaling_factors: ComponentMap = None) -> pd.DataFrame:
+        """
+        Reports the coefficient ranges of each block
+
+        :param ComponentMap scaling_factors: if passed, the ranges of the model
+            scaled with these factors are reported
+        :return: one row per block
+        :rtype: pd.DataFrame
+        """
+        matrix = self.compile()
+        row_factors, column_factors = self._get_factor_arrays(scaling_factors)
+
+        A = matrix["A"]
+        coefficients = pd.DataFrame(
+            {
+                "block": matrix["row_blocks"][A.row],
+                "coefficient": A.data * row_factors[A.row] / column_factors[A.col],
+            }
+        )
+        rows = pd.DataFrame(
+            {
+                "block": matrix["row_blocks"],
+                "constraint": [id(con) for con in matrix["constraints"]],
+                "rhs": matrix["rhs"] * row_factors,
+            }
+        )
+        columns = pd.DataFrame(
+            {
+                "block": matrix["column_blocks"],
+                "lb": matrix["x_lb"] * column_factors,
+                "ub": matrix["x_ub"] * column_factors,
+            }
+        )
+        bounds = pd.concat(
+            [
+                columns[["block", "lb"]].rename(columns={"lb": "bound"}),
+                columns[["block", "ub"]].rename(columns={"ub": "bound"}),
+            ]
+        )
+
+        coefficients = coefficients[coefficients["coefficient"] > 0]
+        bounds = bounds[bounds["bound"] > 0]
+        rhs = rows[rows["rhs"] > 0]
+
+        report = pd.concat(
+            [
+                rows.groupby("block")["constraint"].nunique().rename("constraints"),
+                columns.groupby("block").size().rename("variables"),
+                coefficients.groupby("block")["coefficient"]
+                .agg(["min", "max"])
+                .add_suffix("_coefficient"),
+                rhs.groupby("block")["rhs"].agg(["min", "max"]).add_suffix("_rhs"),
+                bounds.groupby("block")["bound"]
+                .agg(["min", "max"])
+                .add_suffix("_bound"),
+            ],
+            axis=1,
+        )
+        report[["constraints", "variables"]] = (
+            report[["constraints", "variables"]].fillna(0).astype(int)
+        )
+        report["coefficient_range"] = np.log10(
+            report["max_coefficient"] / report["min_coefficient"]
+        )
+        report.index = pd.MultiIndex.from_tuples(
+            [matrix["blocks"][block] for block in report.index], names=["kind", "name"]
+        )
+        report = report.reset_index()
+        return report[
+            [
+                "kind",
+                "name",
+                "constraints",
+                "variables",
+                "min_coefficient",
+                "max_coefficient",
+                "coefficient_range",
+                "min_rhs",
+                "max_rhs",
+                "min_bound",
+                "max_bound",
+            ]
+        ]
+
+    def derive_scaling_factors(self, iterations: int = 4) -> ComponentMap:
+        """
+        Derives scaling factors with geometric mean scaling
+
+        Only factors different from one are returned. The factors are also stored in
+        self.scaling_factors.
+
+        :param int iterations: number of passes over rows and columns
+        :return: scaling factors of constraints and variables
+        :rtype: ComponentMap
+        """
+        matrix = self.compile()
+        A = matrix["A"]
+        nr_rows, nr_columns = A.shape
+        nonzero = A.data > 0
+        coefficients = np.log10(A.data[nonzero])
+        rows = A.row[nonzero]
+        columns = A.col[nonzero]
+
+        # Logarithms of the factors: a scaled coefficient is a * 10^r / 10^c
+        row_exponents = np.zeros(nr_rows)
+        column_exponents = np.zeros(nr_columns)
+        scale_column = ~matrix["integer"]
+        for _ in range(iterations):
+            scaled = coefficients - column_exponents[columns]
+            row_exponents = -_get_midrange(scaled, rows, nr_rows)
+            scaled = coefficients + row_exponents[rows]
+            column_exponents = np.where(
+                scale_column, _get_midrange(scaled, columns, nr_columns), 0
+            )
+
+        row_exponents = np.round(row_exponents)
+        column_exponents = np.round(column_exponents)
+
+        self.scaling_factors = ComponentMap()
+        for con, exponent in zip(matrix["constraints"], row_exponents):
+            if exponent != 0 and con not in self.scaling_factors:
+                self.scaling_factors[con] = 10**exponent
+        for var, exponent in zip(matrix["columns"], column_exponents):
+            if exponent != 0:
+                self.scaling_factors[var] = 10**exponent
+
+        return self.scaling_factors
+
+    def get_report(self) -> pd.DataFrame:
+        """
+        Reports the coefficient ranges of each block before and after scaling with
+        the derived scaling factors
+
+        :return: one row per block, columns of the scaled model have the suffix
+            _scaled
+        :rtype: pd.DataFrame
+        """
+        before = self.analyse()
+        after = self.analyse(self.scaling_factors)
+        after = after.drop(columns=["constraints", "variables"])
+        return before.merge(after, on=["kind", "name"], suffixes=("", "_scaled"))
+
+    def write_report(self, save_path: Path | str):
+        """
+        Writes the report (see get_report) to scaling_report.csv
+
+        :param Path, str save_path: folder to write the report to
+        """
+        save_path = Path(save_path)
+        self.get_report().to_csv(
+            save_path / (SCALING_REPORT_FILE_NAME + ".csv"), index=False
+        )
+
+    def log_summary(self, nr_entries: int = 5):
+        """
+        Logs the blocks with the largest coefficient ranges before and after scaling
+
+        :param int nr_entries: number of blocks to log
+        """
+        report = self.get_report().sort_values("coefficient_range", ascending=False)
+        for entry in report.head(nr_entries).itertuples():
+            log.info(
+                f"Coefficients of {entry.kind} {entry.name} range over "
+                f"{entry.coefficient_range:.1f} orders of magnitude "
+                f"({entry.coefficient_range_scaled:.1f} after scaling)"
+            )
+
+    def _get_factor_arrays(self, scaling_factors: ComponentMap = None) -> tuple:
+        """
+        Returns the scaling factors of the rows and columns of the matrix
+
+        :param ComponentMap scaling_factors: scaling factors of constraints and
+            variables (factors that are not given are one)
+        :return: row factors, column factors
+        :rtype: tuple
+        """
+        matrix = self.compile()
+        if scaling_factors is None:
+            scaling_factors = ComponentMap()
+        row_factors = np.array(
+            [scaling_factors.get(con, 1) for con in matrix["constraints"]],
+            dtype=float,
+        )
+        column_factors = np.array(
+            [scaling_factors.get(var, 1) for var in matrix["columns"]], dtype=float
+        )
+        return np.abs(row_factors), np.abs(column_factors)
+
+
+def _get_midrange(values: np.ndarray, index: np.ndarray, size: int) -> np.ndarray:
+    """
+    Returns the mean of the minimum and maximum of values per index (0 for indices
+    without values)
+
+    :param np.ndarray values: values
+    :param np.ndarray index: index of each value
+    :param int size: number of indices
+    :return: midrange per index
+    :rtype: np.ndarray
+    """
+    maximum = np.full(size, -np.inf)
+    minimum = np.full(size, np.inf)
+    np.maximum.at(maximum, index, values)
+    np.minimum.at(minimum, index, values)
+    midrange = (maximum + minimum) / 2
+    return np.where(np.isfinite(midrange), midrange, 0)
+
+
+def _get_block_name(component, block_names: dict) -> tuple:
+    """
+    Returns the technology or network block a component belongs to
+
+    Components that are not part of a technology or network block are reported by
+    the name of the top-level component of the model they belong to.
+
+    :param component: pyomo constraint or variable data object
+    :param dict block_names: cache of block names by parent block
+    :return: kind (technology, network or model) and name (e.g.
+        period1/node1/Photovoltaic)
+    :rtype: tuple
+    """
+    parent = component.parent_block()
+    if parent.parent_block() is None:
+        return "model", component.parent_component().local_name
+    if id(parent) in block_names:
+        return block_names[id(parent)]
+
+    # Blocks from the component to the model
+    blocks = []
+    block = parent
+    while block is not None:
+        blocks.append(block)
+        block = block.parent_block()
+
+    name = ("model", blocks[-2].parent_component().local_name)
+    for i, block in enumerate(blocks[:-1]):
+        kind = BLOCK_KINDS.get(block.parent_component().local_name)
+        if kind is not None:
+            indices = [
+                b.index() for b in reversed(blocks[i:-1]) if b.index() is not None
+            ]
+            name = (kind, "/".join(str(index) for index in indices))
+            break
+
+    block_names[id(parent)] = name
+    return name
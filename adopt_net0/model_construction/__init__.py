@@ -10,7 +10,9 @@ from .construct_balances import (
     construct_global_balance,
     construct_export_costs,
     construct_import_costs,
+    add_technologies_to_balances,
 )
 from .construct_nodes import construct_node_block
 from .construct_investment_period import construct_investment_period_block
+from .scaling import InPlaceScaler
 from .utilities import get_data_for_investment_period, get_data_for_node
@@ -1,6 +1,11 @@
 import pyomo.environ as pyo
 
-from ..utilities import get_set_t, get_hour_factors, get_nr_timesteps_averaged
+from ..utilities import (
+    get_set_t,
+    get_carrier_index,
+    get_hour_factors,
+    get_nr_timesteps_averaged,
+)
 
 
 def delete_all_balances(model):
@@ -50,52 +55,42 @@ def construct_network_constraints(model, config: dict):
         b_period = model.periods[period]
 
         set_t = get_set_t(config, b_period)
+        carrier_index = get_carrier_index(b_period)
 
         def init_netw_inflow(const, node, car, t):
-            if car in b_period.node_blocks[node].set_carriers:
-                return b_period.node_blocks[node].var_netw_inflow[t, car] == sum(
-                    b_period.network_block[netw].var_inflow[t, car, node]
-                    for netw in b_period.set_networks
-                    if car in b_period.network_block[netw].set_netw_carrier
-                )
-            else:
-                return pyo.Constraint.Skip
+            return b_period.node_blocks[node].var_netw_inflow[t, car] == sum(
+                b_period.network_block[netw].var_inflow[t, car, node]
+                for netw in carrier_index[node, car]["netw"]
+            )
 
         b_netw_const.const_netw_inflow = pyo.Constraint(
-            model.set_nodes, model.set_carriers, set_t, rule=init_netw_inflow
+            list(carrier_index), set_t, rule=init_netw_inflow
         )
 
         def init_netw_outflow(const, node, car, t):
-
-            if car in b_period.node_blocks[node].set_carriers:
-                return b_period.node_blocks[node].var_netw_outflow[t, car] == sum(
-                    b_period.network_block[netw].var_outflow[t, car, node]
-                    for netw in b_period.set_networks
-                    if car in b_period.network_block[netw].set_netw_carrier
-                )
-            else:
-                return pyo.Constraint.Skip
+            return b_period.node_blocks[node].var_netw_outflow[t, car] == sum(
+                b_period.network_block[netw].var_outflow[t, car, node]
+                for netw in carrier_index[node, car]["netw"]
+            )
 
         b_netw_const.const_netw_outflow = pyo.Constraint(
-            model.set_nodes, model.set_carriers, set_t, rule=init_netw_outflow
+            list(carrier_index), set_t, rule=init_netw_outflow
         )
 
         def init_netw_consumption(const, node, car, t):
-
-            if (b_period.node_blocks[node].find_component("var_consumption")) and (
-                car in b_period.node_blocks[node].set_carriers
-            ):
-                return b_period.node_blocks[node].var_netw_consumption[t, car] == sum(
-                    b_period.network_block[netw].var_consumption[t, car, node]
-                    for netw in b_period.set_networks
-                    if (b_period.network_block[netw].find_component("var_consumption"))
-                    and car in b_period.network_block[netw].set_consumed_carriers
-                )
-            else:
-                return pyo.Constraint.Skip
+            return b_period.node_blocks[node].var_netw_consumption[t, car] == sum(
+                b_period.network_block[netw].var_consumption[t, car, node]
+                for netw in carrier_index[node, car]["netw_consumption"]
+            )
 
         b_netw_const.const_netw_consumption = pyo.Constraint(
-            model.set_nodes, model.set_carriers, set_t, rule=init_netw_consumption
+            [
+                (node, car)
+                for node, car in carrier_index
+                if b_period.node_blocks[node].find_component("var_consumption")
+            ],
+            set_t,
+            rule=init_netw_consumption,
         )
 
     model.block_network_constraints = pyo.Block(
@@ -124,64 +119,66 @@ def construct_nodal_energybalance(model, config: dict):
 
         set_t = get_set_t(config, b_period)
 
+        carrier_index = get_carrier_index(b_period)
+        carriers_nodes = [
+            (car, node)
+            for car in model.set_carriers
+            for node in model.set_nodes
+            if (node, car) in carrier_index
+        ]
+
         # Violation variables and costs
         if config["energybalance"]["violation"]["value"] > 0:
             b_period.var_violation = pyo.Var(
                 set_t,
-                model.set_carriers,
-                model.set_nodes,
+                carriers_nodes,
                 domain=pyo.NonNegativeReals,
             )
 
         def init_energybalance(const, t, car, node):
-            if car in b_period.node_blocks[node].set_carriers:
-                node_block = b_period.node_blocks[node]
-                tec_output = sum(
-                    node_block.tech_blocks_active[tec].var_output_tot[t, car]
-                    for tec in node_block.set_technologies
-                    if car in node_block.tech_blocks_active[tec].set_output_carriers_all
-                )
+            node_block = b_period.node_blocks[node]
+            tec_output = sum(
+                node_block.tech_blocks_active[tec].var_output_tot[t, car]
+                for tec in carrier_index[node, car]["tec_output"]
+            )
 
-                tec_input = sum(
-                    node_block.tech_blocks_active[tec].var_input_tot[t, car]
-                    for tec in node_block.set_technologies
-                    if car in node_block.tech_blocks_active[tec].set_input_carriers_all
-                )
+            tec_input = sum(
+                node_block.tech_blocks_active[tec].var_input_tot[t, car]
+                for tec in carrier_index[node, car]["tec_input"]
+            )
 
-                netw_inflow = node_block.var_netw_inflow[t, car]
+            netw_inflow = node_block.var_netw_inflow[t, car]
 
-                netw_outflow = node_block.var_netw_outflow[t, car]
+            netw_outflow = node_block.var_netw_outflow[t, car]
 
-                if hasattr(node_block, "var_netw_consumption"):
-                    netw_consumption = node_block.var_netw_consumption[t, car]
-                else:
-                    netw_consumption = 0
+            if hasattr(node_block, "var_netw_consumption"):
+                netw_consumption = node_block.var_netw_consumption[t, car]
+            else:
+                netw_consumption = 0
 
-                import_flow = node_block.var_import_flow[t, car]
+            import_flow = node_block.var_import_flow[t, car]
 
-                export_flow = node_block.var_export_flow[t, car]
+            export_flow = node_block.var_export_flow[t, car]
 
-                if config["energybalance"]["violation"]["value"] > 0:
-                    violation = b_period.var_violation[t, car, node]
-                else:
-                    violation = 0
-                return (
-                    tec_output
-                    - tec_input
-                    + netw_inflow
-                    - netw_outflow
-                    - netw_consumption
-                    + import_flow
-                    - export_flow
-                    + violation
-                    == node_block.para_demand[t, car]
-                    - node_block.var_generic_production[t, car]
-                )
+            if config["energybalance"]["violation"]["value"] > 0:
+                violation = b_period.var_violation[t, car, node]
             else:
-                return pyo.Constraint.Skip
+                violation = 0
+            return (
+                tec_output
+                - tec_input
+                + netw_inflow
+                - netw_outflow
+                - netw_consumption
+                + import_flow
+                - export_flow
+                + violation
+                == node_block.para_demand[t, car]
+                - node_block.var_generic_production[t, car]
+            )
 
         b_ebalance.const_energybalance = pyo.Constraint(
-            set_t, model.set_carriers, model.set_nodes, rule=init_energybalance
+            set_t, carriers_nodes, rule=init_energybalance
         )
 
         return b_ebalance
@@ -209,28 +206,35 @@ def construct_global_energybalance(model, config):
 
         set_t = get_set_t(config, b_period)
 
+        carrier_index = get_carrier_index(b_period)
+        carriers_nodes = [
+            (car, node)
+            for car in model.set_carriers
+            for node in model.set_nodes
+            if (node, car) in carrier_index
+        ]
+        nodes_by_carrier = {}
+        for car, node in carriers_nodes:
+            nodes_by_carrier.setdefault(car, []).append(node)
+
         # Violation variables and costs
         if config["energybalance"]["violation"]["value"] >= 0:
             b_period.var_violation = pyo.Var(
                 set_t,
-                model.set_carriers,
-                model.set_nodes,
+                carriers_nodes,
                 domain=pyo.NonNegativeReals,
             )
 
         def init_energybalance_global(const, t, car):
+            nodes = nodes_by_carrier[car]
             tec_output = sum(
                 sum(
                     b_period.node_blocks[node]
                     .tech_blocks_active[tec]
                     .var_output_tot[t, car]
-                    for tec in b_period.node_blocks[node].set_technologies
-                    if car in b_period.node_blocks[node].set_carriers
-                    and b_period.node_blocks[node]
-                    .tech_blocks_active[tec]
-                    .set_output_carriers_all
+                    for tec in carrier_index[node, car]["tec_output"]
                 )
-                for node in model.set_nodes
+                for node in nodes
             )
 
             tec_input = sum(
@@ -238,45 +242,30 @@ def construct_global_energybalance(model, config):
                     b_period.node_blocks[node]
                     .tech_blocks_active[tec]
                     .var_input_tot[t, car]
-                    for tec in b_period.node_blocks[node].set_technologies
-                    if car in b_period.node_blocks[node].set_carriers
-                    and b_period.node_blocks[node]
-                    .tech_blocks_active[tec]
-                    .set_input_carriers_all
+                    for tec in carrier_index[node, car]["tec_input"]
                 )
-                for node in model.set_nodes
+                for node in nodes
             )
 
             import_flow = sum(
-                b_period.node_blocks[node].var_import_flow[t, car]
-                for node in model.set_nodes
-                if car in b_period.node_blocks[node].set_carriers
+                b_period.node_blocks[node].var_import_flow[t, car] for node in nodes
             )
 
             export_flow = sum(
-                b_period.node_blocks[node].var_export_flow[t, car]
-                for node in model.set_nodes
-                if car in b_period.node_blocks[node].set_carriers
+                b_period.node_blocks[node].var_export_flow[t, car] for node in nodes
             )
 
             demand = sum(
-                b_period.node_blocks[node].para_demand[t, car]
-                for node in model.set_nodes
-                if car in b_period.node_blocks[node].set_carriers
+                b_period.node_blocks[node].para_demand[t, car] for node in nodes
             )
 
             gen_prod = sum(
                 b_period.node_blocks[node].var_generic_production[t, car]
-                for node in model.set_nodes
-                if car in b_period.node_blocks[node].set_carriers
+                for node in nodes
             )
 
             if config["energybalance"]["violation"]["value"] > 0:
-                violation = sum(
-                    b_period.var_violation[t, car, node]
-                    for node in model.set_nodes
-                    if car in b_period.node_blocks[node].set_carriers
-                )
+                violation = sum(b_period.var_violation[t, car, node] for node in nodes)
             else:
                 violation = 0
 
@@ -285,19 +274,10 @@ def construct_global_energybalance(model, config):
                 == demand - gen_prod
             )
 
-        model.set_used_carriers = pyo.Set(
-            initialize=list(
-                set().union(
-                    *[
-                        b_period.node_blocks[node].set_carriers
-                        for node in model.set_nodes
-                    ]
-                )
-            )
-        )
+        b_ebalance.set_used_carriers = pyo.Set(initialize=list(nodes_by_carrier))
 
         b_ebalance.const_energybalance = pyo.Constraint(
-            set_t, model.set_used_carriers, rule=init_energybalance_global
+            set_t, b_ebalance.set_used_carriers, rule=init_energybalance_global
         )
 
         return b_ebalance
@@ -631,15 +611,8 @@ def construct_system_cost(model, data):
                 return (
                     b_period.var_cost_violation
                     == sum(
-                        sum(
-                            sum(
-                                b_period.var_violation[t, car, node]
-                                * hour_factors[t - 1]
-                                for t in set_t
-                            )
-                            for car in model.set_carriers
-                        )
-                        for node in model.set_nodes
+                        b_period.var_violation[t, car, node] * hour_factors[t - 1]
+                        for t, car, node in b_period.var_violation
                     )
                     * config["energybalance"]["violation"]["value"]
                 )
@@ -765,3 +738,100 @@ def construct_global_balance(model):
     model.const_emissions = pyo.Constraint(rule=init_emissions)
 
     return model
+
+
+def add_technologies_to_balances(
+    model, data, period: str, node: str, technologies: list
+) -> list:
+    """
+    Adds technologies that have been added to a node to the constructed balances
+
+    Only the constraints containing technologies are changed: the energy balances of
+    the carriers of the technologies at the node, the emission balance and the
+    technology costs of the investment period. The technology terms are added to the
+    existing expressions, such that the constraints (and their indices) remain the
+    same objects.
+
+    :param model: pyomo model with constructed balances
+    :param data: DataHandle
+    :param str period: investment period the technologies are added to
+    :param str node: node the technologies are added to
+    :param list technologies: technologies that have been added (and that have not
+        been part of the balances before)
+    :return: list of changed constraints
+    :rtype: list
+    """
+    config = data.model_config
+
+    b_period = model.periods[period]
+    b_node = b_period.node_blocks[node]
+    set_t = get_set_t(config, b_period)
+    hour_factors = get_hour_factors(config, data, period)
+    nr_timesteps_averaged = get_nr_timesteps_averaged(config)
+    tec_blocks = [b_node.tech_blocks_active[tec] for tec in technologies]
+
+    changed_constraints = []
+
+    def add_terms(con, lhs=0, rhs=0):
+        con.set_value(con.expr.args[0] + lhs == con.expr.args[1] + rhs)
+        changed_constraints.append(con)
+
+    # Energy balance
+    b_ebalance = model.block_energybalance[period]
+    for car in b_node.set_carriers:
+        output_blocks = [b for b in tec_blocks if car in b.set_output_carriers_all]
+        input_blocks = [b for b in tec_blocks if car in b.set_input_carriers_all]
+        if not output_blocks and not input_blocks:
+            continue
+        for t in set_t:
+            if config["energybalance"]["copperplate"]["value"]:
+                index = (t, car)
+            else:
+                index = (t, car, node)
+            add_terms(
+                b_ebalance.const_energybalance[index],
+                lhs=sum(b.var_output_tot[t, car] for b in output_blocks)
+                - sum(b.var_input_tot[t, car] for b in input_blocks),
+            )
+
+    # Emission balance
+    def sum_over_time(var_name, para=None):
+        return sum(
+            b.component(var_name)[t]
+            * nr_timesteps_averaged
+            * hour_factors[t - 1]
+            * (1 if para is None else para[t])
+            for b in tec_blocks
+            for t in set_t
+        )
+
+    b_emissionbalance = model.block_emissionbalance[period]
+    add_terms(
+        b_emissionbalance.const_emissions_tot,
+        lhs=sum_over_time("var_tec_emissions_pos"),
+    )
+    add_terms(
+        b_emissionbalance.const_emissions_neg,
+        lhs=sum_over_time("var_tec_emissions_neg"),
+    )
+
+    # Costs
+    b_period_cost = model.block_costbalance[period]
+    add_terms(
+        b_period_cost.const_capex_tecs, rhs=sum(b.var_capex_tot for b in tec_blocks)
+    )
+    add_terms(
+        b_period_cost.const_opex_tecs,
+        rhs=sum(b.var_opex_fixed_tot for b in tec_blocks)
+        + sum_over_time("var_opex_variable_tot"),
+    )
+    add_terms(
+        b_period_cost.const_revenue_carbon,
+        lhs=sum_over_time("var_tec_emissions_neg", b_node.para_carbon_subsidy),
+    )
+    add_terms(
+        b_period_cost.const_cost_carbon,
+        lhs=sum_over_time("var_tec_emissions_pos", b_node.para_carbon_tax),
+    )
+
+    return changed_constraints
@@ -1,3 +1,4 @@
+import itertools
 import numpy as np
 import pandas as pd
 import pyomo.environ as pyo
@@ -144,31 +145,52 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
         set_t = set_t_full
 
     # PARAMETERS
+    # Time series are extracted in bulk to dicts, parameters are initialized from
+    # these dicts without validating each value individually
+    timesteps = list(set_t)
+    timestep_positions = np.array(timesteps) - 1
+    carriers = list(b_node.set_carriers)
+
+    def get_carrier_values(key):
+        values = (
+            data["time_series"]["CarrierData"]
+            .loc[:, [(car, key) for car in carriers]]
+            .to_numpy(dtype=float)[timestep_positions, :]
+        )
+        return dict(
+            zip(itertools.product(timesteps, carriers), values.ravel().tolist())
+        )
+
     def create_carrier_parameter(key, par_mutable=False):
-        # Convert to dict/list for performance
-        ts = {}
-        for car in b_node.set_carriers:
-            ts[car] = {}
-            ts[car][key] = data["time_series"]["CarrierData"][car][key].to_list()
+        values = get_carrier_values(key)
 
         def init_carrier_parameter(para, t, car):
             """Rule initiating a carrier parameter"""
-            return ts[car][key][t - 1]
+            return values[t, car]
 
         parameter = pyo.Param(
-            set_t, b_node.set_carriers, rule=init_carrier_parameter, mutable=par_mutable
+            set_t,
+            b_node.set_carriers,
+            rule=init_carrier_parameter,
+            mutable=par_mutable,
+            within=pyo.Any,
         )
-        return parameter
+        return parameter, values
 
     def create_carbonprice_parameter(key):
-        # Convert to dict/list for performance
-        ts = data["time_series"]["CarbonCost"][:][key].to_list()
+        values = (
+            data["time_series"]["CarbonCost"]["global"][key]
+            .to_numpy(dtype=float)[timestep_positions]
+            .tolist()
+        )
 
         def init_carbonprice_parameter(para, t):
-            """Rule initiating a carrier parameter"""
-            return ts[t - 1]
+            """Rule initiating a carbon price parameter"""
+            return values[t - 1]
 
-        parameter = pyo.Param(set_t, rule=init_carbonprice_parameter, mutable=False)
+        parameter = pyo.Param(
+            set_t, rule=init_carbonprice_parameter, mutable=False, within=pyo.Any
+        )
         return parameter
 
     if config["optimization"]["monte_carlo"]["N"]["value"] != 0:
@@ -176,35 +198,35 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
     else:
         par_mutable = False
 
-    b_node.para_demand = create_carrier_parameter("Demand")
-    b_node.para_production_profile = create_carrier_parameter("Generic production")
-    b_node.para_import_price = create_carrier_parameter(
+    b_node.para_demand, _ = create_carrier_parameter("Demand")
+    b_node.para_production_profile, _ = create_carrier_parameter("Generic production")
+    b_node.para_import_price, _ = create_carrier_parameter(
         "Import price", par_mutable=par_mutable
     )
-    b_node.para_export_price = create_carrier_parameter(
+    b_node.para_export_price, _ = create_carrier_parameter(
         "Export price", par_mutable=par_mutable
     )
-    b_node.para_import_limit = create_carrier_parameter("Import limit")
-    b_node.para_export_limit = create_carrier_parameter("Export limit")
-    b_node.para_import_emissionfactors = create_carrier_parameter(
-        "Import emission factor"
+    b_node.para_import_limit, import_limit = create_carrier_parameter("Import limit")
+    b_node.para_export_limit, export_limit = create_carrier_parameter("Export limit")
+    b_node.para_import_emissionfactors, import_emissionfactors = (
+        create_carrier_parameter("Import emission factor")
     )
-    b_node.para_export_emissionfactors = create_carrier_parameter(
-        "Export emission factor"
+    b_node.para_export_emissionfactors, export_emissionfactors = (
+        create_carrier_parameter("Export emission factor")
     )
     b_node.para_carbon_subsidy = create_carbonprice_parameter("subsidy")
     b_node.para_carbon_tax = create_carbonprice_parameter("price")
 
     # VARIABLES
     def init_import_bounds(var, t, car):
-        return (0, b_node.para_import_limit[t, car])
+        return (0, import_limit[t, car])
 
     b_node.var_import_flow = pyo.Var(
         set_t, b_node.set_carriers, bounds=init_import_bounds
     )
 
     def init_export_bounds(var, t, car):
-        return (0, b_node.para_export_limit[t, car])
+        return (0, export_limit[t, car])
 
     b_node.var_export_flow = pyo.Var(
         set_t, b_node.set_carriers, bounds=init_export_bounds
@@ -252,7 +274,7 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
 
     # Emission constraints
     def init_import_emissions_pos(const, t, car):
-        if b_node.para_import_emissionfactors[t, car] >= 0:
+        if import_emissionfactors[t, car] >= 0:
             return (
                 b_node.var_import_flow[t, car]
                 * b_node.para_import_emissionfactors[t, car]
@@ -266,7 +288,7 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
     )
 
     def init_export_emissions_pos(const, t, car):
-        if b_node.para_export_emissionfactors[t, car] >= 0:
+        if export_emissionfactors[t, car] >= 0:
             return (
                 b_node.var_export_flow[t, car]
                 * b_node.para_export_emissionfactors[t, car]
@@ -280,7 +302,7 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
     )
 
     def init_import_emissions_neg(const, t, car):
-        if b_node.para_import_emissionfactors[t, car] < 0:
+        if import_emissionfactors[t, car] < 0:
             return (
                 b_node.var_import_flow[t, car]
                 * (-b_node.para_import_emissionfactors[t, car])
@@ -294,7 +316,7 @@ def construct_node_block(b_node, data: dict, set_t_full, set_t_clustered):
     )
 
     def init_export_emissions_neg(const, t, car):
-        if b_node.para_export_emissionfactors[t, car] < 0:
+        if export_emissionfactors[t, car] < 0:
             return (
                 b_node.var_export_flow[t, car]
                 * (-b_node.para_export_emissionfactors[t, car])
@@ -0,0 +1,252 @@
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentMap
+from pyomo.core.base.suffix import SuffixFinder
+from pyomo.core.expr import replace_expressions
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class InPlaceScaler:
+    """
+    Scales a pyomo model in place, without cloning it
+
+    The scaling factors are read from the ``scaling_factor`` suffixes of the model,
+    as in pyomo's core.scale_model transformation. Instead of scaling a copy of the
+    model, the bounds of the variables and the expressions of the constraints and
+    objectives of the model itself are scaled. The original bounds and expressions
+    are stored, so that the scaling can be undone with ``unscale``.
+
+    Scaling is incremental: calling ``scale`` on a scaled model only scales the
+    components that have been added since (e.g. a new objective). Variables whose
+    bounds are changed while the model is scaled need to be passed to
+    ``rescale_variables``.
+    """
+
+    def __init__(self, model):
+        """
+        Constructor
+
+        :param model: pyomo model with scaling_factor suffixes
+        """
+        self.model = model
+        self.values_scaled = False
+        # Variable data -> (scaling factor, original lower bound, original upper
+        # bound) or None, if the scaling factor is 1
+        self._variables = ComponentMap()
+        # Constraint/objective data -> original expression or None, if unchanged
+        self._constraints = ComponentMap()
+        self._substitution_map = {}
+        self._suffix_finder = None
+
+    def is_scaled(self) -> bool:
+        """
+        Checks if (parts of) the model are scaled
+
+        :return: True, if any component is scaled
+        :rtype: bool
+        """
+        return len(self._variables) > 0 or len(self._constraints) > 0
+
+    def scale(self, components: list = None):
+        """
+        Scales all components of the model (or the given components) that are not
+        scaled yet
+
+        Values of already scaled variables are scaled again, if they have been
+        unscaled with ``unscale_values``.
+
+        :param list components: variable and constraint data objects to scale. If
+            None, all variables, active constraints and active objectives of the
+            model are scaled.
+        """
+        suffixes = self._get_suffixes()
+        for suffix in suffixes:
+            suffix.activate()
+        self._suffix_finder = SuffixFinder("scaling_factor", 1.0, self.model)
+
+        if components is None:
+            if not self.values_scaled:
+                self._scale_values()
+                self.values_scaled = True
+            variables = self.model.component_data_objects(pyo.Var, descend_into=True)
+            constraints = self.model.component_data_objects(
+                (pyo.Constraint, pyo.Objective), active=True, descend_into=True
+            )
+        else:
+            variables = [c for c in components if c.ctype is pyo.Var]
+            constraints = [c for c in components if c.ctype is not pyo.Var]
+
+        for var in variables:
+            if var not in self._variables:
+                self._scale_variable(var)
+        for con in constraints:
+            if con not in self._constraints:
+                self._scale_constraint(con)
+
+        # Deactivate suffixes, so that they are not passed to the solver
+        for suffix in suffixes:
+            suffix.deactivate()
+
+    def rescale_variables(self, variables: list):
+        """
+        Scales the bounds of scaled variables again after they have been changed
+
+        The current bounds are taken as unscaled bounds.
+
+        :param list variables: variable data objects
+        """
+        for var in variables:
+            if self._variables.get(var) is not None:
+                factor = self._variables[var][0]
+                self._variables[var] = (factor, var.lower, var.upper)
+                self._set_scaled_bounds(var, factor)
+
+    def unscale_values(self):
+        """
+        Unscales the values of all scaled variables (e.g. to write results), while
+        keeping the model scaled
+        """
+        if not self.values_scaled:
+            return
+        for var, scaling in self._variables.items():
+            if scaling is not None and var.value is not None:
+                var.set_value(var.value / scaling[0], skip_validation=True)
+        self.values_scaled = False
+
+    def unscale(self):
+        """
+        Undoes the scaling: restores the original bounds, expressions and values
+        """
+        self.unscale_values()
+        for var, scaling in self._variables.items():
+            if scaling is not None:
+                var.setlb(scaling[1])
+                var.setub(scaling[2])
+        for con, expr in self._constraints.items():
+            # Skip unchanged and deleted components
+            if expr is None or con.parent_block() is None:
+                continue
+            if con.ctype is pyo.Objective:
+                con.expr = expr
+            else:
+                con.set_value(expr)
+
+        self._variables = ComponentMap()
+        self._constraints = ComponentMap()
+        self._substitution_map = {}
+        self.values_scaled = False
+
+    def _get_suffixes(self) -> list:
+        """
+        Returns all scaling_factor suffixes of the model
+
+        :return: list of suffixes
+        :rtype: list
+        """
+        return [
+            suffix
+            for suffix in self.model.component_objects(pyo.Suffix, descend_into=True)
+            if suffix.local_name == "scaling_factor"
+        ]
+
+    def _scale_values(self):
+        """
+        Scales the values of all scaled variables
+        """
+        for var, scaling in self._variables.items():
+            if scaling is not None and var.value is not None:
+                var.set_value(var.value * scaling[0], skip_validation=True)
+
+    def _scale_variable(self, var):
+        """
+        Scales bounds and value of a variable (the value is only scaled, if the
+        values of the other variables are scaled as well)
+
+        :param var: variable data object
+        """
+        factor = self._suffix_finder.find(var)
+        if factor == 1:
+            self._variables[var] = None
+            return
+
+        self._variables[var] = (factor, var.lower, var.upper)
+        self._substitution_map[id(var)] = var / factor
+        self._set_scaled_bounds(var, factor)
+        if self.values_scaled and var.value is not None:
+            var.set_value(var.value * factor, skip_validation=True)
+
+    def _set_scaled_bounds(self, var, factor: float):
+        """
+        Sets the bounds of a variable to its scaled original bounds
+
+        :param var: variable data object
+        :param float factor: scaling factor
+        """
+        _, lower, upper = self._variables[var]
+        if lower is not None:
+            lower = lower * factor
+        if upper is not None:
+            upper = upper * factor
+        if factor < 0:
+            lower, upper = upper, lower
+        var.setlb(lower)
+        var.setub(upper)
+
+    def _scale_constraint(self, con):
+        """
+        Scales a constraint or objective and substitutes all scaled variables
+
+        :param con: constraint or objective data object
+        """
+        factor = self._suffix_finder.find(con)
+
+        if con.ctype is pyo.Objective:
+            expr = con.expr
+            scaled_expr = self._substitute(expr)
+            if factor == 1 and scaled_expr is expr:
+                self._constraints[con] = None
+                return
+            self._constraints[con] = expr
+            con.expr = factor * scaled_expr
+            return
+
+        body = con.body
+        scaled_body = self._substitute(body)
+        if factor == 1 and scaled_body is body:
+            self._constraints[con] = None
+            return
+
+        self._constraints[con] = con.expr
+        lower = con.lower
+        upper = con.upper
+        if lower is not None:
+            lower = lower * factor
+        if upper is not None:
+            upper = upper * factor
+        if factor < 0:
+            lower, upper = upper, lower
+        scaled_body = factor * scaled_body
+
+        if con.equality:
+            con.set_value((lower, scaled_body))
+        else:
+            con.set_value((lower, scaled_body, upper))
+
+    def _substitute(self, expr):
+        """
+        Substitutes all scaled variables in an expression
+
+        :param expr: pyomo expression
+        :return: expression with scaled variables (the same object, if no variable
+            has been substituted)
+        """
+        if not self._substitution_map:
+            return expr
+        return replace_expressions(
+            expr=expr,
+            substitution_map=self._substitution_map,
+            descend_into_named_expressions=True,
+            remove_named_expressions=True,
+        )
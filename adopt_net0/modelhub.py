@@ -1,6 +1,12 @@
+import contextlib
 import random
 from pathlib import Path
+import dill
 import pyomo.environ as pyo
+import pyomo.gdp as gdp
+from pyomo.common.collections import ComponentSet
+from pyomo.core.expr import replace_expressions
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 import os
 import time
 import numpy as np
@@ -10,10 +16,20 @@ import datetime
 
 from .utilities import get_set_t
 from .data_management import DataHandle, read_tec_data
+from .data_management.utilities import map_in_parallel
+from .data_management.caching import (
+    MODEL_CACHE_FOLDER,
+    get_cache_path,
+    get_model_hash,
+    read_cached_object,
+    write_cached_object,
+)
 from .model_construction import *
 from .result_management.read_results import add_values_to_summary
 from .utilities import get_glpk_parameters, get_gurobi_parameters
 from .result_management import *
+from .result_management.rolling_horizon import DESIGN_VARIABLES
+from .diagnostics import ConstructionProfiler, ScalingAnalyser
 from .components.utilities import (
     annualize,
     set_discount_rate,
@@ -40,6 +56,15 @@ class ModelHub:
     - self.info_pareto: Current pareto point (if used)
     - self.info_solving_algorithms: Information on time aggregation algorithms
     - self.info_monte_carlo: Information on monte carlo runs
+    - self.info_sweep: Information on parallel sweeps (if summaries are collected
+      instead of written to the summary file)
+    - self.construction_profiler: Records time, memory and size of the construction
+      steps (if enabled in the configuration)
+    - self.scaler: Scales the model in place (if enabled in the configuration)
+    - self.scaling_analyser: Derives scaling factors from the coefficient ranges of
+      the model (if enabled in the configuration)
+    - self.info_rolling_horizon: Information on the window of a rolling horizon
+      dispatch (if the model is a window)
     """
 
     def __init__(self):
@@ -59,6 +84,14 @@ class ModelHub:
         self.info_solving_algorithms["time_stage"] = 1
         self.info_monte_carlo = {}
         self.info_monte_carlo["monte_carlo_run"] = -1
+        self.info_sweep = {}
+        self.info_sweep["collect_summaries"] = False
+        self.info_sweep["summaries"] = []
+        self.construction_profiler = ConstructionProfiler()
+        self.scaler = None
+        self.scaling_analyser = None
+        self.info_rolling_horizon = {}
+        self.info_rolling_horizon["nr_timesteps_committed"] = None
 
     def read_data(
         self, data_path: Path | str, start_period: int = None, end_period: int = None
@@ -235,6 +268,10 @@ class ModelHub:
         model = self.model[aggregation_model]
         topology = self.data.topology
         config = self.data.model_config
+        profiler = ConstructionProfiler(
+            config["reporting"]["profile_construction"]["value"]
+        )
+        self.construction_profiler = profiler
 
         # DEFINE GLOBAL SETS
         # Nodes, Carriers, Technologies, Networks
@@ -246,6 +283,9 @@ class ModelHub:
         model.var_npv = pyo.Var()
         model.var_emissions_net = pyo.Var()
 
+        # Time spent on constructing node blocks (excl. technologies)
+        construction_time_nodes = 0
+
         # INVESTMENT PERIOD BLOCK
         def init_period_block(b_period):
             """Pyomo rule to initialize a block holding all investment periods"""
@@ -256,7 +296,8 @@ class ModelHub:
                 self.data, investment_period, aggregation_data
             )
             # Add sets, parameters, variables, constraints to block
-            b_period = construct_investment_period_block(b_period, data_period)
+            with profiler.profile("investment_period", investment_period, b_period):
+                b_period = construct_investment_period_block(b_period, data_period)
 
             # NETWORK BLOCK
             if not config["energybalance"]["copperplate"]["value"]:
@@ -264,13 +305,16 @@ class ModelHub:
                 def init_network_block(b_netw, netw):
                     """Pyomo rule to initialize a block holding all networks"""
                     # Add sets, parameters, variables, constraints to block
-                    b_netw = construct_network_block(
-                        b_netw,
-                        data_period,
-                        model.set_nodes,
-                        b_period.set_t_full,
-                        b_period.set_t_clustered,
-                    )
+                    with profiler.profile(
+                        "network", f"{investment_period}/{netw}", b_netw
+                    ):
+                        b_netw = construct_network_block(
+                            b_netw,
+                            data_period,
+                            model.set_nodes,
+                            b_period.set_t_full,
+                            b_period.set_t_clustered,
+                        )
 
                     return b_netw
 
@@ -281,19 +325,30 @@ class ModelHub:
             # NODE BLOCK
             def init_node_block(b_node, node):
                 """Pyomo rule to initialize a block holding all nodes"""
+                nonlocal construction_time_nodes
+                start_node = time.time()
+
                 # Get data for node
                 data_node = get_data_for_node(data_period, node)
 
                 # Add sets, parameters, variables, constraints to block
-                b_node = construct_node_block(
-                    b_node, data_node, b_period.set_t_full, b_period.set_t_clustered
-                )
+                with profiler.profile("node", f"{investment_period}/{node}", b_node):
+                    b_node = construct_node_block(
+                        b_node, data_node, b_period.set_t_full, b_period.set_t_clustered
+                    )
+                construction_time_nodes += time.time() - start_node
 
                 # TECHNOLOGY BLOCK
                 def init_technology_block(b_tec, tec):
-                    b_tec = construct_technology_block(
-                        b_tec, data_node, b_period.set_t_full, b_period.set_t_clustered
-                    )
+                    with profiler.profile(
+                        "technology", f"{investment_period}/{node}/{tec}", b_tec
+                    ):
+                        b_tec = construct_technology_block(
+                            b_tec,
+                            data_node,
+                            b_period.set_t_full,
+                            b_period.set_t_clustered,
+                        )
 
                     return b_tec
 
@@ -309,6 +364,11 @@ class ModelHub:
 
         model.periods = pyo.Block(model.set_periods, rule=init_period_block)
 
+        log_msg = (
+            f"Constructing node parameters, variables and constraints completed in "
+            f"{str(round(construction_time_nodes, 1))}s"
+        )
+        log.info(log_msg)
         log_msg = f"Constructing model completed in {str(round(time.time() - start))}s"
         log.info(log_msg)
 
@@ -324,22 +384,37 @@ class ModelHub:
         data = self.data
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
 
+        profiler = self.construction_profiler
+        profiler.entries = [
+            entry for entry in profiler.entries if entry["kind"] != "balance"
+        ]
+
+        # A persistent solver instance refers to the deleted balances
+        self.solver = None
         model = delete_all_balances(model)
 
         if not config["energybalance"]["copperplate"]["value"]:
-            model = construct_network_constraints(model, config)
-            model = construct_nodal_energybalance(model, config)
+            with profiler.profile("balance", "network_constraints", model):
+                model = construct_network_constraints(model, config)
+            with profiler.profile("balance", "nodal_energybalance", model):
+                model = construct_nodal_energybalance(model, config)
         else:
-            model = construct_global_energybalance(model, config)
+            with profiler.profile("balance", "global_energybalance", model):
+                model = construct_global_energybalance(model, config)
 
-        model = construct_emission_balance(model, data)
-        model = construct_system_cost(model, data)
-        model = construct_global_balance(model)
+        with profiler.profile("balance", "emission_balance", model):
+            model = construct_emission_balance(model, data)
+        with profiler.profile("balance", "system_cost", model):
+            model = construct_system_cost(model, data)
+        with profiler.profile("balance", "global_balance", model):
+            model = construct_global_balance(model)
 
         log_msg = (
             f"Constructing balances completed in {str(round(time.time() - start))}s"
         )
         log.warning(log_msg)
+        if profiler.enabled:
+            profiler.log_summary()
 
     def solve(self):
         """
@@ -358,6 +433,13 @@ class ModelHub:
         else:
             self._optimize(objective)
 
+        # Restore the unscaled model (a persistent solver instance holds the scaled
+        # model and cannot be reused)
+        if self.scaler is not None:
+            self.scaler.unscale()
+            self.scaler = None
+            self.solver = None
+
     def quick_solve(self):
         """
         Quick-solves the model (constructs model and balances and solves model).
@@ -366,47 +448,367 @@ class ModelHub:
         - :func:`~adopt_net0.modelhub.construct_model`
         - :func:`~adopt_net0.modelhub.construct_balances`
         - :func:`~adopt_net0.modelhub.solve`
+
+        If caching of the model is enabled in the model configuration, the
+        constructed model is read from the cache in case the input data and the
+        configuration relevant for the construction did not change. Otherwise, the
+        model is constructed and written to the cache.
         """
-        self.construct_model()
-        self.construct_balances()
+        # The hash needs to be computed before the construction, as the
+        # construction adds model information to the technology and network data
+        cache_file = self._get_model_cache_file()
+        if not self._read_model_from_cache(cache_file):
+            self.construct_model()
+            self.construct_balances()
+            self._write_model_to_cache(cache_file)
         self.solve()
 
-    def write_results(self):
+    def solve_rolling_horizon(self, design_results: Path | str = None):
         """
-        Writes optimization results of a model run to folder
+        Solves the operation of a fixed design with a rolling horizon
+
+        The design (sizes of technologies and network arcs) is either taken from the
+        last solve or read from the h5 results of a previous run. The operation is
+        solved at full resolution in consecutive windows. Each window consists of
+        the timesteps committed in the window and a look-ahead, of which the
+        lengths are specified in the model configuration. The storage levels at the
+        end of the committed timesteps of a window are the initial storage levels
+        of the next window (storage levels of the first window are cyclic). The
+        models of the windows are constructed one after the other, so that memory
+        and solving time scale linearly with the length of the time horizon.
+
+        The results of each window (excluding its look-ahead) are written to a
+        subfolder of the result folder and merged into a single h5 file (see
+        :func:`~adopt_net0.result_management.merge_window_results`).
+
+        :param Path, str design_results: h5 result file to read the design from. If
+            None, the design of the last solve is used.
         """
-        # Write H5 File
         config = self.data.model_config
+        objective = config["optimization"]["objective"]["value"]
+        nr_timesteps_window = config["optimization"]["rolling_horizon"]["window"][
+            "value"
+        ]
+        nr_timesteps_lookahead = config["optimization"]["rolling_horizon"]["lookahead"][
+            "value"
+        ]
+
+        if objective not in ["costs", "emissions_net", "emissions_minC"]:
+            raise Exception(
+                f"Objective {objective} is not supported for a rolling horizon"
+            )
+        if nr_timesteps_window < 1 or nr_timesteps_lookahead < 0:
+            raise ValueError(
+                "The window of a rolling horizon needs to contain at least one "
+                "timestep and the look-ahead cannot be negative"
+            )
+
+        if design_results is None:
+            design = self._get_design()
+        else:
+            design = read_design_from_h5(design_results)
+
+        log_msg = "--- Solving rolling horizon ---"
+        log.info(log_msg)
+        start = time.time()
+
+        result_folder_path = self._create_result_folder()
+        nr_timesteps = len(self.data.topology["time_index"]["full"])
+
+        window_folders = []
+        window_nr_timesteps = []
+        summaries = []
+        storage_levels = None
+        for window, window_start in enumerate(
+            range(0, nr_timesteps, nr_timesteps_window)
+        ):
+            end_committed = min(window_start + nr_timesteps_window, nr_timesteps)
+            end = min(end_committed + nr_timesteps_lookahead, nr_timesteps)
+            nr_timesteps_committed = end_committed - window_start
+            log_msg = (
+                f"Solving window {window + 1} (timesteps {window_start + 1} to "
+                f"{end_committed}, look-ahead to {end})"
+            )
+            log.info(log_msg)
+
+            window_hub = ModelHub()
+            window_hub.data = self.data.get_time_window(window_start, end)
+            # Costs of the design are accounted for in the committed timesteps
+            window_hub.data.topology["fraction_of_year_modelled"] = (
+                self.data.topology["fraction_of_year_modelled"]
+                * nr_timesteps_committed
+                / nr_timesteps
+            )
+            window_config = window_hub.data.model_config
+            window_config["optimization"]["typicaldays"]["N"]["value"] = 0
+            window_config["optimization"]["timestaging"]["value"] = 0
+            window_config["optimization"]["monte_carlo"]["N"]["value"] = 0
+            window_config["reporting"]["save_path"]["value"] = str(
+                result_folder_path / "windows"
+            )
+            window_config["reporting"]["case_name"]["value"] = f"window{window + 1}"
+            window_hub.info_sweep["collect_summaries"] = True
+            window_hub.info_rolling_horizon["nr_timesteps_committed"] = (
+                nr_timesteps_committed
+            )
+
+            window_hub.construct_model()
+            window_hub.construct_balances()
+            window_hub._fix_design(design)
+            if storage_levels is not None:
+                window_hub._set_initial_storage_levels(storage_levels)
+            window_hub._define_solver_settings()
+            window_hub._optimize(objective)
+
+            if not window_hub._solution_has_results():
+                raise Exception(
+                    f"Window {window + 1} of the rolling horizon could not be solved"
+                )
+            storage_levels = window_hub._get_storage_levels(nr_timesteps_committed)
+            window_folders.append(window_hub.last_solve_info["result_folder_path"])
+            window_nr_timesteps.append(nr_timesteps_committed)
+            summary_dict = window_hub.info_sweep["summaries"][-1]
+            summary_dict["case"] = config["reporting"]["case_name"]["value"]
+            summaries.append(summary_dict)
+
+        summary_dict = merge_window_results(
+            window_folders, window_nr_timesteps, summaries, result_folder_path
+        )
+        self.last_solve_info["result_folder_path"] = result_folder_path
 
-        save_summary_path = Path.joinpath(
-            Path(config["reporting"]["save_summary_path"]["value"]), "Summary.xlsx"
+        if self.info_sweep["collect_summaries"]:
+            self.info_sweep["summaries"].append(summary_dict)
+        else:
+            self._write_summary([summary_dict])
+
+        log.info(
+            "Solving rolling horizon completed in "
+            + str(round(time.time() - start))
+            + " s"
         )
 
-        model_info = self.last_solve_info
+    def solve_fixed_design(self, binaries: str = "keep"):
+        """
+        Fixes the design of the last solve and solves the operation of this design
+
+        The sizes of technologies and network arcs and the binaries of their
+        installation (disjuncts of the capex models) are fixed to the last solution.
+        Disjuncts that are inactive in the last solution are removed from the model.
+        The remaining binaries (e.g. of on/off disjuncts of conversion technologies)
+        are treated as follows:
+
+        - "keep": binaries are kept, the model is solved as a (smaller) MILP
+        - "fix": binaries are fixed to the last solution and inactive disjuncts are
+          removed, the model is solved as a LP
+        - "relax": binaries are relaxed to continuous variables, the model is solved
+          as a LP
+
+        The model (and a persistent solver holding it) is reused. The design remains
+        fixed afterwards, so that operational scenarios (e.g. changed prices or
+        demands) can be evaluated by changing the model and calling :func:`solve`.
+
+        The design is fixed to the values of the last solution, which are only
+        accurate up to the tolerances of the solver. If the re-solve is reported as
+        infeasible (or unbounded) by the presolve of the solver, presolve can be
+        turned off in the solver options.
+
+        :param str binaries: treatment of binaries that are not related to the
+            design ("keep", "fix" or "relax")
+        """
+        if binaries not in ["keep", "fix", "relax"]:
+            raise ValueError("binaries needs to be 'keep', 'fix' or 'relax'")
 
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
+        variables = list(model.component_data_objects(pyo.Var, descend_into=True))
+        fixed = ComponentSet(var for var in variables if var.fixed)
+
+        self._fix_design(self._get_design())
+        self._fix_binaries(
+            [
+                disjunct.binary_indicator_var
+                for disjunct in model.component_data_objects(
+                    gdp.Disjunct, active=None, descend_into=True
+                )
+                if disjunct.parent_component().local_name.startswith("dis_installation")
+            ]
+        )
+
+        remaining = [var for var in variables if var.is_integer() and not var.fixed]
+        if binaries == "fix":
+            self._fix_binaries(remaining)
+        elif binaries == "relax":
+            self._relax_binaries(remaining)
+
+        log_msg = (
+            f"Fixed design, {len(remaining)} integer variables of the operation are "
+            + {"keep": "kept", "fix": "fixed", "relax": "relaxed"}[binaries]
+        )
+        log.info(log_msg)
+
+        # Pass fixed and relaxed variables to a persistent solver holding the model
+        changed = [var for var in variables if var.fixed and var not in fixed]
+        if binaries == "relax":
+            changed.extend(remaining)
+        self._update_variables_in_persistent_solver(
+            list(ComponentSet(var.parent_component() for var in changed))
+        )
+
+        self.solve()
+
+    def _get_model_cache_file(self) -> Path | None:
+        """
+        Returns the cache file of the constructed model
+
+        :return: path of the cache file or None, if caching of the model is disabled
+        :rtype: Path | None
+        """
+        config = self.data.model_config
+        if not config["caching"]["model"]["value"]:
+            return None
+
+        model_hash = get_model_hash(self.data, config)
+        return (
+            get_cache_path(self.data.data_path, config)
+            / MODEL_CACHE_FOLDER
+            / (model_hash + ".pkl")
+        )
 
-        summary_dict = write_optimization_results_to_h5(
-            model, self.solution, model_info, self.data
+    def _read_model_from_cache(self, cache_file: Path | None) -> bool:
+        """
+        Reads the constructed model (including balances) from the cache
+
+        :param Path, None cache_file: cache file of the model (None if caching of the
+            model is disabled)
+        :return: True, if the model has been read from the cache
+        :rtype: bool
+        """
+        if cache_file is None:
+            return False
+
+        cached_model = read_cached_object(cache_file, pickler=dill)
+        if cached_model is None:
+            return False
+
+        self.info_solving_algorithms["aggregation_model"] = cached_model[
+            "aggregation_model"
+        ]
+        self.info_solving_algorithms["aggregation_data"] = cached_model[
+            "aggregation_data"
+        ]
+        self.model[cached_model["aggregation_model"]] = cached_model["model"]
+        self.data.technology_data = cached_model["technology_data"]
+        self.data.network_data = cached_model["network_data"]
+        for period, node, tec in cached_model["technology_components"]:
+            self.data.technology_data[period][node][tec].set_model_components(
+                cached_model["technology_components"][period, node, tec]
+            )
+        for period, netw in cached_model["network_components"]:
+            self.data.network_data[period][netw].set_model_components(
+                cached_model["network_components"][period, netw]
+            )
+        self.construction_profiler = ConstructionProfiler(
+            self.data.model_config["reporting"]["profile_construction"]["value"]
         )
+        log.info(f"Constructed model read from cache {cache_file}")
+        return True
+
+    def _write_model_to_cache(self, cache_file: Path | None):
+        """
+        Writes the constructed model (including balances) to the cache
+
+        Technologies and networks are cached together with the model, as they hold
+        references to the components of the model. These references are not pickled
+        with the technologies and networks and are thus cached separately.
+
+        :param Path, None cache_file: cache file of the model (None if caching of the
+            model is disabled)
+        """
+        if cache_file is None:
+            return
+
+        aggregation_model = self.info_solving_algorithms["aggregation_model"]
+        technology_components = {}
+        for period in self.data.technology_data:
+            for node in self.data.technology_data[period]:
+                for tec in self.data.technology_data[period][node]:
+                    technology_components[period, node, tec] = (
+                        self.data.technology_data[period][node][
+                            tec
+                        ].get_model_components()
+                    )
+        network_components = {}
+        for period in self.data.network_data:
+            for netw in self.data.network_data[period]:
+                network_components[period, netw] = self.data.network_data[period][
+                    netw
+                ].get_model_components()
+
+        write_cached_object(
+            cache_file,
+            {
+                "aggregation_model": aggregation_model,
+                "aggregation_data": self.info_solving_algorithms["aggregation_data"],
+                "model": self.model[aggregation_model],
+                "technology_data": self.data.technology_data,
+                "network_data": self.data.network_data,
+                "technology_components": technology_components,
+                "network_components": network_components,
+            },
+            pickler=dill,
+        )
+
+    def write_results(self):
+        """
+        Writes optimization results of a model run to folder
+        """
+        # Write H5 File
+        model_info = self.last_solve_info
+
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        # Results of a rolling horizon window exclude its look-ahead
+        nr_timesteps_committed = self.info_rolling_horizon["nr_timesteps_committed"]
+        if nr_timesteps_committed is None:
+            results_context = contextlib.nullcontext()
+        else:
+            results_context = exclude_lookahead(model, nr_timesteps_committed)
+
+        with results_context:
+            summary_dict = write_optimization_results_to_h5(
+                model, self.solution, model_info, self.data
+            )
 
         # Write Summary
-        if not os.path.exists(save_summary_path):
-            summary_df = pd.DataFrame(data=summary_dict, index=[0])
-            summary_df.to_excel(save_summary_path, index=False, sheet_name="Summary")
+        if self.info_sweep["collect_summaries"]:
+            self.info_sweep["summaries"].append(summary_dict)
         else:
-            summary_existing = pd.read_excel(save_summary_path)
-            pd.concat(
-                [summary_existing, pd.DataFrame(data=summary_dict, index=[0])]
-            ).to_excel(save_summary_path, index=False, sheet_name="Summary")
+            self._write_summary([summary_dict])
+
+    def _write_summary(self, summary_dicts: list):
+        """
+        Appends the summaries of one or more model runs to the summary file
+
+        :param list summary_dicts: list of summaries (one dict per run)
+        """
+        config = self.data.model_config
+
+        append_to_summary(get_summary_path(config), summary_dicts)
 
     def add_technology(self, investment_period: str, node: str, technologies: list):
         """
         Adds technologies retrospectively to the model.
 
-        After adding a technology to a node, all balances need to be re-constructed,
-        To solve the model again run, :func:`~construct_balances` and then
-        :func:`~solve`.
+        If the balances have been constructed already, only the balances containing
+        technologies are updated (see
+        :func:`~adopt_net0.model_construction.add_technologies_to_balances`). If a
+        persistent solver holds the model, the new technologies and the updated
+        balances are passed to the solver, so that the model is not passed to the
+        solver again. To solve the model again, run :func:`~solve`. The variables of
+        the new technologies are initialized with zero, such that the previous
+        solution (without installing the new technologies) is used as a warm start.
+
+        If a technology is replaced (i.e. it existed at the node before), all
+        balances are re-constructed.
 
         :param str investment_period: name of investment period for which technology is added
         :param str node: name of node for which technology is added
@@ -454,6 +856,7 @@ class ModelHub:
         # Add technology to node
         b_period = model.periods[investment_period]
         b_node = b_period.node_blocks[node]
+        replaced_technologies = set(technologies) & set(b_node.set_technologies)
 
         # Create new technology block containing all new technologies
         def init_technology_block(b_tec, tec):
@@ -465,6 +868,24 @@ class ModelHub:
 
         b_node.tech_blocks_new = pyo.Block(technologies, rule=init_technology_block)
 
+        # Carriers that are not used at the node are not part of the node block and
+        # the balances
+        missing_carriers = {
+            car
+            for tec in technologies
+            for car in b_node.tech_blocks_new[tec].set_input_carriers_all
+            | b_node.tech_blocks_new[tec].set_output_carriers_all
+            if car not in b_node.set_carriers
+        }
+        if missing_carriers:
+            b_node.del_component(b_node.tech_blocks_new)
+            for technology in set(technologies) - replaced_technologies:
+                del self.data.technology_data[investment_period][node][technology]
+            raise Exception(
+                f"Technologies cannot be added to {node}, as the carriers "
+                f"{sorted(missing_carriers)} are not used at the node"
+            )
+
         # If it exists, carry over active tech blocks to temporary block
         if b_node.find_component("tech_blocks_active"):
             b_node.tech_blocks_existing = pyo.Block(b_node.set_technologies)
@@ -500,6 +921,29 @@ class ModelHub:
         if b_node.find_component("tech_blocks_existing_index"):
             b_node.del_component(b_node.tech_blocks_existing_index)
 
+        # Update balances
+        if model.find_component("block_costbalance") is None:
+            return
+        if replaced_technologies:
+            self.construct_balances()
+            return
+
+        changed_constraints = add_technologies_to_balances(
+            model, self.data, investment_period, node, technologies
+        )
+        tec_blocks = [b_node.tech_blocks_active[tec] for tec in technologies]
+        # Warm start: new technologies are not installed
+        for var in _get_constraints_and_variables(tec_blocks)[1]:
+            if var.value is None:
+                value = 0
+                if var.lb is not None:
+                    value = max(value, var.lb)
+                if var.ub is not None:
+                    value = min(value, var.ub)
+                var.set_value(value, skip_validation=True)
+        self._add_to_persistent_solver(tec_blocks)
+        self._update_constraints_in_persistent_solver(changed_constraints)
+
     def _define_solver_settings(self):
         """
         Defines solver and its settings depending on objective and solver
@@ -509,14 +953,33 @@ class ModelHub:
 
         objective = config["optimization"]["objective"]["value"]
 
+        # Reuse a persistent solver that holds the model (e.g. after adding
+        # technologies), only the solver options are updated
+        if (
+            config["solveroptions"]["solver"]["value"] == "gurobi_persistent"
+            and self._persistent_solver_in_use()
+            and self.solver._pyomo_model is model
+        ):
+            log.info("Reusing the model instance of the persistent solver")
+            self.solver.options.update(
+                get_gurobi_parameters(config["solveroptions"]).options
+            )
+            return
+
         # Set solver
         if config["solveroptions"]["solver"]["value"] in [
             "gurobi",
             "gurobi_persistent",
         ]:
-            # Gurobi
-            if not config["scaling"]["scaling_on"]["value"]:
-                if objective in ["emissions_minC", "pareto"]:
+            # Gurobi (a persistent solver requires the model to be scaled in place)
+            if (
+                not config["scaling"]["scaling_on"]["value"]
+                or config["scaling"]["in_place"]["value"]
+            ):
+                if (
+                    objective in ["emissions_minC", "pareto"]
+                    or config["optimization"]["monte_carlo"]["N"]["value"]
+                ):
                     config["solveroptions"]["solver"]["value"] = "gurobi_persistent"
             self.solver = get_gurobi_parameters(config["solveroptions"])
 
@@ -525,6 +988,11 @@ class ModelHub:
 
         # For persistent solver, set model instance
         if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
+            if (
+                config["scaling"]["scaling_on"]["value"]
+                and config["scaling"]["in_place"]["value"]
+            ):
+                self._scale_model_in_place()
             self.solver.set_instance(model)
 
     def _optimize(self, objective):
@@ -590,22 +1058,10 @@ class ModelHub:
         """
         Minimize costs at emission limit
         """
-        model = self.model[self.info_solving_algorithms["aggregation_model"]]
-
         config = self.data.model_config
 
         emission_limit = config["optimization"]["emission_limit"]["value"]
-        if model.find_component("const_emission_limit"):
-            if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-                self.solver.remove_constraint(model.const_emission_limit)
-            model.del_component(model.const_emission_limit)
-        model.const_emission_limit = pyo.Constraint(
-            expr=model.var_emissions_net <= emission_limit
-        )
-        if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-            self.solver.add_constraint(model.const_emission_limit)
-        log_msg = "Defined constraint on net emissions"
-        log.info(log_msg)
+        self._set_emission_limit(emission_limit)
         self._optimize_cost()
 
     def _optimize_costs_minE(self):
@@ -614,20 +1070,30 @@ class ModelHub:
         """
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
 
-        config = self.data.model_config
-
         self._optimize_emissions_net()
         emission_limit = model.var_emissions_net.value
+        self._set_emission_limit(emission_limit * 1.001)
+        self._optimize_cost()
+
+    def _set_emission_limit(self, emission_limit: float):
+        """
+        Defines (or replaces) the constraint on net emissions
+
+        :param float emission_limit: upper limit on net emissions
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        config = self.data.model_config
+
         if model.find_component("const_emission_limit"):
-            if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-                self.solver.remove_constraint(model.const_emission_limit)
+            self._remove_from_persistent_solver([model.const_emission_limit])
             model.del_component(model.const_emission_limit)
         model.const_emission_limit = pyo.Constraint(
-            expr=model.var_emissions_net <= emission_limit * 1.001
+            expr=model.var_emissions_net <= emission_limit
         )
-        if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-            self.solver.add_constraint(model.const_emission_limit)
-        self._optimize_cost()
+        self._add_to_persistent_solver([model.const_emission_limit])
+        log_msg = "Defined constraint on net emissions"
+        log.info(log_msg)
 
     def scale_model(self):
         """
@@ -635,11 +1101,59 @@ class ModelHub:
         for technologies and networks as well as the global scaling factors
         specified. See also the documentation on model scaling.
         """
+        model_full = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        self._set_scaling_factors()
+
+        self.model["scaled"] = pyo.TransformationFactory(
+            "core.scale_model"
+        ).create_using(model_full)
+
+    def _scale_model_in_place(self):
+        """
+        Scales the model in place using the same scale factors as scale_model
+
+        Components that have been scaled before are not scaled again, such that this
+        can be called before each solve.
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        self._set_scaling_factors()
+        if self.scaler is None or self.scaler.model is not model:
+            self.scaler = InPlaceScaler(model)
+        self.scaler.scale()
+
+    def _set_scaling_factors(self):
+        """
+        Defines the scaling_factor suffix of the model from the scale factors
+        specified in the json files for technologies and networks as well as the
+        global scaling factors
+
+        If automatic scaling is enabled, the scale factors are derived from the
+        coefficient ranges of the model instead (only the scaling factor of the
+        objective is taken from the global scaling factors).
+        """
         config = self.data.model_config
 
         f_global = config["scaling"]["scaling_factors"]
         model_full = self.model[self.info_solving_algorithms["aggregation_model"]]
 
+        if model_full.find_component("scaling_factor") is not None:
+            model_full.del_component(model_full.scaling_factor)
+
+        if config["scaling"]["automatic"]["value"]:
+            self._derive_scaling_factors()
+            model_full.scaling_factor = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+            for component, factor in self.scaling_analyser.scaling_factors.items():
+                # Skip components that have been deleted
+                if component.parent_block() is not None:
+                    model_full.scaling_factor[component] = factor
+            if model_full.find_component("objective") is not None:
+                model_full.scaling_factor[model_full.objective] = f_global["objective"][
+                    "value"
+                ]
+            return
+
         model_full.scaling_factor = pyo.Suffix(direction=pyo.Suffix.EXPORT)
 
         # Scale technologies
@@ -787,13 +1301,29 @@ class ModelHub:
             f_global["cost_vars"]["value"] * f_global["energy_vars"]["value"]
         )
         # Scale objective
-        model_full.scaling_factor[model_full.objective] = (
-            f_global["objective"]["value"] * f_global["cost_vars"]["value"]
-        )
+        if model_full.find_component("objective") is not None:
+            model_full.scaling_factor[model_full.objective] = (
+                f_global["objective"]["value"] * f_global["cost_vars"]["value"]
+            )
 
-        self.model["scaled"] = pyo.TransformationFactory(
-            "core.scale_model"
-        ).create_using(model_full)
+    def _derive_scaling_factors(self):
+        """
+        Derives scaling factors from the coefficient ranges of the model with
+        geometric mean scaling
+
+        Scaling factors are derived once per model, such that they are based on the
+        unscaled model.
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        if self.scaling_analyser is None or self.scaling_analyser.model is not model:
+            start = time.time()
+            self.scaling_analyser = ScalingAnalyser(model)
+            self.scaling_analyser.derive_scaling_factors()
+            log.info(
+                "Derived scaling factors in " + str(round(time.time() - start)) + " s"
+            )
+            self.scaling_analyser.log_summary()
 
     def _call_solver(self):
         """
@@ -804,29 +1334,31 @@ class ModelHub:
         start = time.time()
         config = self.data.model_config
 
-        # Create save path and folder
-        time_stamp = datetime.datetime.fromtimestamp(start).strftime("%Y%m%d%H%M%S")
-        save_path = Path(config["reporting"]["save_path"]["value"])
-
-        if config["reporting"]["case_name"]["value"] == -1:
-            folder_name = str(time_stamp)
-        else:
-            folder_name = (
-                str(time_stamp) + "_" + config["reporting"]["case_name"]["value"]
-            )
-        if self.info_pareto["pareto_point"]:
-            folder_name = folder_name + str(self.info_pareto["pareto_point"])
+        result_folder_path = self._create_result_folder()
 
-        result_folder_path = create_unique_folder_name(save_path, folder_name)
-        create_save_folder(result_folder_path)
+        if self.construction_profiler.enabled:
+            self.construction_profiler.write_report(result_folder_path)
 
         # Scale model
-        if config["scaling"]["scaling_on"]["value"] == 1:
+        scale_in_place = (
+            config["scaling"]["scaling_on"]["value"] == 1
+            and config["scaling"]["in_place"]["value"] == 1
+        )
+        if scale_in_place:
+            self._scale_model_in_place()
+            model = self.model[self.info_solving_algorithms["aggregation_model"]]
+        elif config["scaling"]["scaling_on"]["value"] == 1:
             self.scale_model()
             model = self.model["scaled"]
         else:
             model = self.model[self.info_solving_algorithms["aggregation_model"]]
 
+        if (
+            config["scaling"]["scaling_on"]["value"] == 1
+            and config["scaling"]["automatic"]["value"] == 1
+        ):
+            self.scaling_analyser.write_report(result_folder_path)
+
         # Call solver
         if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
             self.solver.set_objective(model.objective)
@@ -847,7 +1379,14 @@ class ModelHub:
                 keepfiles=True,
             )
 
-        if config["scaling"]["scaling_on"]["value"] == 1:
+        if scale_in_place:
+            # A persistent solver holds the scaled model, so only the values are
+            # unscaled
+            if self._persistent_solver_in_use():
+                self.scaler.unscale_values()
+            else:
+                self.scaler.unscale()
+        elif config["scaling"]["scaling_on"]["value"] == 1:
             pyo.TransformationFactory("core.scale_model").propagate_solution(
                 model, self.model[self.info_solving_algorithms["aggregation_model"]]
             )
@@ -866,23 +1405,63 @@ class ModelHub:
         self.last_solve_info["time_stage"] = self.info_solving_algorithms["time_stage"]
 
         # Write results to path
-        # Determine if results should be written
-        write_results = False
-        if (self.solution.solver.status == pyo.SolverStatus.ok) or (
-            self.solution.solver.status == pyo.SolverStatus.warning
-        ):
-            write_results = True
+        if self._solution_has_results():
+            self.write_results()
+
+        log.info("Solving model completed in " + str(round(time.time() - start)) + " s")
+
+    def _create_result_folder(self) -> Path:
+        """
+        Creates the result folder of a solve (named by time stamp, case name and
+        pareto point) in the save path
+
+        :return: path of the result folder
+        :rtype: Path
+        """
+        config = self.data.model_config
+
+        time_stamp = datetime.datetime.fromtimestamp(time.time()).strftime(
+            "%Y%m%d%H%M%S"
+        )
+        save_path = Path(config["reporting"]["save_path"]["value"])
+
+        if config["reporting"]["case_name"]["value"] == -1:
+            folder_name = str(time_stamp)
+        else:
+            folder_name = (
+                str(time_stamp) + "_" + config["reporting"]["case_name"]["value"]
+            )
+        if self.info_pareto["pareto_point"]:
+            folder_name = folder_name + str(self.info_pareto["pareto_point"])
+
+        while True:
+            result_folder_path = create_unique_folder_name(save_path, folder_name)
+            try:
+                create_save_folder(result_folder_path)
+                break
+            except FileExistsError:
+                # Folder was created in the meantime by another worker process
+                continue
+
+        return result_folder_path
+
+    def _solution_has_results(self) -> bool:
+        """
+        Checks if the last solution contains results that can be written
+
+        :return: True, if the solver finished with a solution
+        :rtype: bool
+        """
         if self.solution.solver.termination_condition in [
             pyo.TerminationCondition.infeasibleOrUnbounded,
             pyo.TerminationCondition.infeasible,
             pyo.TerminationCondition.unbounded,
         ]:
-            write_results = False
-
-        if write_results:
-            self.write_results()
-
-        log.info("Solving model completed in " + str(round(time.time() - start)) + " s")
+            return False
+        return self.solution.solver.status in [
+            pyo.SolverStatus.ok,
+            pyo.SolverStatus.warning,
+        ]
 
     def _write_solution_diagnostics(self, save_path):
         """
@@ -917,6 +1496,10 @@ class ModelHub:
     def _solve_pareto(self):
         """
         Optimize the pareto front
+
+        The extreme points (minimal costs and minimal emissions) are solved first.
+        The remaining pareto points are solved in parallel worker processes, if
+        more than one sweep worker is specified in the configuration.
         """
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
         config = self.data.model_config
@@ -936,45 +1519,59 @@ class ModelHub:
         emission_limits = np.linspace(emissions_max, emissions_min, num=pareto_points)[
             1:-1
         ]
+        points = [
+            (pareto_point, emission_limit * 1.005)
+            for pareto_point, emission_limit in enumerate(emission_limits, start=2)
+        ]
+
+        if self._get_sweep_workers(len(points)) > 1:
+            self._solve_sweep_in_parallel("pareto", points)
+        else:
+            self._solve_pareto_points(points)
 
-        for limit in range(0, len(emission_limits)):
-            self.info_pareto["pareto_point"] += 1
-            log_msg = f"Optimizing Pareto point {limit}"
+    def _solve_pareto_points(self, points: list):
+        """
+        Optimizes costs for a list of emission limits
+
+        :param list points: list of tuples (pareto point, emission limit)
+        """
+        for pareto_point, emission_limit in points:
+            self.info_pareto["pareto_point"] = pareto_point
+            log_msg = f"Optimizing Pareto point {pareto_point}"
             log.info(log_msg)
-            if limit != 0:
-                # If its not the first point, delete constraint
-                if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-                    self.solver.remove_constraint(model.const_emission_limit)
-                model.del_component(model.const_emission_limit)
-            model.const_emission_limit = pyo.Constraint(
-                expr=model.var_emissions_net <= emission_limits[limit] * 1.005
-            )
-            if config["solveroptions"]["solver"]["value"] == "gurobi_persistent":
-                self.solver.add_constraint(model.const_emission_limit)
+            self._set_emission_limit(emission_limit)
             self._optimize("costs")
 
     def _solve_monte_carlo(self, objective: str):
         """
         Optimizes multiple runs with monte carlo
 
+        The runs are solved in parallel worker processes, if more than one sweep
+        worker is specified in the configuration.
+
         :param str objective: objective to optimize
         """
         config = self.data.model_config
         self.info_monte_carlo["monte_carlo_run"] = 0
 
-        for run in range(0, config["optimization"]["monte_carlo"]["N"]["value"]):
-            self.info_monte_carlo["monte_carlo_run"] = run
-            self._monte_carlo_set_cost_parameters()
-            if run == 0:
-                # in this case we need to set the objective
-                self._optimize(objective)
-            else:
-                # in this case we can call the solver directly
-                self._call_solver()
+        runs = list(range(0, config["optimization"]["monte_carlo"]["N"]["value"]))
 
-        summary_path = Path.joinpath(
-            Path(config["reporting"]["save_summary_path"]["value"]), "Summary.xlsx"
-        )
+        if self._get_sweep_workers(len(runs)) > 1:
+            if config["optimization"]["monte_carlo"]["seed"]["value"] == -1:
+                # Workers need different random numbers, so we draw a seed
+                config["optimization"]["monte_carlo"]["seed"]["value"] = int(
+                    np.random.randint(0, 2**31 - len(runs))
+                )
+                log_msg = (
+                    f"Monte Carlo runs are seeded with "
+                    f"{config['optimization']['monte_carlo']['seed']['value']}"
+                )
+                log.info(log_msg)
+            self._solve_sweep_in_parallel("monte_carlo", runs, objective)
+        else:
+            self._solve_monte_carlo_runs(runs, objective)
+
+        summary_path = get_summary_path(config)
         if config["optimization"]["monte_carlo"]["type"]["value"] == "normal_dis":
             component_set = config["optimization"]["monte_carlo"]["on_what"]["value"]
         elif (
@@ -984,9 +1581,82 @@ class ModelHub:
             component_set = list(set(self.data.monte_carlo_specs["type"]))
         add_values_to_summary(summary_path, component_set=component_set)
 
+    def _solve_monte_carlo_runs(self, runs: list, objective: str):
+        """
+        Optimizes a list of monte carlo runs
+
+        :param list runs: list of monte carlo runs
+        :param str objective: objective to optimize
+        """
+        config = self.data.model_config
+        seed = config["optimization"]["monte_carlo"]["seed"]["value"]
+
+        for idx, run in enumerate(runs):
+            self.info_monte_carlo["monte_carlo_run"] = run
+            if seed != -1:
+                # Each run has its own seed to make results reproducible
+                np.random.seed(seed + run)
+                random.seed(seed + run)
+            self._monte_carlo_set_cost_parameters()
+            if idx == 0:
+                # in this case we need to set the objective
+                self._optimize(objective)
+            else:
+                # in this case we can call the solver directly
+                self._call_solver()
+
+    def _get_sweep_workers(self, nr_points: int) -> int:
+        """
+        Returns the number of worker processes to use for a sweep
+
+        :param int nr_points: number of points (runs) of the sweep
+        :return: number of worker processes
+        :rtype: int
+        """
+        config = self.data.model_config
+        return min(config["parallelization"]["sweep_workers"]["value"], nr_points)
+
+    def _solve_sweep_in_parallel(
+        self, sweep_type: str, points: list, objective: str = "costs"
+    ):
+        """
+        Solves the points of a pareto or monte carlo sweep in parallel worker processes
+
+        The points are split in contiguous chunks, one per worker. Each worker
+        rebuilds the model from the data handle and solves its chunk. Results are
+        written to the result folders by the workers, the summaries are collected
+        and written to the summary file in the order of the points.
+
+        :param str sweep_type: "pareto" or "monte_carlo"
+        :param list points: list of points to solve (pareto points with emission
+            limits or monte carlo runs)
+        :param str objective: objective to optimize (only for monte carlo)
+        """
+        nr_workers = self._get_sweep_workers(len(points))
+
+        log_msg = f"Solving {len(points)} points in {nr_workers} worker processes"
+        log.info(log_msg)
+
+        chunks = [
+            [points[i] for i in chunk]
+            for chunk in np.array_split(range(len(points)), nr_workers)
+        ]
+        arguments = [
+            (self.data, self.info_solving_algorithms, sweep_type, chunk, objective)
+            for chunk in chunks
+        ]
+        summaries = map_in_parallel(_solve_sweep_points, arguments, nr_workers)
+
+        self._write_summary([summary for chunk in summaries for summary in chunk])
+
     def _monte_carlo_set_cost_parameters(self):
         """
         Changes cost parameters for monte carlo analysis.
+
+        Cost parameters are mutable, so that constraints only need to be
+        reconstructed if they are part of a big-m relaxation. If a persistent solver
+        is used, only the changed constraints and variable bounds are updated in the
+        solver.
         """
         config = self.data.model_config
 
@@ -995,8 +1665,8 @@ class ModelHub:
         monte_carlo_type = config["optimization"]["monte_carlo"]["type"]["value"]
         monte_carlo_on = config["optimization"]["monte_carlo"]["on_what"]["value"]
 
-        import_constraint_reconstruction = False
-        export_constraint_reconstruction = False
+        import_constraint_update = False
+        export_constraint_update = False
 
         if monte_carlo_type == "normal_dis":
             if "Technologies" in monte_carlo_on:
@@ -1014,11 +1684,11 @@ class ModelHub:
 
             if "Import" in monte_carlo_on:
                 self._monte_carlo_import_parameters()
-                import_constraint_reconstruction = True
+                import_constraint_update = True
 
             if "Export" in monte_carlo_on:
                 self._monte_carlo_export_parameters()
-                export_constraint_reconstruction = True
+                export_constraint_update = True
 
         elif monte_carlo_type == "uniform_dis_from_file":
             MC_parameters = self.data.monte_carlo_specs
@@ -1103,18 +1773,18 @@ class ModelHub:
                                 log.warning(log_msg)
 
                 elif row["type"] == "Import":
-                    import_constraint_reconstruction = True
+                    import_constraint_update = True
                     car = row["name"]
                     self._monte_carlo_import_parameters(car, row)
                 elif row["type"] == "Export":
-                    export_constraint_reconstruction = True
+                    export_constraint_update = True
                     car = row["name"]
                     self._monte_carlo_export_parameters(car, row)
 
-        if import_constraint_reconstruction:
+        if import_constraint_update:
             self._monte_carlo_import_constraints()
 
-        if export_constraint_reconstruction:
+        if export_constraint_update:
             self._monte_carlo_export_constraints()
 
     def _monte_carlo_technologies(self, period, node, tec, MC_ranges=None):
@@ -1194,27 +1864,33 @@ class ModelHub:
             bounds = calculate_max_capex()
             b_tec.var_capex_aux.setlb(bounds[0])
             b_tec.var_capex_aux.setub(bounds[1])
+            self._update_variables_in_persistent_solver([b_tec.var_capex_aux])
 
-            # Delete constraints/conjunctions/relaxations
             if economics.capex_model == 1:
-                big_m_transformation_required = 0
-                b_tec.del_component(b_tec.const_capex_aux)
-                b_tec.del_component(b_tec.const_capex)
+                # Constraint references the changed parameters
+                self._update_constraints_in_persistent_solver([b_tec.const_capex_aux])
+
             elif economics.capex_model == 3:
-                big_m_transformation_required = 1
+                # Big-m relaxation needs to be redone with new bounds
+                self._remove_from_persistent_solver(
+                    [b_tec._pyomo_gdp_bigm_reformulation, b_tec.const_capex]
+                )
                 b_tec.del_component(b_tec.dis_installation)
                 b_tec.del_component(b_tec.disjunction_installation)
                 b_tec.del_component(b_tec._pyomo_gdp_bigm_reformulation)
+                b_tec.del_component(b_tec.const_capex)
 
-            # Reconstruct technology constraints
-            data_period = get_data_for_investment_period(
-                self.data, period, aggregation_data
-            )
-            data_node = get_data_for_node(data_period, node)
+                # Reconstruct technology constraints
+                data_period = get_data_for_investment_period(
+                    self.data, period, aggregation_data
+                )
+                data_node = get_data_for_node(data_period, node)
 
-            b_tec = tec_data._define_capex_constraints(b_tec, data_node)
-            if big_m_transformation_required:
+                b_tec = tec_data._define_capex_constraints(b_tec, data_node)
                 b_tec = perform_disjunct_relaxation(b_tec)
+                self._add_to_persistent_solver(
+                    [b_tec._pyomo_gdp_bigm_reformulation, b_tec.const_capex]
+                )
 
         else:
             log_msg = (
@@ -1270,37 +1946,74 @@ class ModelHub:
                 economics.capex_data["gamma4"] * annualization_factor * sd_random
             )
 
+        if netw_data.component_options.compact_formulation:
+            capex_blocks = [b_netw.arcs_compact]
+        else:
+            capex_blocks = [b_netw.arc_block[arc] for arc in b_netw.set_arcs]
+
         for arc in b_netw.set_arcs:
-            b_arc = b_netw.arc_block[arc]
+            para_size_max = netw_data.get_arc_component(b_netw, "para_size_max", *arc)
+            distance = netw_data.distance.at[arc[0], arc[1]]
+            max_capex = (
+                b_netw.para_capex_gamma1
+                + b_netw.para_capex_gamma2 * para_size_max
+                + b_netw.para_capex_gamma3 * distance
+                + b_netw.para_capex_gamma4 * para_size_max * distance
+            )
+            for var_name in ["var_capex_aux", "var_capex"]:
+                var = netw_data.get_arc_component(b_netw, var_name, *arc)
+                var.setlb(0)
+                var.setub(max_capex)
+        self._update_variables_in_persistent_solver(
+            [
+                b_capex.component(var_name)
+                for b_capex in capex_blocks
+                for var_name in ["var_capex_aux", "var_capex"]
+            ]
+        )
 
-            def calculate_max_capex():
-                max_capex = (
-                    b_netw.para_capex_gamma1
-                    + b_netw.para_capex_gamma2 * b_arc.para_size_max
-                    + b_netw.para_capex_gamma3 * b_arc.distance
-                    + b_netw.para_capex_gamma4 * b_arc.para_size_max * b_arc.distance
+        for b_capex in capex_blocks:
+            # Remove constraints (from persistent solver and from model)
+            capex_components = [
+                b_capex.component(name)
+                for name in [
+                    "_pyomo_gdp_bigm_reformulation",
+                    "const_capex",
+                    "const_capex_aux",
+                ]
+                if b_capex.component(name) is not None
+            ]
+            self._remove_from_persistent_solver(capex_components)
+            for component in capex_components + [
+                b_capex.component("dis_installation"),
+                b_capex.component("disjunction_installation"),
+            ]:
+                if component is not None:
+                    b_capex.del_component(component)
+
+            # Reconstruct constraints
+            if netw_data.component_options.compact_formulation:
+                b_capex = netw_data._define_capex_constraints_compact(b_capex, b_netw)
+            else:
+                b_capex = netw_data._define_capex_constraints_arc(
+                    b_capex, b_netw, *b_capex.index()
                 )
-                return (0, max_capex)
 
-            bounds = calculate_max_capex()
-            b_arc.var_capex_aux.setlb(bounds[0])
-            b_arc.var_capex_aux.setub(bounds[1])
-            b_arc.var_capex.setlb(bounds[0])
-            b_arc.var_capex.setub(bounds[1])
-
-            # Remove constraint (from persistent solver and from model)
-            b_arc.del_component(b_arc._pyomo_gdp_bigm_reformulation)
-            b_arc.del_component(b_arc.const_capex)
-            b_arc.del_component(b_arc.dis_installation)
-            b_arc.del_component(b_arc.disjunction_installation)
-
-            b_arc = netw_data._define_capex_constraints_arc(
-                b_arc, b_netw, arc[0], arc[1]
+            if b_capex.big_m_transformation_required:
+                b_capex = perform_disjunct_relaxation(b_capex)
+
+            self._add_to_persistent_solver(
+                [
+                    b_capex.component(name)
+                    for name in [
+                        "_pyomo_gdp_bigm_reformulation",
+                        "const_capex",
+                        "const_capex_aux",
+                    ]
+                    if b_capex.component(name) is not None
+                ]
             )
 
-            if b_arc.big_m_transformation_required:
-                b_arc = perform_disjunct_relaxation(b_arc)
-
     def _monte_carlo_import_parameters(self, on_car=None, MC_ranges=None):
         """
         Changes the import prices
@@ -1344,19 +2057,19 @@ class ModelHub:
 
     def _monte_carlo_import_constraints(self):
         """
-        Reconstructs the import cost constraint
+        Updates the import cost constraints in the persistent solver
+
+        The import cost constraints reference the (mutable) import prices, so that
+        they only need to be updated if a persistent solver is used.
         """
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
 
-        # reconstruct constraint
-        for period in model.periods:
-            b_period = model.periods[period]
-            b_period_cost = model.block_costbalance[period]
-
-            b_period_cost.del_component(b_period_cost.const_cost_import)
-            b_period_cost.const_cost_import = construct_import_costs(
-                b_period, self.data, period
-            )
+        self._update_constraints_in_persistent_solver(
+            [
+                model.block_costbalance[period].const_cost_import
+                for period in model.periods
+            ]
+        )
 
     def _monte_carlo_export_parameters(self, on_car=None, MC_ranges=None):
         """
@@ -1401,19 +2114,100 @@ class ModelHub:
 
     def _monte_carlo_export_constraints(self):
         """
-        Reconstructs the import cost constraint
+        Updates the export cost constraints in the persistent solver
+
+        The export cost constraints reference the (mutable) export prices, so that
+        they only need to be updated if a persistent solver is used.
         """
         model = self.model[self.info_solving_algorithms["aggregation_model"]]
 
-        # reconstruct constraint
-        for period in model.periods:
-            b_period = model.periods[period]
-            b_period_cost = model.block_costbalance[period]
+        self._update_constraints_in_persistent_solver(
+            [
+                model.block_costbalance[period].const_cost_export
+                for period in model.periods
+            ]
+        )
 
-            b_period_cost.del_component(b_period_cost.const_cost_export)
-            b_period_cost.const_cost_export = construct_export_costs(
-                b_period, self.data, period
-            )
+    def _persistent_solver_in_use(self) -> bool:
+        """
+        Checks if a persistent solver with a model instance is used
+
+        :return: True, if a persistent solver holds a model instance
+        :rtype: bool
+        """
+        return isinstance(self.solver, PersistentSolver) and self.solver.has_instance()
+
+    def _remove_from_persistent_solver(self, components: list):
+        """
+        Removes all active constraints and variables of components from the
+        persistent solver
+
+        Use this before deleting components from the model. Variables are only
+        removed if they are declared in (or referenced by) a block in components,
+        such as the indicator variables of a big-m reformulation.
+
+        :param list components: list of pyomo constraints and blocks
+        """
+        if not self._persistent_solver_in_use():
+            return
+
+        constraints, variables = _get_constraints_and_variables(components)
+        for con in constraints:
+            if con in self.solver._pyomo_con_to_solver_con_map:
+                self.solver.remove_constraint(con)
+        for var in variables:
+            if var in self.solver._pyomo_var_to_solver_var_map:
+                self.solver.remove_var(var)
+
+    def _add_to_persistent_solver(self, components: list):
+        """
+        Adds all active constraints and variables of components to the persistent
+        solver
+
+        :param list components: list of pyomo constraints and blocks
+        """
+        if not self._persistent_solver_in_use():
+            return
+
+        constraints, variables = _get_constraints_and_variables(components)
+        if self.scaler is not None and self.scaler.is_scaled():
+            self._set_scaling_factors()
+            self.scaler.scale(variables + constraints)
+        for var in variables:
+            if var not in self.solver._pyomo_var_to_solver_var_map:
+                self.solver.add_var(var)
+        for con in constraints:
+            self.solver.add_constraint(con)
+
+    def _update_constraints_in_persistent_solver(self, constraints: list):
+        """
+        Updates constraints in the persistent solver, e.g. after changing mutable
+        parameters they reference or their expressions
+
+        :param list constraints: list of pyomo constraints
+        """
+        if not self._persistent_solver_in_use():
+            return
+
+        constraints, _ = _get_constraints_and_variables(constraints)
+        for con in constraints:
+            self.solver.remove_constraint(con)
+            self.solver.add_constraint(con)
+
+    def _update_variables_in_persistent_solver(self, variables: list):
+        """
+        Updates bounds of variables in the persistent solver
+
+        :param list variables: list of pyomo variables
+        """
+        if not self._persistent_solver_in_use():
+            return
+
+        for var in variables:
+            if self.scaler is not None:
+                self.scaler.rescale_variables(var.values())
+            for var_data in var.values():
+                self.solver.update_var(var_data)
 
     def _delete_objective(self):
         """
@@ -1437,6 +2231,7 @@ class ModelHub:
         self.construct_model()
         self.construct_balances()
         self._impose_size_constraints(bounds_on)
+        self._define_solver_settings()
         self._optimize(self.info_solving_algorithms["objective"])
 
     def _impose_size_constraints(self, bounds_on):
@@ -1516,10 +2311,16 @@ class ModelHub:
                     log_msg = f"Size constraint imposed on {netw} in {period}"
                     log.info(log_msg)
 
+                    netw_data = self.data.network_data[period][netw]
+
                     def size_constraints_arcs_init(const, node_from, node_to):
                         return (
-                            b_netw_full.arc_block[node_from, node_to].var_size
-                            >= b_netw_avg.arc_block[node_from, node_to].var_size.value
+                            netw_data.get_arc_component(
+                                b_netw_full, "var_size", node_from, node_to
+                            )
+                            >= netw_data.get_arc_component(
+                                b_netw_avg, "var_size", node_from, node_to
+                            ).value
                         )
 
                     block.size_constraints_arcs = pyo.Constraint(
@@ -1533,3 +2334,259 @@ class ModelHub:
             m_full.size_constraints_netw = pyo.Block(
                 m_full.set_periods, rule=size_constraint_block_netw_init
             )
+
+    def _get_design(self) -> dict:
+        """
+        Returns the design of the last solve (sizes of technologies and network arcs)
+
+        :return: dict with technology design by (period, node, technology) and
+            network arc sizes by (period, network, from node, to node)
+        :rtype: dict
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+        config = self.data.model_config
+
+        design = {"technologies": {}, "networks": {}}
+        for period in model.set_periods:
+            b_period = model.periods[period]
+            for node in model.set_nodes:
+                b_node = b_period.node_blocks[node]
+                for tec in b_node.set_technologies:
+                    b_tec = b_node.tech_blocks_active[tec]
+                    design["technologies"][period, node, tec] = {
+                        name: b_tec.component("var_" + name).value
+                        for name in DESIGN_VARIABLES
+                        if b_tec.component("var_" + name) is not None
+                    }
+
+            if not config["energybalance"]["copperplate"]["value"]:
+                for netw in b_period.set_networks:
+                    b_netw = b_period.network_block[netw]
+                    netw_data = self.data.network_data[period][netw]
+                    for node_from, node_to in b_netw.set_arcs:
+                        design["networks"][period, netw, node_from, node_to] = (
+                            netw_data.get_arc_component(
+                                b_netw, "var_size", node_from, node_to
+                            ).value
+                        )
+
+        return design
+
+    def _fix_design(self, design: dict):
+        """
+        Fixes the sizes of all technologies and network arcs to a given design
+
+        :param dict design: design as returned by _get_design
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+        config = self.data.model_config
+
+        def fix(var, value, name):
+            if value is None:
+                raise Exception(f"The design of {name} is not known")
+            if var.is_integer():
+                value = round(value)
+            var.fix(value, skip_validation=True)
+
+        for period in model.set_periods:
+            b_period = model.periods[period]
+            for node in model.set_nodes:
+                b_node = b_period.node_blocks[node]
+                for tec in b_node.set_technologies:
+                    name = f"{tec} at {node} in {period}"
+                    if (period, node, tec) not in design["technologies"]:
+                        raise Exception(f"The design of {name} is not known")
+                    b_tec = b_node.tech_blocks_active[tec]
+                    for var_name, value in design["technologies"][
+                        period, node, tec
+                    ].items():
+                        # Sizes of existing technologies can be parameters
+                        var = b_tec.component("var_" + var_name)
+                        if var is not None and var.ctype is pyo.Var:
+                            fix(var, value, name)
+
+            if not config["energybalance"]["copperplate"]["value"]:
+                for netw in b_period.set_networks:
+                    b_netw = b_period.network_block[netw]
+                    netw_data = self.data.network_data[period][netw]
+                    for node_from, node_to in b_netw.set_arcs:
+                        name = f"{netw} from {node_from} to {node_to} in {period}"
+                        fix(
+                            netw_data.get_arc_component(
+                                b_netw, "var_size", node_from, node_to
+                            ),
+                            design["networks"].get((period, netw, node_from, node_to)),
+                            name,
+                        )
+
+        log_msg = "Fixed sizes of technologies and networks"
+        log.info(log_msg)
+
+    def _get_storage_levels(self, t: int) -> dict:
+        """
+        Returns the storage levels of all technologies with a storage level at a
+        timestep
+
+        :param int t: timestep
+        :return: dict with storage levels by further index (e.g. carrier) by
+            (period, node, technology)
+        :rtype: dict
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        storage_levels = {}
+        for period in model.set_periods:
+            for node in model.set_nodes:
+                b_node = model.periods[period].node_blocks[node]
+                for tec in b_node.set_technologies:
+                    var = b_node.tech_blocks_active[tec].component("var_storage_level")
+                    if var is None:
+                        continue
+                    storage_levels[period, node, tec] = {}
+                    for index, var_data in var.items():
+                        index = index if isinstance(index, tuple) else (index,)
+                        if index[0] == t:
+                            storage_levels[period, node, tec][
+                                index[1:]
+                            ] = var_data.value
+
+        return storage_levels
+
+    def _set_initial_storage_levels(self, storage_levels: dict):
+        """
+        Sets the storage levels before the first timestep
+
+        The storage level at the end of the time horizon, to which the first
+        timestep is coupled, is replaced with the given storage level. For storages
+        that are not coupled to the end of the time horizon (e.g. sinks), the given
+        storage level is added to the storage level of the first timestep.
+
+        :param dict storage_levels: storage levels as returned by
+            _get_storage_levels
+        """
+        model = self.model[self.info_solving_algorithms["aggregation_model"]]
+
+        for (period, node, tec), levels in storage_levels.items():
+            b_tec = model.periods[period].node_blocks[node].tech_blocks_active[tec]
+            t_end = max(model.periods[period].set_t_full)
+            for index, level in levels.items():
+                if level is None:
+                    continue
+                con = b_tec.const_storage_level[(1, *index) if index else 1]
+                level_end = b_tec.var_storage_level[(t_end, *index) if index else t_end]
+                expr = replace_expressions(con.expr, {id(level_end): level})
+                if expr is con.expr:
+                    expr = con.expr.args[0] == con.expr.args[1] + level
+                con.set_value(expr)
+
+    def _fix_binaries(self, variables: list):
+        """
+        Fixes integer variables to their values of the last solution
+
+        If the binary variable of a disjunct is fixed to zero, the constraints of
+        the disjunct (i.e. its big-m reformulation) are deactivated.
+
+        :param list variables: list of integer variable data objects
+        """
+        bigm = pyo.TransformationFactory("gdp.bigm")
+
+        inactive_constraints = []
+        for var in variables:
+            if var.value is None:
+                raise Exception(f"The value of {var.name} is not known")
+            var.fix(round(var.value), skip_validation=True)
+
+            disjunct = var.parent_block()
+            if (
+                var.value == 0
+                and disjunct.ctype is gdp.Disjunct
+                and var is disjunct.binary_indicator_var
+            ):
+                for con in disjunct.component_data_objects(
+                    pyo.Constraint, active=None, descend_into=True
+                ):
+                    inactive_constraints.extend(bigm.get_transformed_constraints(con))
+
+        self._remove_from_persistent_solver(inactive_constraints)
+        for con in inactive_constraints:
+            con.deactivate()
+
+    def _relax_binaries(self, variables: list):
+        """
+        Relaxes integer variables to continuous variables within their bounds
+
+        :param list variables: list of integer variable data objects
+        """
+        for var in variables:
+            lb, ub = var.lb, var.ub
+            var.domain = pyo.Reals
+            var.setlb(lb)
+            var.setub(ub)
+
+
+def _get_constraints_and_variables(components: list) -> tuple:
+    """
+    Collects all active constraints and all variables contained in components
+
+    :param list components: list of pyomo constraints (or constraint data objects)
+        and blocks
+    :return: list of constraint data objects, list of variable data objects
+    :rtype: tuple
+    """
+    constraints = ComponentSet()
+    variables = ComponentSet()
+    for component in components:
+        if component.ctype is pyo.Constraint and component.is_indexed():
+            constraints.update(con for con in component.values() if con.active)
+        elif component.ctype is pyo.Constraint:
+            if component.active:
+                constraints.add(component)
+        else:
+            constraints.update(
+                component.component_data_objects(
+                    pyo.Constraint, active=True, descend_into=True
+                )
+            )
+            variables.update(
+                component.component_data_objects(pyo.Var, descend_into=True)
+            )
+    return list(constraints), list(variables)
+
+
+def _solve_sweep_points(
+    data: DataHandle,
+    info_solving_algorithms: dict,
+    sweep_type: str,
+    points: list,
+    objective: str,
+) -> list:
+    """
+    Constructs the model from a data handle and solves a chunk of sweep points
+
+    Used as worker function in parallel sweeps.
+
+    :param DataHandle data: data handle to construct the model from
+    :param dict info_solving_algorithms: information on time aggregation algorithms
+    :param str sweep_type: "pareto" or "monte_carlo"
+    :param list points: list of points to solve
+    :param str objective: objective to optimize (only for monte carlo)
+    :return: summaries of all solved points
+    :rtype: list
+    """
+    pyhub = ModelHub()
+    pyhub.data = data
+    pyhub.info_solving_algorithms = info_solving_algorithms
+    pyhub.info_sweep["collect_summaries"] = True
+
+    pyhub.construct_model()
+    pyhub.construct_balances()
+    pyhub._define_solver_settings()
+
+    if sweep_type == "pareto":
+        pyhub._solve_pareto_points(points)
+    elif sweep_type == "monte_carlo":
+        pyhub._solve_monte_carlo_runs(points, objective)
+    else:
+        raise ValueError(f"sweep_type {sweep_type} is not valid")
+
+    return pyhub.info_sweep["summaries"]
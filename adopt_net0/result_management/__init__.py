@@ -3,5 +3,24 @@ from .read_results import (
     print_h5_tree,
     extract_dataset_from_h5,
     extract_datasets_from_h5group,
+    H5ResultReader,
+)
+from .rolling_horizon import (
+    read_design_from_h5,
+    exclude_lookahead,
+    merge_window_results,
+)
+from .summary import (
+    get_summary_path,
+    append_to_summary,
+    read_summary,
+    write_summary,
+    export_summary_to_excel,
+)
+from .utilities import (
+    create_save_folder,
+    create_unique_folder_name,
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
 )
-from .utilities import create_save_folder, create_unique_folder_name
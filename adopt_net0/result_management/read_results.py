@@ -1,8 +1,13 @@
+import functools
+import os
+from fnmatch import fnmatchcase
 import h5py
 import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from .summary import read_summary, write_summary
+
 
 def print_h5_tree(file_path: Path | str):
     """
@@ -67,12 +72,192 @@ def extract_dataset_from_h5(dataset) -> list:
     return data
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_dataset_index(file_path: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Returns the paths of all datasets in a h5 file
+
+    The index is cached per file. Modification time and size of the file are part
+    of the cache key, so that the index is renewed if the file changes.
+
+    :param str file_path: path to h5 file
+    :param int mtime_ns: modification time of the file
+    :param int size: size of the file
+    :return: paths of all datasets in the file
+    :rtype: tuple
+    """
+    paths = []
+
+    def add_dataset(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            paths.append(name)
+
+    with h5py.File(file_path, "r") as hdf_file:
+        hdf_file.visititems(add_dataset)
+
+    return tuple(paths)
+
+
+def _match_path(path: str, pattern: str) -> bool:
+    """
+    Checks if a dataset path matches a pattern
+
+    Path and pattern are compared level by level, so that a wildcard does not
+    match across levels (e.g. "design/nodes/*/*/*/size").
+
+    :param str path: dataset path
+    :param str pattern: pattern with unix shell-style wildcards per level
+    :return: True if the path matches the pattern
+    :rtype: bool
+    """
+    path_levels = path.split("/")
+    pattern_levels = pattern.split("/")
+    if len(path_levels) != len(pattern_levels):
+        return False
+    return all(
+        fnmatchcase(level, level_pattern)
+        for level, level_pattern in zip(path_levels, pattern_levels)
+    )
+
+
+class H5ResultReader:
+    """
+    Class to lazily read results from a h5 file
+
+    Datasets are only read from disk when requested. Datasets can be selected with
+    path patterns with unix shell-style wildcards per level of the h5 tree, e.g.
+    "operation/energy_balance/period1/*/electricity/import" selects the import of
+    electricity at all nodes. The index of dataset paths is cached per file.
+
+    Use as a context manager:
+
+    .. code-block:: python
+
+        with H5ResultReader("pathtoh5file/optimization_results.h5") as reader:
+            imports = reader.aggregate(
+                "operation/energy_balance/*/*/*/import", np.sum
+            )
+    """
+
+    def __init__(self, file_path: Path | str):
+        """
+        Constructor
+
+        :param Path, str file_path: path to h5 file
+        """
+        self.file_path = Path(file_path)
+        self.file = None
+
+    def __enter__(self):
+        self.file = h5py.File(self.file_path, "r")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the h5 file
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _get_file(self) -> h5py.File:
+        """
+        Returns the opened h5 file, the file is opened if required
+        """
+        if self.file is None:
+            self.file = h5py.File(self.file_path, "r")
+        return self.file
+
+    def get_paths(self, pattern: str = None) -> list:
+        """
+        Returns the paths of all datasets matching a pattern
+
+        :param str pattern: pattern to select datasets, all datasets if None
+        :return: paths of datasets
+        :rtype: list
+        """
+        stat = os.stat(self.file_path)
+        paths = _get_dataset_index(
+            str(self.file_path.resolve()), stat.st_mtime_ns, stat.st_size
+        )
+        if pattern is None:
+            return list(paths)
+        return [path for path in paths if _match_path(path, pattern)]
+
+    def read(self, path: str) -> np.ndarray:
+        """
+        Reads a single dataset
+
+        :param str path: path of the dataset
+        :return: values of the dataset
+        :rtype: np.ndarray
+        """
+        return self._get_file()[path][()]
+
+    def read_first(self, path: str):
+        """
+        Reads the first value of a dataset (e.g. for design variables)
+
+        :param str path: path of the dataset
+        :return: first value of the dataset
+        """
+        dataset = self._get_file()[path]
+        if dataset.shape == ():
+            return dataset[()]
+        else:
+            return dataset[0]
+
+    def iter_datasets(self, pattern: str):
+        """
+        Iterates over all datasets matching a pattern, one dataset at a time
+
+        :param str pattern: pattern to select datasets
+        :return: generator of tuples (path, values)
+        """
+        for path in self.get_paths(pattern):
+            yield path, self.read(path)
+
+    def aggregate(self, pattern: str, function) -> dict:
+        """
+        Aggregates all datasets matching a pattern
+
+        Datasets are read one at a time, so that only one dataset is in memory.
+
+        :param str pattern: pattern to select datasets
+        :param function: function to aggregate the values of a dataset (e.g. np.sum)
+        :return: dict with dataset paths as keys and aggregates as values
+        :rtype: dict
+        """
+        return {path: function(values) for path, values in self.iter_datasets(pattern)}
+
+    def to_dataframe(self, pattern: str) -> pd.DataFrame:
+        """
+        Reads all datasets matching a pattern to a multi-index dataframe
+
+        The column index contains the levels of the dataset paths.
+
+        :param str pattern: pattern to select datasets
+        :return: dataframe containing all selected datasets
+        :rtype: pd.DataFrame
+        """
+        data = {}
+        for path, values in self.iter_datasets(pattern):
+            data[tuple(path.split("/"))] = [values] if np.ndim(values) == 0 else values
+        return pd.DataFrame(data)
+
+
 def add_values_to_summary(summary_path: Path, component_set: list = None):
     """
-    Collect values of input cost parameters and relevant variables from HDF5 files and add them to the summary Excel file.
+    Collect values of input cost parameters and relevant variables from HDF5 files and add them to the summary file.
+
+    Datasets are read lazily with :class:`H5ResultReader`, so only one dataset is
+    held in memory at a time.
 
     Args:
-        summary_path (Path or str): Path to the summary Excel file.
+        summary_path (Path or str): Path to the summary file (.xlsx or .sqlite).
         component_set (list, optional): List of components to extract parameters and variables from.
             Defaults to ["Technologies", "Networks", "Import", "Export"].
     """
@@ -80,142 +265,52 @@ def add_values_to_summary(summary_path: Path, component_set: list = None):
     if component_set is None:
         component_set = ["Technologies", "Networks", "Import", "Export"]
 
-    summary_results = pd.read_excel(summary_path)
-
-    # paths to results
-    paths = {}
-    for timestamp in summary_results["time_stamp"].unique():
-        paths[timestamp] = list(
-            summary_results.loc[
-                summary_results["time_stamp"] == timestamp, "time_stamp"
-            ].values
-        )
+    summary_results = read_summary(summary_path)
 
     # dicts to store data
     output_dict = {}
 
     # Extract data from h5 files
-
-    for case in paths:
-        path = Path(case)
-        hdf_file_path = path / "optimization_results.h5"
+    for case in summary_results["time_stamp"].unique():
+        hdf_file_path = Path(case) / "optimization_results.h5"
         output_dict[case] = {}
         if hdf_file_path.exists():
-            with h5py.File(hdf_file_path, "r") as hdf_file:
+            with H5ResultReader(hdf_file_path) as reader:
 
                 if "Technologies" in component_set:
-                    df = extract_datasets_from_h5group(hdf_file["design/nodes"])
-                    for period in df.columns.levels[0]:
-                        for node in df.columns.levels[1]:
-                            for tec in df.columns.levels[2]:
-                                parameters = [
-                                    "size",
-                                    "capex_tot",
-                                    "para_unitCAPEX",
-                                    "para_fixCAPEX",
-                                ]
-                                for para in parameters:
-                                    if (period, node, tec, para) in df.columns:
-                                        tec_output = df[period, node, tec, para].iloc[0]
-                                        output_name = f"{period}/{node}/{tec}/{para}"
-                                        if output_name not in output_dict[case]:
-                                            output_dict[case][output_name] = tec_output
+                    output_dict[case].update(
+                        _read_design_values(
+                            reader,
+                            "design/nodes",
+                            ["size", "capex_tot", "para_unitCAPEX", "para_fixCAPEX"],
+                        )
+                    )
 
                 if "Networks" in component_set:
-                    df = extract_datasets_from_h5group(hdf_file["design/networks"])
-                    if not df.empty:
-                        for period in df.columns.levels[0]:
-                            for netw in df.columns.levels[1]:
-                                for arc in df.columns.levels[2]:
-                                    parameters = [
-                                        "para_capex_gamma1",
-                                        "para_capex_gamma2",
-                                        "para_capex_gamma3",
-                                        "para_capex_gamma4",
-                                        "size",
-                                        "capex",
-                                    ]
-                                    for para in parameters:
-                                        output_name = f"{period}/{netw}/{arc}/{para}"
-                                        arc_output = df[period, netw, arc, para].iloc[0]
-                                        if output_name not in output_dict[case]:
-                                            output_dict[case][output_name] = arc_output
+                    output_dict[case].update(
+                        _read_design_values(
+                            reader,
+                            "design/networks",
+                            [
+                                "para_capex_gamma1",
+                                "para_capex_gamma2",
+                                "para_capex_gamma3",
+                                "para_capex_gamma4",
+                                "size",
+                                "capex",
+                            ],
+                        )
+                    )
 
                 if "Import" in component_set:
-                    df = extract_datasets_from_h5group(
-                        hdf_file["operation/energy_balance"]
+                    output_dict[case].update(
+                        _aggregate_energy_balance(reader, "import")
                     )
-                    for period in df.columns.levels[0]:
-                        for node in df[period].columns.levels[0]:
-                            cars_at_node = (
-                                df[period, node].columns.droplevel([1]).unique()
-                            )
-                            for car in cars_at_node:
-                                parameters = ["import", "import_price"]
-                                for para in parameters:
-                                    car_output = df[period, node, car, para]
-                                    if para == "import":
-                                        car_output = sum(car_output)
-                                        output_name = (
-                                            f"{period}/{node}/{car}/{para}_tot"
-                                        )
-                                        if output_name not in output_dict[case]:
-                                            output_dict[case][output_name] = car_output
-                                    elif para == "import_price":
-                                        car_output_mean = np.mean(car_output)
-                                        car_output_std = np.std(car_output)
-                                        output_name_mean = (
-                                            f"{period}/{node}/{car}/{para}_mean"
-                                        )
-                                        output_name_std = (
-                                            f"{period}/{node}/{car}/{para}_std"
-                                        )
-                                        if output_name_mean not in output_dict[case]:
-                                            output_dict[case][
-                                                output_name_mean
-                                            ] = car_output_mean
-                                        if output_name_std not in output_dict[case]:
-                                            output_dict[case][
-                                                output_name_std
-                                            ] = car_output_std
 
                 if "Export" in component_set:
-                    df = extract_datasets_from_h5group(
-                        hdf_file["operation/energy_balance"]
+                    output_dict[case].update(
+                        _aggregate_energy_balance(reader, "export")
                     )
-                    for period in df.columns.levels[0]:
-                        for node in df[period].columns.levels[0]:
-                            cars_at_node = (
-                                df[period, node].columns.droplevel([1]).unique()
-                            )
-                            for car in cars_at_node:
-                                parameters = ["export", "export_price"]
-                                for para in parameters:
-                                    car_output = df[period, node, car, para]
-                                    if para == "export":
-                                        car_output = sum(car_output)
-                                        output_name = (
-                                            f"{period}/{node}/{car}/{para}_tot"
-                                        )
-                                        if output_name not in output_dict[case]:
-                                            output_dict[case][output_name] = car_output
-                                    elif para == "export_price":
-                                        car_output_mean = np.mean(car_output)
-                                        car_output_std = np.std(car_output)
-                                        output_name_mean = (
-                                            f"{period}/{node}/{car}/{para}_mean"
-                                        )
-                                        output_name_std = (
-                                            f"{period}/{node}/{car}/{para}_std"
-                                        )
-                                        if output_name_mean not in output_dict[case]:
-                                            output_dict[case][
-                                                output_name_mean
-                                            ] = car_output_mean
-                                        if output_name_std not in output_dict[case]:
-                                            output_dict[case][
-                                                output_name_std
-                                            ] = car_output_std
 
     # Add new columns to summary_results
     output_df = pd.DataFrame(output_dict).T
@@ -230,5 +325,52 @@ def add_values_to_summary(summary_path: Path, component_set: list = None):
         columns={"index": "folder_name"}
     )
 
-    # Save the updated summary_results to the Excel file
-    summary_results.to_excel(summary_path, index=False)
+    # Save the updated summary_results to the summary file
+    write_summary(summary_path, summary_results)
+
+
+def _read_design_values(reader: H5ResultReader, group: str, parameters: list) -> dict:
+    """
+    Reads design values of all components (technologies or network arcs) of a group
+
+    :param H5ResultReader reader: reader of h5 file
+    :param str group: group containing the design of the components (e.g.
+        design/nodes)
+    :param list parameters: parameters to read for each component
+    :return: dict with output names (period/node/component/parameter) as keys and
+        values as values
+    :rtype: dict
+    """
+    paths = reader.get_paths(f"{group}/*/*/*/*")
+    components = dict.fromkeys(path.rsplit("/", 1)[0] for path in paths)
+    paths = set(paths)
+
+    output = {}
+    for component in components:
+        for para in parameters:
+            path = f"{component}/{para}"
+            if path in paths:
+                output[path.removeprefix(f"{group}/")] = reader.read_first(path)
+    return output
+
+
+def _aggregate_energy_balance(reader: H5ResultReader, flow: str) -> dict:
+    """
+    Aggregates imports or exports and their prices for all periods, nodes and carriers
+
+    Computes the total flow as well as mean and standard deviation of the price.
+
+    :param H5ResultReader reader: reader of h5 file
+    :param str flow: import or export
+    :return: dict with output names (period/node/carrier/key) as keys and
+        aggregates as values
+    :rtype: dict
+    """
+    output = {}
+    for path in reader.get_paths(f"operation/energy_balance/*/*/*/{flow}"):
+        output_name = path.removeprefix("operation/energy_balance/")
+        output[f"{output_name}_tot"] = np.sum(reader.read(path))
+        price = reader.read(f"{path}_price")
+        output[f"{output_name}_price_mean"] = np.mean(price)
+        output[f"{output_name}_price_std"] = np.std(price)
+    return output
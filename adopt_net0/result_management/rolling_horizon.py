@@ -0,0 +1,326 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.core.expr import identify_variables
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+from .read_results import H5ResultReader
+from .utilities import create_time_series_dataset
+
+import logging
+
+log = logging.getLogger(__name__)
+
+# Design results that are design decisions (as var_<name> in technology blocks)
+DESIGN_VARIABLES = [
+    "size",
+    "size_ccs",
+    "capacity_charge",
+    "capacity_discharge",
+    "injection_capacity",
+]
+# Design results that describe a component and are not summed over windows (all
+# other design results are costs, emissions and flows)
+DESIGN_DESCRIPTIONS = [
+    "technology",
+    "existing",
+    "rated_power",
+    "network",
+    "fromNode",
+    "toNode",
+]
+# Cost parameters that are annualized for the fraction of the year modelled and
+# are thus summed over windows (other cost parameters are not summed)
+ANNUALIZED_PARAMETERS = [
+    "para_capex_gamma1",
+    "para_capex_gamma2",
+    "para_capex_gamma3",
+    "para_capex_gamma4",
+]
+# Summary entries that are summed over windows
+SUMMARY_SUMS = [
+    "total_npv",
+    "cost_capex_tecs",
+    "cost_capex_netws",
+    "cost_opex_tecs",
+    "cost_opex_netws",
+    "cost_tecs",
+    "cost_netws",
+    "cost_imports",
+    "cost_exports",
+    "violation_cost",
+    "carbon_revenue",
+    "carbon_cost",
+    "total_cost",
+    "emissions_pos",
+    "emissions_neg",
+    "emissions_net",
+    "time_total",
+    "lb",
+    "ub",
+    "absolute gap",
+]
+
+
+def read_design_from_h5(file_path: Path | str) -> dict:
+    """
+    Reads the design (sizes of technologies and network arcs) from a h5 result file
+
+    :param Path, str file_path: path to h5 file
+    :return: dict with technology design by (period, node, technology) and network
+        arc sizes by (period, network, from node, to node)
+    :rtype: dict
+    """
+    design = {"technologies": {}, "networks": {}}
+    with H5ResultReader(file_path) as reader:
+        for name in DESIGN_VARIABLES:
+            for path in reader.get_paths(f"design/nodes/*/*/*/{name}"):
+                period, node, tec = path.split("/")[2:5]
+                design["technologies"].setdefault((period, node, tec), {})[name] = (
+                    float(reader.read_first(path))
+                )
+
+        for path in reader.get_paths("design/networks/*/*/*/size"):
+            period, netw = path.split("/")[2:4]
+            arc_group = path.rsplit("/", 1)[0]
+            node_from, node_to = (
+                _to_str(reader.read_first(f"{arc_group}/{node}"))
+                for node in ["fromNode", "toNode"]
+            )
+            design["networks"][(period, netw, node_from, node_to)] = float(
+                reader.read_first(path)
+            )
+
+    return design
+
+
+@contextmanager
+def exclude_lookahead(model, nr_timesteps: int):
+    """
+    Excludes the look-ahead of a rolling horizon window from the solution of its model
+
+    Within the context, the values of all variables indexed by timesteps after
+    nr_timesteps are set to zero and the variables of the emission and cost balances
+    are recalculated. Results written within the context (e.g. the summary or sums
+    over time in the design results) thus only contain the committed timesteps of
+    the window. The solution is restored when leaving the context.
+
+    :param model: solved pyomo model of a window
+    :param int nr_timesteps: number of committed timesteps of the window
+    """
+    values = ComponentMap()
+
+    for b_period in model.periods.values():
+        for var in b_period.component_objects(pyo.Var, descend_into=True):
+            position = _get_time_position(var, b_period.set_t_full)
+            if position is None:
+                continue
+            for index, var_data in var.items():
+                t = index[position] if isinstance(index, tuple) else index
+                if t > nr_timesteps and var_data.value is not None:
+                    values[var_data] = var_data.value
+                    var_data.set_value(0, skip_validation=True)
+
+    # Balances are recalculated in the order of their construction, each balance
+    # defines the one (not indexed) balance variable not calculated before
+    balance_blocks = ComponentSet([model, *model.periods.values()])
+    calculated = ComponentSet()
+    for con in _get_balance_constraints(model):
+        to_calculate = [
+            var
+            for var in identify_variables(con.body, include_fixed=False)
+            if var.parent_block() in balance_blocks
+            and not var.parent_component().is_indexed()
+            and var not in calculated
+        ]
+        if len(to_calculate) != 1:
+            continue
+        var = to_calculate[0]
+        values[var] = var.value
+        calculate_variable_from_constraint(var, con)
+        calculated.add(var)
+
+    try:
+        yield
+    finally:
+        for var_data, value in values.items():
+            var_data.set_value(value, skip_validation=True)
+
+
+def merge_window_results(
+    window_folders: list, nr_timesteps: list, summaries: list, folder_path: Path
+) -> dict:
+    """
+    Merges the h5 results of the windows of a rolling horizon dispatch into a single
+    h5 file
+
+    The results of the windows need to exclude their look-ahead (see
+    exclude_lookahead). The merged file has the same structure as the results of a
+    single model:
+
+    - operation: time series of the committed timesteps of all windows are
+      concatenated
+    - design: design decisions and descriptions are taken from the first window,
+      costs, emissions, flows and annualized cost parameters are summed over all
+      windows
+    - summary: costs, emissions, bounds and solving times are summed over all
+      windows (the bounds are those of the window models and thus include the
+      look-ahead), the solver status is the first status that is not optimal
+
+    :param list window_folders: result folders of the windows
+    :param list nr_timesteps: number of committed timesteps of each window
+    :param list summaries: summaries of the windows
+    :param Path folder_path: folder to write the merged results to
+    :return: merged summary
+    :rtype: dict
+    """
+    summary_dict = _merge_summaries(summaries)
+    summary_dict["time_stamp"] = str(folder_path)
+
+    window_files = [
+        h5py.File(Path(folder) / "optimization_results.h5", "r")
+        for folder in window_folders
+    ]
+    try:
+        with h5py.File(Path(folder_path) / "optimization_results.h5", "w") as f:
+            f.attrs["compression"] = window_files[0].attrs["compression"]
+
+            summary = f.create_group("summary")
+            for key in summary_dict:
+                if summary_dict[key] is None:
+                    value = -1
+                else:
+                    value = summary_dict[key]
+                summary.create_dataset(key, data=value)
+
+            def merge(path, obj):
+                if path.split("/")[0] == "summary":
+                    return
+                if isinstance(obj, h5py.Group):
+                    f.require_group(path)
+                    return
+
+                group = f.require_group(obj.parent.name)
+                name = path.rsplit("/", 1)[-1]
+                if path.startswith("operation/") and obj.ndim > 0:
+                    values = np.concatenate(
+                        [
+                            window_file[path][:nr]
+                            for window_file, nr in zip(window_files, nr_timesteps)
+                        ]
+                    )
+                    create_time_series_dataset(group, name, values)
+                elif path.startswith("design/") and _is_summed_over_windows(name, obj):
+                    group.create_dataset(
+                        name,
+                        data=sum(window_file[path][()] for window_file in window_files),
+                    )
+                else:
+                    group.create_dataset(name, data=obj[()])
+
+            window_files[0].visititems(merge)
+    finally:
+        for window_file in window_files:
+            window_file.close()
+
+    return summary_dict
+
+
+def _merge_summaries(summaries: list) -> dict:
+    """
+    Merges the summaries of the windows of a rolling horizon dispatch
+
+    :param list summaries: summaries of the windows
+    :return: merged summary
+    :rtype: dict
+    """
+    summary_dict = dict(summaries[0])
+    for key in SUMMARY_SUMS:
+        values = [summary[key] for summary in summaries]
+        if any(value is None for value in values):
+            summary_dict[key] = None
+        else:
+            summary_dict[key] = sum(values)
+
+    statuses = [summary["solver_status"] for summary in summaries]
+    summary_dict["solver_status"] = next(
+        (status for status in statuses if status != "optimal"), statuses[0]
+    )
+    return summary_dict
+
+
+def _is_summed_over_windows(name: str, dataset: h5py.Dataset) -> bool:
+    """
+    Checks if a design dataset is summed over the windows of a rolling horizon
+    dispatch (e.g. costs, emissions, flows and annualized cost parameters)
+
+    :param str name: name of the dataset
+    :param h5py.Dataset dataset: dataset of the first window
+    :return: True, if the dataset is summed
+    :rtype: bool
+    """
+    return (
+        dataset.dtype.kind in "fiu"
+        and name not in DESIGN_VARIABLES
+        and name not in DESIGN_DESCRIPTIONS
+        and (not name.startswith("para_") or name in ANNUALIZED_PARAMETERS)
+    )
+
+
+def _get_time_position(var, set_t) -> int | None:
+    """
+    Returns the position of the timestep in the indices of a variable
+
+    :param var: pyomo variable
+    :param set_t: set of timesteps
+    :return: position of the timestep or None, if the variable is not indexed by
+        timesteps
+    :rtype: int | None
+    """
+    if not var.is_indexed() or var.is_reference():
+        return None
+
+    position = 0
+    for subset in var.index_set().subsets():
+        if subset is set_t:
+            return position
+        if subset.dimen is None:
+            return None
+        position += subset.dimen
+    return None
+
+
+def _get_balance_constraints(model) -> list:
+    """
+    Returns the constraints of the emission, cost and global balances in the order
+    of their construction
+
+    :param model: pyomo model
+    :return: list of constraint data objects
+    :rtype: list
+    """
+    constraints = []
+    for block_name in ["block_emissionbalance", "block_costbalance"]:
+        for block in model.component(block_name).values():
+            constraints.extend(
+                block.component_data_objects(pyo.Constraint, active=True)
+            )
+    constraints.extend([model.const_npv, model.const_emissions])
+    return constraints
+
+
+def _to_str(value) -> str:
+    """
+    Converts a string read from a h5 file to str
+
+    :param value: bytes or str
+    :return: string
+    :rtype: str
+    """
+    if isinstance(value, bytes):
+        return value.decode()
+    return str(value)
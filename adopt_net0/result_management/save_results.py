@@ -2,8 +2,14 @@ import h5py
 from pathlib import Path
 import os
 
+import numpy as np
 from pyomo.environ import ConcreteModel
 from ..utilities import get_set_t
+from .utilities import (
+    create_time_series_dataset,
+    get_values,
+    get_values_by_carrier,
+)
 
 import logging
 
@@ -121,19 +127,6 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
     :rtype: dict
     """
 
-    def read_value_from_parameter(para) -> list:
-        """
-        Reads parameter values from a pyomo parameter
-
-        :param para: pyomo parameter
-        :return: values as a list
-        :rtype: list
-        """
-        if para.mutable:
-            return [para[t, car].value for t in set_t]
-        else:
-            return [para[t, car] for t in set_t]
-
     config = model_info["config"]
     folder_path = model_info["result_folder_path"]
 
@@ -144,6 +137,7 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
     # create the results h5 file in the results folder
     h5_file_path = os.path.join(folder_path, "optimization_results.h5")
     with h5py.File(h5_file_path, mode="w") as f:
+        f.attrs["compression"] = config["reporting"]["compression"]["value"]
 
         summary_dict = get_summary(model, solution, folder_path, model_info)
 
@@ -196,6 +190,7 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
         nodes_design = g_design.create_group("nodes")
         for period in model.set_periods:
             g_period_node_design = nodes_design.create_group(period)
+            b_period = model.periods[period]
 
             # TIME-INDEPENDENT RESULTS: NODES: specific node [g] within: specific technology [g]
             for node_name in model.set_nodes:
@@ -217,6 +212,7 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
 
         for period in model.set_periods:
             g_period_netw_operation = networks_operation.create_group(period)
+            b_period = model.periods[period]
 
             if not config["energybalance"]["copperplate"]["value"]:
                 for netw_name in b_period.set_networks:
@@ -232,6 +228,7 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
         tec_operation_group = operation.create_group("technology_operation")
         for period in model.set_periods:
             g_period_tec_operation = tec_operation_group.create_group(period)
+            b_period = model.periods[period]
 
             for node_name in model.set_nodes:
                 node_specific_group = g_period_tec_operation.create_group(node_name)
@@ -249,90 +246,83 @@ def write_optimization_results_to_h5(model, solution, model_info: dict, data) ->
 
         for period in model.set_periods:
             g_period_ebalance = ebalance_group.create_group(period)
+            b_period = model.periods[period]
+            set_t = get_set_t(config, b_period)
 
             for node_name in model.set_nodes:
                 node_specific_group = g_period_ebalance.create_group(node_name)
                 b_node = b_period.node_blocks[node_name]
-
-                for car in b_node.set_carriers:
-                    car_group = node_specific_group.create_group(car)
-                    node_data = b_node
-
-                    technology_inputs = [
-                        sum(
-                            node_data.tech_blocks_active[tec].var_input[t, car].value
-                            for tec in node_data.set_technologies
-                            if car
-                            in node_data.tech_blocks_active[tec].set_input_carriers
+                carriers = list(b_node.set_carriers)
+
+                # Sum of technology inputs and outputs per carrier
+                technology_inputs = {car: np.zeros(len(set_t)) for car in carriers}
+                technology_outputs = {car: np.zeros(len(set_t)) for car in carriers}
+                for tec in b_node.set_technologies:
+                    b_tec = b_node.tech_blocks_active[tec]
+                    if len(b_tec.set_input_carriers) > 0:
+                        tec_inputs = get_values_by_carrier(
+                            b_tec.var_input, set_t, b_tec.set_input_carriers
                         )
-                        for t in set_t
-                    ]
-                    car_group.create_dataset(
-                        "technology_inputs", data=technology_inputs
-                    )
-                    technology_outputs = [
-                        sum(
-                            node_data.tech_blocks_active[tec].var_output[t, car].value
-                            for tec in node_data.set_technologies
-                            if car
-                            in node_data.tech_blocks_active[tec].set_output_carriers
+                        for car in tec_inputs:
+                            technology_inputs[car] += tec_inputs[car]
+                    if len(b_tec.set_output_carriers) > 0:
+                        tec_outputs = get_values_by_carrier(
+                            b_tec.var_output, set_t, b_tec.set_output_carriers
                         )
-                        for t in set_t
-                    ]
-                    car_group.create_dataset(
-                        "technology_outputs", data=technology_outputs
-                    )
-                    car_group.create_dataset(
-                        "generic_production",
-                        data=[
-                            node_data.var_generic_production[t, car].value
-                            for t in set_t
-                        ],
-                    )
-                    car_group.create_dataset(
-                        "network_inflow",
-                        data=[
-                            0 if x is None else x
-                            for x in [
-                                node_data.var_netw_inflow[t, car].value for t in set_t
-                            ]
-                        ],
-                    )
-                    car_group.create_dataset(
-                        "network_outflow",
-                        data=[
-                            0 if x is None else x
-                            for x in [
-                                node_data.var_netw_outflow[t, car].value for t in set_t
-                            ]
-                        ],
-                    )
-                    if hasattr(node_data, "var_netw_consumption"):
-                        network_consumption = [
-                            node_data.var_netw_consumption[t, car].value for t in set_t
-                        ]
-                        car_group.create_dataset(
-                            "network_consumption", data=network_consumption
+                        for car in tec_outputs:
+                            technology_outputs[car] += tec_outputs[car]
+
+                time_series = {
+                    "technology_inputs": technology_inputs,
+                    "technology_outputs": technology_outputs,
+                    "generic_production": get_values_by_carrier(
+                        b_node.var_generic_production, set_t, carriers
+                    ),
+                    "network_inflow": (
+                        get_values_by_carrier(b_node.var_netw_inflow, set_t, carriers)
+                        if hasattr(b_node, "var_netw_inflow")
+                        else None
+                    ),
+                    "network_outflow": (
+                        get_values_by_carrier(b_node.var_netw_outflow, set_t, carriers)
+                        if hasattr(b_node, "var_netw_outflow")
+                        else None
+                    ),
+                    "network_consumption": (
+                        get_values_by_carrier(
+                            b_node.var_netw_consumption, set_t, carriers
                         )
-                    car_group.create_dataset(
-                        "import",
-                        data=[node_data.var_import_flow[t, car].value for t in set_t],
-                    )
-
-                    car_group.create_dataset(
-                        "import_price",
-                        data=read_value_from_parameter(node_data.para_import_price),
-                    )
-                    car_group.create_dataset(
-                        "export",
-                        data=[node_data.var_export_flow[t, car].value for t in set_t],
-                    )
-                    car_group.create_dataset(
-                        "export_price",
-                        data=read_value_from_parameter(node_data.para_export_price),
-                    )
-                    car_group.create_dataset(
-                        "demand", data=[node_data.para_demand[t, car] for t in set_t]
-                    )
+                        if hasattr(b_node, "var_netw_consumption")
+                        else None
+                    ),
+                    "import": get_values_by_carrier(
+                        b_node.var_import_flow, set_t, carriers
+                    ),
+                    "import_price": get_values_by_carrier(
+                        b_node.para_import_price, set_t, carriers
+                    ),
+                    "export": get_values_by_carrier(
+                        b_node.var_export_flow, set_t, carriers
+                    ),
+                    "export_price": get_values_by_carrier(
+                        b_node.para_export_price, set_t, carriers
+                    ),
+                    "demand": get_values_by_carrier(
+                        b_node.para_demand, set_t, carriers
+                    ),
+                }
+                # Network flows are not defined, if there is no network (and not
+                # constructed at all for copperplate models)
+                for key in ["network_inflow", "network_outflow"]:
+                    if time_series[key] is None:
+                        continue
+                    for car in carriers:
+                        time_series[key][car] = np.nan_to_num(time_series[key][car])
+
+                for car in carriers:
+                    car_group = node_specific_group.create_group(car)
+                    for key, values in time_series.items():
+                        if values is not None:
+                            create_time_series_dataset(car_group, key, values[car])
 
     return summary_dict
@@ -0,0 +1,196 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+import logging
+
+log = logging.getLogger(__name__)
+
+SUMMARY_FILE_NAMES = {"xlsx": "Summary.xlsx", "sqlite": "Summary.sqlite"}
+SUMMARY_TABLE = "summary"
+
+
+def get_summary_path(config: dict) -> Path:
+    """
+    Returns the path of the summary file as specified in the model configuration
+
+    :param dict config: model configuration
+    :return: path to summary file
+    :rtype: Path
+    """
+    summary_format = config["reporting"]["summary_format"]["value"]
+    if summary_format not in SUMMARY_FILE_NAMES:
+        raise ValueError(
+            f"summary_format {summary_format} is not valid, use one of "
+            f"{list(SUMMARY_FILE_NAMES.keys())}"
+        )
+
+    return Path(config["reporting"]["save_summary_path"]["value"]) / (
+        SUMMARY_FILE_NAMES[summary_format]
+    )
+
+
+def append_to_summary(summary_path: Path, summary_dicts: list):
+    """
+    Appends the summaries of one or more runs to the summary file
+
+    For excel files, the complete file is read and rewritten. For sqlite files,
+    the rows are inserted into the summary table (columns that do not exist yet
+    are added). Sqlite files can safely be written by several processes at the
+    same time.
+
+    :param Path summary_path: path to summary file (.xlsx or .sqlite)
+    :param list summary_dicts: list of summaries (one dict per run)
+    """
+    summary_path = Path(summary_path)
+
+    if summary_path.suffix == ".sqlite":
+        _append_to_sqlite(summary_path, summary_dicts)
+    else:
+        summary_df = pd.DataFrame(data=summary_dicts)
+        if summary_path.exists():
+            summary_existing = pd.read_excel(summary_path)
+            summary_df = pd.concat([summary_existing, summary_df])
+        summary_df.to_excel(summary_path, index=False, sheet_name="Summary")
+
+
+def read_summary(summary_path: Path) -> pd.DataFrame:
+    """
+    Reads the summary file
+
+    :param Path summary_path: path to summary file (.xlsx or .sqlite)
+    :return: summary with one row per run
+    :rtype: pd.DataFrame
+    """
+    summary_path = Path(summary_path)
+
+    if summary_path.suffix == ".sqlite":
+        with closing(_connect(summary_path)) as con:
+            return pd.read_sql_query(f"SELECT * FROM {_quote(SUMMARY_TABLE)}", con)
+    else:
+        return pd.read_excel(summary_path)
+
+
+def write_summary(summary_path: Path, summary: pd.DataFrame):
+    """
+    Writes the summary file, existing rows are replaced
+
+    :param Path summary_path: path to summary file (.xlsx or .sqlite)
+    :param pd.DataFrame summary: summary with one row per run
+    """
+    summary_path = Path(summary_path)
+
+    if summary_path.suffix == ".sqlite":
+        with closing(_connect(summary_path)) as con:
+            with con:
+                summary.to_sql(SUMMARY_TABLE, con, if_exists="replace", index=False)
+    else:
+        summary.to_excel(summary_path, index=False, sheet_name="Summary")
+
+
+def export_summary_to_excel(summary_path: Path | str, excel_path: Path | str = None):
+    """
+    Exports a summary file to excel
+
+    :param Path, str summary_path: path to summary file (.sqlite)
+    :param Path, str excel_path: path of the excel file, if None, the excel file is
+        saved next to the summary file
+    :return: path of the excel file
+    :rtype: Path
+    """
+    summary_path = Path(summary_path)
+    if excel_path is None:
+        excel_path = summary_path.with_suffix(".xlsx")
+
+    read_summary(summary_path).to_excel(excel_path, index=False, sheet_name="Summary")
+
+    log_msg = f"Exported summary to {excel_path}"
+    log.info(log_msg)
+
+    return Path(excel_path)
+
+
+def _connect(summary_path: Path) -> sqlite3.Connection:
+    """
+    Opens a connection to a sqlite summary file
+
+    Waits for locks of other processes for up to 60s.
+
+    :param Path summary_path: path to summary file
+    :return: connection
+    :rtype: sqlite3.Connection
+    """
+    return sqlite3.connect(summary_path, timeout=60)
+
+
+def _quote(name: str) -> str:
+    """
+    Quotes a table or column name for sqlite
+
+    :param str name: table or column name
+    :return: quoted name
+    :rtype: str
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _append_to_sqlite(summary_path: Path, summary_dicts: list):
+    """
+    Inserts summaries into the summary table of a sqlite file
+
+    The table and missing columns are created in the same transaction as the rows
+    are inserted.
+
+    :param Path summary_path: path to summary file
+    :param list summary_dicts: list of summaries (one dict per run)
+    """
+    columns = list(dict.fromkeys(key for summary in summary_dicts for key in summary))
+
+    with closing(_connect(summary_path)) as con:
+        con.isolation_level = None
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            existing_columns = [
+                row[1]
+                for row in con.execute(f"PRAGMA table_info({_quote(SUMMARY_TABLE)})")
+            ]
+            if not existing_columns:
+                con.execute(
+                    f"CREATE TABLE {_quote(SUMMARY_TABLE)} "
+                    f"({', '.join(_quote(col) for col in columns)})"
+                )
+            else:
+                for col in columns:
+                    if col not in existing_columns:
+                        con.execute(
+                            f"ALTER TABLE {_quote(SUMMARY_TABLE)} "
+                            f"ADD COLUMN {_quote(col)}"
+                        )
+
+            con.executemany(
+                f"INSERT INTO {_quote(SUMMARY_TABLE)} "
+                f"({', '.join(_quote(col) for col in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [
+                    [_to_sqlite_value(summary.get(col)) for col in columns]
+                    for summary in summary_dicts
+                ],
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+
+def _to_sqlite_value(value):
+    """
+    Converts numpy scalars to python types that can be stored in sqlite
+
+    :param value: value to convert
+    :return: converted value
+    """
+    if hasattr(value, "item"):
+        return value.item()
+    return value
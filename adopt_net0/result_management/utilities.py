@@ -1,6 +1,9 @@
 import os
 from pathlib import Path
 
+import h5py
+import numpy as np
+
 
 def create_unique_folder_name(path: Path, name: str) -> Path:
     """
@@ -31,3 +34,62 @@ def create_save_folder(save_path: Path):
     :return:
     """
     os.makedirs(save_path)
+
+
+def get_values(component, index: list) -> np.ndarray:
+    """
+    Returns the values of an indexed pyomo variable or parameter as array
+
+    All values are extracted in one pass over the component. Values that are not
+    set (None) are returned as nan.
+
+    :param component: indexed pyomo variable or parameter
+    :param list index: indices to return the values for
+    :return: values in the order of index
+    :rtype: np.ndarray
+    """
+    values = component.extract_values()
+    return np.array([values[i] for i in list(index)], dtype=float)
+
+
+def get_values_by_carrier(component, set_t, carriers) -> dict:
+    """
+    Returns the values of a pyomo variable or parameter indexed by (t, carrier)
+
+    All values are extracted in one pass over the component. Values that are not
+    set (None) are returned as nan.
+
+    :param component: pyomo variable or parameter indexed by timestep and carrier
+    :param set_t: timesteps to return the values for
+    :param carriers: carriers to return the values for
+    :return: dict with carriers as keys and arrays of values as values
+    :rtype: dict
+    """
+    values = component.extract_values()
+    set_t = list(set_t)
+    return {
+        car: np.array([values[t, car] for t in set_t], dtype=float) for car in carriers
+    }
+
+
+def create_time_series_dataset(h5_group: h5py.Group, name: str, data):
+    """
+    Creates a chunked and compressed dataset for a time series
+
+    The compression filter is read from the attribute 'compression' of the h5
+    file (gzip, lzf or none).
+
+    :param h5py.Group h5_group: h5 group to create the dataset in
+    :param str name: name of dataset
+    :param data: values of time series
+    :return: h5 dataset
+    """
+    data = np.asarray(data)
+    compression = h5_group.file.attrs.get("compression", "none")
+
+    if compression == "none" or data.size <= 1:
+        return h5_group.create_dataset(name, data=data)
+    else:
+        return h5_group.create_dataset(
+            name, data=data, chunks=True, compression=compression
+        )
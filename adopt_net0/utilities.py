@@ -55,6 +55,55 @@ def get_set_t(config: dict, model_block):
         return model_block.set_t_full
 
 
+def get_carrier_index(b_period) -> dict:
+    """
+    Returns the technologies and networks connected to each node and carrier of an
+    investment period
+
+    Only carriers that are used at a node are contained in the index. The index is
+    built once per investment period, so that the balances do not need to check all
+    technologies and networks for each timestep and carrier.
+
+    :param b_period: pyomo block holding an investment period
+    :return: dict with (node, carrier) as keys and dicts as values containing the
+        technologies with the carrier as output (tec_output) and as input
+        (tec_input), the networks transporting the carrier (netw) and the networks
+        consuming the carrier (netw_consumption)
+    :rtype: dict
+    """
+    carrier_index = {}
+    for node in b_period.node_blocks:
+        b_node = b_period.node_blocks[node]
+        for car in b_node.set_carriers:
+            carrier_index[node, car] = {
+                "tec_output": [],
+                "tec_input": [],
+                "netw": [],
+                "netw_consumption": [],
+            }
+        for tec in b_node.set_technologies:
+            b_tec = b_node.tech_blocks_active[tec]
+            for car in b_tec.set_output_carriers_all:
+                if (node, car) in carrier_index:
+                    carrier_index[node, car]["tec_output"].append(tec)
+            for car in b_tec.set_input_carriers_all:
+                if (node, car) in carrier_index:
+                    carrier_index[node, car]["tec_input"].append(tec)
+
+    # Networks (not constructed for copperplate models)
+    if b_period.find_component("network_block"):
+        for netw in b_period.set_networks:
+            b_netw = b_period.network_block[netw]
+            consumption = b_netw.find_component("var_consumption") is not None
+            for node, car in carrier_index:
+                if car in b_netw.set_netw_carrier:
+                    carrier_index[node, car]["netw"].append(netw)
+                if consumption and car in b_netw.set_consumed_carriers:
+                    carrier_index[node, car]["netw_consumption"].append(netw)
+
+    return carrier_index
+
+
 def get_hour_factors(config: dict, data, period: str) -> list:
     """
     Returns the correct hour factors to use for global balances
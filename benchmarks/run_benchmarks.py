@@ -0,0 +1,539 @@
+"""
+Benchmarks the phases of the ModelHub on synthetic cases
+
+Synthetic cases are created with the data preprocessing functions of adopt_net0 and
+are parameterised by the number of nodes, carriers, technologies per node, networks
+and timesteps (and optionally the number of typical days). For each case, the
+following phases of the ModelHub are timed:
+
+- read_data
+- clustering (only for cases with typical days)
+- construct_model
+- construct_balances
+- scale_model (only for cases with scaling)
+- solve (excluding scaling and writing results)
+- write_results
+
+Each case runs in a separate process, so that the peak memory (maximum resident set
+size) is measured per case. Results are stored as json file (by default named after
+the current git commit) and can be compared between commits:
+
+    python benchmarks/run_benchmarks.py run --suite small --solver glpk
+    python benchmarks/run_benchmarks.py compare benchmarks/results/a.json benchmarks/results/b.json
+
+The effect of automatic scaling is benchmarked by solving each case without scaling
+and with automatically derived scaling factors. The solve times and the coefficient
+ranges before and after scaling are compared:
+
+    python benchmarks/run_benchmarks.py scaling --suite small --solver gurobi
+"""
+
+import argparse
+import datetime
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_PATH))
+
+import adopt_net0.data_preprocessing as dp
+from adopt_net0.modelhub import ModelHub
+
+RESULT_PATH = Path(__file__).parent / "results"
+PHASES = [
+    "read_data",
+    "clustering",
+    "construct_model",
+    "construct_balances",
+    "scale_model",
+    "solve",
+    "write_results",
+]
+
+# Carriers and technologies/networks are added in this order
+CARRIERS = ["electricity", "heat", "gas", "hydrogen"]
+TECHNOLOGIES = {
+    "WindTurbine_Onshore_4000": ["electricity"],
+    "Boiler_El": ["electricity", "heat"],
+    "Photovoltaic": ["electricity"],
+    "Storage_Battery": ["electricity"],
+    "HeatPump_AirSourced": ["electricity", "heat"],
+    "Storage_HotWater": ["heat"],
+    "Boiler_Small_NG": ["gas", "heat"],
+    "GasTurbine_simple": ["gas", "hydrogen", "electricity"],
+    "Storage_H2": ["hydrogen"],
+    "Boiler_Small_H2": ["hydrogen", "heat"],
+}
+NETWORKS = {
+    "electricitySimple": "electricity",
+    "heat": "heat",
+    "hydrogenSimple": "hydrogen",
+    "electricityOnshore": "electricity",
+    "hydrogenPipelineOnshore": "hydrogen",
+}
+
+SUITES = {
+    "small": [
+        dict(nodes=2, carriers=2, technologies=2, networks=1, timesteps=24),
+        dict(nodes=2, carriers=2, technologies=2, networks=1, timesteps=168),
+    ],
+    "medium": [
+        dict(nodes=5, carriers=3, technologies=4, networks=2, timesteps=168),
+        dict(nodes=5, carriers=3, technologies=4, networks=2, timesteps=720),
+        dict(
+            nodes=5,
+            carriers=3,
+            technologies=4,
+            networks=2,
+            timesteps=8760,
+            typical_days=10,
+        ),
+    ],
+    "large": [
+        dict(
+            nodes=10,
+            carriers=4,
+            technologies=6,
+            networks=3,
+            timesteps=8760,
+            typical_days=20,
+        ),
+        dict(nodes=10, carriers=4, technologies=6, networks=3, timesteps=8760),
+    ],
+}
+
+
+def get_case_name(case: dict) -> str:
+    """
+    Returns a unique name of a case
+
+    :param dict case: case parameters
+    :return: case name
+    :rtype: str
+    """
+    name = (
+        f"n{case['nodes']}_c{case['carriers']}_t{case['technologies']}"
+        f"_nw{case['networks']}_ts{case['timesteps']}"
+    )
+    if case.get("typical_days", 0):
+        name += f"_td{case['typical_days']}"
+    if case.get("scaling", 0) == "automatic":
+        name += "_autoscaled"
+    elif case.get("scaling", 0):
+        name += "_scaled"
+    return name
+
+
+def create_synthetic_case(path: Path, case: dict, solver: str, seed: int = 0):
+    """
+    Creates the input data folder of a synthetic case
+
+    All carriers can be imported at a high price, so that all cases are feasible.
+    Electricity (and heat) is demanded at each node. Networks connect the nodes in a
+    ring. The number of typical days is not set in the model configuration, as the
+    clustering is timed separately (see run_case).
+
+    :param Path path: folder to create the case in
+    :param dict case: case parameters
+    :param str solver: solver to use
+    :param int seed: seed of the random time series
+    """
+    rng = np.random.default_rng(seed)
+    carriers = CARRIERS[: case["carriers"]]
+    nodes = [f"node{i + 1}" for i in range(case["nodes"])]
+    technologies = [
+        tec
+        for tec, tec_carriers in TECHNOLOGIES.items()
+        if set(tec_carriers) <= set(carriers)
+    ][: case["technologies"]]
+    networks = [netw for netw, carrier in NETWORKS.items() if carrier in carriers][
+        : case["networks"]
+    ]
+
+    # Templates
+    (path / "results").mkdir(parents=True, exist_ok=True)
+    dp.create_optimization_templates(path)
+
+    start_date = pd.Timestamp("2022-01-01 00:00")
+    topology = dp.initialize_topology_templates()
+    topology["nodes"] = nodes
+    topology["carriers"] = carriers
+    topology["start_date"] = str(start_date)
+    topology["end_date"] = str(start_date + pd.Timedelta(hours=case["timesteps"] - 1))
+    with open(path / "Topology.json", "w") as f:
+        json.dump(topology, f, indent=4)
+
+    with open(path / "ConfigModel.json") as f:
+        config = json.load(f)
+    config["solveroptions"]["solver"]["value"] = solver
+    config["optimization"]["typicaldays"]["method"]["value"] = 1
+    config["scaling"]["scaling_on"]["value"] = int(bool(case.get("scaling", 0)))
+    config["scaling"]["automatic"]["value"] = int(case.get("scaling", 0) == "automatic")
+    config["reporting"]["save_path"]["value"] = str(path / "results")
+    config["reporting"]["save_summary_path"]["value"] = str(path / "results")
+    with open(path / "ConfigModel.json", "w") as f:
+        json.dump(config, f, indent=4)
+
+    dp.create_input_data_folder_template(path)
+
+    # Node locations, technologies and climate data
+    node_locations = pd.DataFrame(
+        {
+            "lon": np.linspace(4, 7, len(nodes)),
+            "lat": np.linspace(51, 53, len(nodes)),
+            "alt": 10,
+        },
+        index=nodes,
+    )
+    node_locations.to_csv(path / "NodeLocations.csv", sep=";")
+
+    timesteps = pd.date_range(
+        start=topology["start_date"], end=topology["end_date"], freq="1h"
+    )
+    hour = np.arange(len(timesteps))
+    daylight = np.clip(np.sin((hour % 24 - 6) / 12 * np.pi), 0, None)
+    for node in nodes:
+        node_path = path / "period1" / "node_data" / node
+        with open(node_path / "Technologies.json", "w") as f:
+            json.dump({"existing": {}, "new": technologies}, f, indent=4)
+
+        climate_data = pd.DataFrame(
+            {
+                "ghi": 800 * daylight * rng.uniform(0.5, 1, len(hour)),
+                "dni": 600 * daylight * rng.uniform(0.5, 1, len(hour)),
+                "dhi": 200 * daylight,
+                "temp_air": 10 + 8 * np.sin(hour / 24 / 365 * 2 * np.pi) + daylight,
+                "rh": rng.uniform(40, 90, len(hour)),
+                "ws10": rng.weibull(2, len(hour)) * 6,
+                "TECHNOLOGYNAME_hydro_inflow": 0,
+            },
+            index=timesteps,
+        )
+        climate_data.to_csv(node_path / "ClimateData.csv", sep=";")
+
+    dp.copy_technology_data(path)
+
+    # Networks (ring)
+    with open(path / "period1" / "Networks.json", "w") as f:
+        json.dump({"existing": [], "new": networks}, f, indent=4)
+    connection = pd.DataFrame(0, index=nodes, columns=nodes)
+    if len(nodes) > 1:
+        for i, node in enumerate(nodes):
+            connection.loc[node, nodes[(i + 1) % len(nodes)]] = 1
+            connection.loc[nodes[(i + 1) % len(nodes)], node] = 1
+    for netw in networks:
+        netw_path = path / "period1" / "network_topology" / "new" / netw
+        netw_path.mkdir(parents=True, exist_ok=True)
+        connection.to_csv(netw_path / "connection.csv", sep=";")
+        (connection * 100).to_csv(netw_path / "distance.csv", sep=";")
+    dp.copy_network_data(path)
+
+    # Carrier data
+    dp.fill_carrier_data(path, value_or_data=0)
+    demand = pd.DataFrame({"Demand": 5 + 5 * rng.uniform(size=len(hour))})
+    dp.fill_carrier_data(
+        path, demand, columns=["Demand"], carriers=carriers[: min(2, len(carriers))]
+    )
+    dp.fill_carrier_data(path, 1000, columns=["Import limit"])
+    dp.fill_carrier_data(path, 500, columns=["Import price"])
+
+
+def run_case(case: dict, solver: str) -> dict:
+    """
+    Creates a synthetic case and times all phases of the ModelHub
+
+    :param dict case: case parameters
+    :param str solver: solver to use
+    :return: timings of all phases (s), peak memory (MB) and model size
+    :rtype: dict
+    """
+    import logging
+
+    logging.disable(logging.WARNING)
+
+    timings = {}
+
+    def timed(phase, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        timings[phase] = timings.get(phase, 0) + time.perf_counter() - start
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "case"
+        create_synthetic_case(path, case, solver)
+
+        pyhub = ModelHub()
+
+        # Data is read without clustering (see create_synthetic_case), the
+        # clustering is timed separately
+        timed("read_data", pyhub.read_data, path)
+        if case.get("typical_days", 0):
+            config = pyhub.data.model_config
+            config["optimization"]["typicaldays"]["N"]["value"] = case["typical_days"]
+            timed("clustering", pyhub.data._cluster_data)
+
+        timed("construct_model", pyhub.construct_model)
+        timed("construct_balances", pyhub.construct_balances)
+
+        # Scaling and writing results are called when solving
+        scale_model = pyhub.scale_model
+        write_results = pyhub.write_results
+        pyhub.scale_model = lambda: timed("scale_model", scale_model)
+        pyhub.write_results = lambda: timed("write_results", write_results)
+        timed("solve", pyhub.solve)
+        timings["solve"] -= timings.get("scale_model", 0) + timings.get(
+            "write_results", 0
+        )
+
+        model = pyhub.model[pyhub.info_solving_algorithms["aggregation_model"]]
+        result = {
+            "case": get_case_name(case),
+            "parameters": case,
+            "timings": timings,
+            "total_time": sum(timings.values()),
+            "peak_memory": _get_peak_memory(),
+            "nr_variables": model.nvariables(),
+            "nr_constraints": model.nconstraints(),
+            "termination_condition": str(pyhub.solution.solver.termination_condition),
+            "objective": model.var_npv.value,
+        }
+        if pyhub.scaling_analyser is not None:
+            report = pyhub.scaling_analyser.get_report()
+            result["coefficient_range"] = report["coefficient_range"].max()
+            result["coefficient_range_scaled"] = report[
+                "coefficient_range_scaled"
+            ].max()
+
+    return result
+
+
+def _get_peak_memory() -> float | None:
+    """
+    Returns the peak memory (maximum resident set size) of the process in MB
+
+    :return: peak memory or None, if it cannot be determined on this platform
+    :rtype: float | None
+    """
+    if resource is None:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on linux, bytes on macOS
+    if sys.platform == "darwin":
+        return peak_memory / 1024**2
+    return peak_memory / 1024
+
+
+def _get_commit() -> str:
+    """
+    Returns the current git commit (with suffix -dirty, if there are uncommitted
+    changes)
+
+    :return: commit hash or 'unknown'
+    :rtype: str
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + "-dirty" if dirty else commit
+
+
+def run_benchmarks(cases: list, solver: str, output: Path = None) -> Path:
+    """
+    Runs all cases (each in a separate process) and writes the results to a json file
+
+    :param list cases: list of case parameters
+    :param str solver: solver to use
+    :param Path output: json file to write the results to, if None, the file is
+        named after the current commit and stored in benchmarks/results
+    :return: path of the result file
+    :rtype: Path
+    """
+    commit = _get_commit()
+    if output is None:
+        output = RESULT_PATH / f"{commit}.json"
+    output = Path(output)
+
+    results = []
+    for case in cases:
+        print(f"Running {get_case_name(case)}...", flush=True)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_case, case, solver).result()
+        results.append(result)
+        if result["peak_memory"] is None:
+            peak_memory = "n/a"
+        else:
+            peak_memory = f"{result['peak_memory']:.0f}MB"
+        print(
+            "  "
+            + ", ".join(
+                f"{phase}: {result['timings'][phase]:.2f}s"
+                for phase in PHASES
+                if phase in result["timings"]
+            )
+            + f", peak memory: {peak_memory}",
+            flush=True,
+        )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "solver": solver,
+                "results": results,
+            },
+            f,
+            indent=4,
+        )
+    print(f"Results written to {output}")
+    return output
+
+
+def compare_scaling(cases: list, solver: str) -> pd.DataFrame:
+    """
+    Solves all cases (each in a separate process) without scaling and with
+    automatic scaling
+
+    :param list cases: list of case parameters
+    :param str solver: solver to use
+    :return: comparison with one row per case: solve time without and with scaling
+        (including deriving the scaling factors), coefficient range (orders of
+        magnitude) before and after scaling and objective values
+    :rtype: pd.DataFrame
+    """
+    rows = []
+    for case in cases:
+        results = {}
+        for scaling in [0, "automatic"]:
+            scaled_case = dict(case, scaling=scaling)
+            print(f"Running {get_case_name(scaled_case)}...", flush=True)
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[scaling] = executor.submit(
+                    run_case, scaled_case, solver
+                ).result()
+
+        unscaled, scaled = results[0], results["automatic"]
+        rows.append(
+            {
+                "case": unscaled["case"],
+                "solve": unscaled["timings"]["solve"],
+                "solve_scaled": scaled["timings"]["solve"]
+                + scaled["timings"].get("scale_model", 0),
+                "coefficient_range": scaled["coefficient_range"],
+                "coefficient_range_scaled": scaled["coefficient_range_scaled"],
+                "objective": unscaled["objective"],
+                "objective_scaled": scaled["objective"],
+            }
+        )
+
+    comparison = pd.DataFrame(rows).set_index("case")
+    comparison["ratio"] = comparison["solve_scaled"] / comparison["solve"]
+    return comparison
+
+
+def compare_benchmarks(
+    baseline: Path, current: Path, threshold: float = 0.1, min_difference: float = 0.1
+) -> pd.DataFrame:
+    """
+    Compares two benchmark result files
+
+    :param Path baseline: result file of the baseline
+    :param Path current: result file to compare to the baseline
+    :param float threshold: relative increase of time or memory that is reported as
+        regression
+    :param float min_difference: minimal absolute increase (s or MB) that is
+        reported as regression (avoids reporting noise of very short phases)
+    :return: comparison with one row per case and phase
+    :rtype: pd.DataFrame
+    """
+
+    def read(path):
+        with open(path) as f:
+            results = json.load(f)["results"]
+        rows = {}
+        for result in results:
+            for phase, duration in result["timings"].items():
+                rows[result["case"], phase] = duration
+            rows[result["case"], "total_time"] = result["total_time"]
+            rows[result["case"], "peak_memory"] = result["peak_memory"]
+        return pd.Series(rows)
+
+    comparison = pd.DataFrame({"baseline": read(baseline), "current": read(current)})
+    comparison = comparison.dropna()
+    comparison["ratio"] = comparison["current"] / comparison["baseline"]
+    comparison["regression"] = (comparison["ratio"] > 1 + threshold) & (
+        comparison["current"] - comparison["baseline"] > min_difference
+    )
+    comparison.index.names = ["case", "phase"]
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_run = subparsers.add_parser("run", help="run benchmarks")
+    parser_run.add_argument("--suite", choices=list(SUITES.keys()), default="small")
+    parser_run.add_argument("--solver", default="glpk")
+    parser_run.add_argument("--output", type=Path, default=None)
+
+    parser_compare = subparsers.add_parser("compare", help="compare two result files")
+    parser_compare.add_argument("baseline", type=Path)
+    parser_compare.add_argument("current", type=Path)
+    parser_compare.add_argument("--threshold", type=float, default=0.1)
+    parser_compare.add_argument("--min_difference", type=float, default=0.1)
+
+    parser_scaling = subparsers.add_parser(
+        "scaling", help="compare solve times without and with automatic scaling"
+    )
+    parser_scaling.add_argument("--suite", choices=list(SUITES.keys()), default="small")
+    parser_scaling.add_argument("--solver", default="glpk")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_benchmarks(SUITES[args.suite], args.solver, args.output)
+    elif args.command == "scaling":
+        comparison = compare_scaling(SUITES[args.suite], args.solver)
+        with pd.option_context("display.max_columns", None, "display.width", 200):
+            print(comparison.round(3))
+    else:
+        comparison = compare_benchmarks(
+            args.baseline, args.current, args.threshold, args.min_difference
+        )
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(comparison.round(3))
+        if comparison["regression"].any():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pyomo.environ import (
     ConcreteModel,
     Constraint,
@@ -16,6 +18,7 @@ from adopt_net0.model_construction.construct_balances import (
     construct_system_cost,
 )
 from adopt_net0.data_management import DataHandle
+from adopt_net0.utilities import get_carrier_index
 
 
 def construct_model(dh):
@@ -172,6 +175,37 @@ def test_model_global_energy_balance():
     assert m.periods[period].node_blocks[node2].var_import_flow[1, carrier].value == 1
 
 
+def test_carrier_index():
+    """
+    Tests that the carrier index contains the carriers used at each node with the
+    connected technologies and networks and that the energy balance is only
+    constructed for these carriers
+    """
+    pyhub = ModelHub()
+    pyhub.read_data(
+        Path("tests/case_study_full_pipeline"), start_period=0, end_period=1
+    )
+    pyhub.construct_model()
+    pyhub.construct_balances()
+    m = pyhub.model["full"]
+
+    carrier_index = get_carrier_index(m.periods["period1"])
+    assert set(carrier_index) == {
+        ("node1", "gas"),
+        ("node1", "electricity"),
+        ("node2", "heat"),
+        ("node2", "electricity"),
+    }
+    assert carrier_index["node2", "heat"]["tec_output"] == ["TestTec_BoilerEl"]
+    assert carrier_index["node2", "electricity"]["tec_input"] == ["TestTec_BoilerEl"]
+    assert carrier_index["node2", "electricity"]["netw"] == ["electricitySimple"]
+    assert carrier_index["node1", "gas"]["netw"] == []
+
+    const_energybalance = m.block_energybalance["period1"].const_energybalance
+    assert len(const_energybalance) == len(carrier_index)
+    assert (1, "heat", "node1") not in const_energybalance
+
+
 def test_model_emission_balance():
     """
     Tests the emission balance
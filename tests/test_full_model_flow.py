@@ -1,7 +1,14 @@
+import h5py
+import json
+import shutil
 from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
 from warnings import warn
 
 from pyomo.opt import TerminationCondition
+import pyomo.environ as pyo
 
 from adopt_net0.modelhub import ModelHub
 
@@ -250,6 +257,434 @@ def test_monte_carlo(request):
     assert termination == TerminationCondition.optimal
 
 
+def test_parallel_sweeps(request, tmp_path):
+    """
+    Tests that monte carlo runs and pareto points solved in parallel worker
+    processes give the same results as solved sequentially
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    summaries = {}
+    for sweep_workers in [1, 2]:
+        for sweep in ["monte_carlo", "pareto"]:
+            save_path = tmp_path / f"{sweep}_{sweep_workers}"
+            save_path.mkdir()
+
+            pyhub = ModelHub()
+            pyhub.read_data(path, start_period=0, end_period=2)
+            config = pyhub.data.model_config
+            config["reporting"]["save_path"]["value"] = str(save_path)
+            config["reporting"]["save_summary_path"]["value"] = str(save_path)
+            config["solveroptions"]["solver"]["value"] = request.config.solver
+            config["parallelization"]["sweep_workers"]["value"] = sweep_workers
+
+            if sweep == "monte_carlo":
+                config["optimization"]["monte_carlo"]["N"]["value"] = 3
+                config["optimization"]["monte_carlo"]["seed"]["value"] = 10
+            else:
+                config["optimization"]["objective"]["value"] = "pareto"
+                config["optimization"]["pareto_points"]["value"] = 4
+            pyhub.quick_solve()
+
+            summaries[sweep, sweep_workers] = pd.read_excel(save_path / "Summary.xlsx")
+
+    for sweep in ["monte_carlo", "pareto"]:
+        for col in ["monte_carlo_run", "pareto_point", "total_npv"]:
+            assert np.allclose(
+                summaries[sweep, 1][col], summaries[sweep, 2][col], rtol=1e-4
+            )
+
+
+def test_construction_profile(request, tmp_path):
+    """
+    Tests that the construction profile covers all blocks and balances, that the
+    counted variables and constraints add up to the model size and that the report
+    is written to the result folder
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=2)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["reporting"]["profile_construction"]["value"] = 1
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    pyhub.quick_solve()
+
+    profile = pyhub.construction_profiler.to_dataframe()
+    assert set(profile.loc[profile["kind"] == "technology", "name"]) == {
+        "period1/node1/TestTec_GasTurbine_simple_existing",
+        "period1/node1/TestTec_WindTurbine",
+        "period1/node2/TestTec_BoilerEl",
+    }
+    assert len(profile[profile["kind"] == "node"]) == 2
+    assert len(profile[profile["kind"] == "balance"]) == 5
+
+    m = pyhub.model["full"]
+    nr_variables = sum(1 for _ in m.component_data_objects(pyo.Var, descend_into=True))
+    nr_constraints = sum(
+        1 for _ in m.component_data_objects(pyo.Constraint, active=True)
+    )
+    # Objective is constructed at solving and global variables are not in a block
+    assert profile["variables"].sum() == nr_variables - 2
+    assert profile["constraints"].sum() == nr_constraints
+
+    result_folder_path = pyhub.last_solve_info["result_folder_path"]
+    report = pd.read_csv(result_folder_path / "construction_profile.csv")
+    assert len(report) == len(profile)
+    assert (result_folder_path / "construction_profile.json").is_file()
+
+
+def test_model_cache(request, tmp_path, monkeypatch):
+    """
+    Tests that the constructed model is read from the cache in a second run and that
+    the cache is invalidated if the configuration of the construction changes
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    def run(violation: int = -1, monte_carlo_runs: int = 0) -> ModelHub:
+        pyhub = ModelHub()
+        pyhub.read_data(path, start_period=0, end_period=1)
+        config = pyhub.data.model_config
+        config["reporting"]["save_path"]["value"] = str(tmp_path)
+        config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+        config["caching"]["model"]["value"] = 1
+        config["caching"]["cache_path"]["value"] = str(tmp_path / "cache")
+        config["energybalance"]["violation"]["value"] = violation
+        config["optimization"]["monte_carlo"]["N"]["value"] = monte_carlo_runs
+        config["optimization"]["monte_carlo"]["on_what"]["value"] = ["Import"]
+        config["solveroptions"]["solver"]["value"] = request.config.solver
+        pyhub.quick_solve()
+        return pyhub
+
+    npv = run().model["full"].var_npv.value
+    cache_files = list((tmp_path / "cache" / "models").glob("*.pkl"))
+    assert len(cache_files) == 1
+
+    def construct_model(self):
+        raise AssertionError("Model should be read from cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(ModelHub, "construct_model", construct_model)
+        pyhub = run()
+    assert pyhub.info_solving_algorithms["aggregation_model"] == "full"
+    assert np.isclose(pyhub.model["full"].var_npv.value, npv)
+
+    # Changing the energy balance requires a new model
+    run(violation=1000)
+    assert len(list((tmp_path / "cache" / "models").glob("*.pkl"))) == 2
+
+    # Monte Carlo runs require a model with mutable prices
+    pyhub = run(monte_carlo_runs=2)
+    assert pyhub.solution.solver.termination_condition == TerminationCondition.optimal
+    assert len(list((tmp_path / "cache" / "models").glob("*.pkl"))) == 3
+
+
+def test_add_technology(request, tmp_path):
+    """
+    Tests that adding a technology to a solved model updates the balances (and the
+    persistent solver) such that the result equals the result of a model
+    constructed with the technology
+    """
+    path = tmp_path / "case"
+    shutil.copytree(Path("tests/case_study_full_pipeline"), path)
+    with open(path / "period1/node_data/node2/Technologies.json", "w") as f:
+        json.dump({"existing": {}, "new": []}, f)
+    if request.config.solver == "gurobi":
+        solver = "gurobi_persistent"
+    else:
+        solver = request.config.solver
+
+    results = {}
+    for case_path in [path, Path("tests/case_study_full_pipeline")]:
+        pyhub = ModelHub()
+        pyhub.read_data(case_path, start_period=0, end_period=1)
+        config = pyhub.data.model_config
+        config["reporting"]["save_path"]["value"] = str(tmp_path)
+        config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+        config["solveroptions"]["solver"]["value"] = solver
+        pyhub.quick_solve()
+        results[case_path] = pyhub.model["full"].var_npv.value
+
+        if case_path == path:
+            solver_instance = pyhub.solver
+            pyhub.add_technology("period1", "node2", ["TestTec_BoilerEl"])
+            pyhub.solve()
+            assert (
+                pyhub.solution.solver.termination_condition
+                == TerminationCondition.optimal
+            )
+            if solver == "gurobi_persistent":
+                assert pyhub.solver is solver_instance
+            results["added"] = pyhub.model["full"].var_npv.value
+
+    assert results["added"] < results[path]
+    assert np.isclose(
+        results["added"], results[Path("tests/case_study_full_pipeline")], rtol=1e-4
+    )
+
+
+def test_scaling_in_place(request, tmp_path):
+    """
+    Tests that scaling the model in place gives the same result as the unscaled
+    model and that the model is unscaled after solving
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    results = {}
+    for scaling_on in [0, 1]:
+        pyhub = ModelHub()
+        pyhub.read_data(path, start_period=0, end_period=1)
+        config = pyhub.data.model_config
+        config["reporting"]["save_path"]["value"] = str(tmp_path)
+        config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+        config["solveroptions"]["solver"]["value"] = request.config.solver
+        config["optimization"]["objective"]["value"] = "emissions_minC"
+        config["scaling"]["scaling_on"]["value"] = scaling_on
+        config["scaling"]["in_place"]["value"] = 1
+        pyhub.construct_model()
+        pyhub.construct_balances()
+        m = pyhub.model["full"]
+        npv_expression = str(m.const_npv.expr)
+        pyhub.solve()
+
+        assert (
+            pyhub.solution.solver.termination_condition == TerminationCondition.optimal
+        )
+        assert "scaled" not in pyhub.model
+        assert str(m.const_npv.expr) == npv_expression
+        results[scaling_on] = (m.var_npv.value, m.var_emissions_net.value)
+
+    assert np.allclose(results[0], results[1], rtol=1e-4)
+
+
+def test_automatic_scaling(request, tmp_path):
+    """
+    Tests that automatic scaling reduces the coefficient ranges, reports them and
+    gives the same result as the unscaled model
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    results = {}
+    for scaling_on in [0, 1]:
+        pyhub = ModelHub()
+        pyhub.read_data(path, start_period=0, end_period=1)
+        config = pyhub.data.model_config
+        config["reporting"]["save_path"]["value"] = str(tmp_path)
+        config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+        config["solveroptions"]["solver"]["value"] = request.config.solver
+        config["scaling"]["scaling_on"]["value"] = scaling_on
+        config["scaling"]["automatic"]["value"] = 1
+        pyhub.quick_solve()
+
+        assert (
+            pyhub.solution.solver.termination_condition == TerminationCondition.optimal
+        )
+        m = pyhub.model["full"]
+        results[scaling_on] = (m.var_npv.value, m.var_emissions_net.value)
+
+    assert np.allclose(results[0], results[1], rtol=1e-4)
+
+    report = pd.read_csv(
+        pyhub.last_solve_info["result_folder_path"] / "scaling_report.csv"
+    )
+    technologies = report[report["kind"] == "technology"]
+    assert len(technologies) == 3
+    assert report["coefficient_range_scaled"].max() < report["coefficient_range"].max()
+
+
+def test_rolling_horizon(request, tmp_path):
+    """
+    Tests that the rolling horizon dispatch of a design gives the same result as the
+    model with this design (the test case has no storage) and that the results of
+    the windows are merged over the full horizon
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=6)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    config["optimization"]["rolling_horizon"]["window"]["value"] = 2
+    config["optimization"]["rolling_horizon"]["lookahead"]["value"] = 1
+    pyhub.quick_solve()
+    npv = pyhub.model["full"].var_npv.value
+    design_file = (
+        pyhub.last_solve_info["result_folder_path"] / "optimization_results.h5"
+    )
+
+    pyhub.solve_rolling_horizon()
+    merged_file = (
+        pyhub.last_solve_info["result_folder_path"] / "optimization_results.h5"
+    )
+
+    with h5py.File(design_file, "r") as design, h5py.File(merged_file, "r") as merged:
+        assert np.isclose(merged["summary/total_npv"][()], npv, rtol=1e-4)
+        for path in [
+            "design/nodes/period1/node1/TestTec_WindTurbine/size",
+            "operation/technology_operation/period1/node1/TestTec_WindTurbine/"
+            "electricity_output",
+        ]:
+            assert merged[path].shape == design[path].shape
+            assert np.allclose(merged[path][()], design[path][()], rtol=1e-4)
+
+
+def test_rolling_horizon_storage(request, tmp_path):
+    """
+    Tests that storage levels are carried over between the windows of a rolling
+    horizon dispatch
+    """
+    path = tmp_path / "case"
+    shutil.copytree(Path("tests/case_study_full_pipeline"), path)
+    node_path = path / "period1/node_data/node1"
+    shutil.copy(
+        Path("tests/technology_data/TestTec_StorageBattery.json"),
+        node_path / "technology_data",
+    )
+    with open(node_path / "Technologies.json", "w") as f:
+        json.dump(
+            {
+                "existing": {
+                    "TestTec_GasTurbine_simple": 10,
+                    "TestTec_StorageBattery": 5,
+                },
+                "new": ["TestTec_WindTurbine"],
+            },
+            f,
+        )
+    # Electricity is cheap at the end and expensive at the start of each window (and
+    # at the end of its look-ahead, such that a cyclic storage level would be zero)
+    time_series = pd.read_csv(
+        node_path / "carrier_data/electricity.csv", sep=";", index_col=0
+    )
+    time_series["Import limit"] = 10
+    time_series["Import price"] = [0 if t % 2 else 100 for t in range(48)]
+    time_series.to_csv(node_path / "carrier_data/electricity.csv", sep=";")
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=8)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    config["optimization"]["rolling_horizon"]["window"]["value"] = 2
+    config["optimization"]["rolling_horizon"]["lookahead"]["value"] = 1
+    pyhub.quick_solve()
+    pyhub.solve_rolling_horizon()
+
+    result_file = (
+        pyhub.last_solve_info["result_folder_path"] / "optimization_results.h5"
+    )
+    with h5py.File(result_file, "r") as f:
+        storage = f[
+            "operation/technology_operation/period1/node1/"
+            "TestTec_StorageBattery_existing"
+        ]
+        level = storage["storage_level"][:]
+        charge = storage["electricity_input"][:]
+        discharge = storage["electricity_output"][:]
+
+    # Storage balance at the first timestep of windows 2 to 4 (eta_in = eta_out =
+    # 0.96, lambda = 0.001)
+    for t in [2, 4, 6]:
+        assert level[t - 1] > 0.1
+        assert np.isclose(
+            level[t],
+            level[t - 1] * 0.999 + charge[t] * 0.96 - discharge[t] / 0.96,
+            atol=1e-4,
+        )
+
+
+def test_solve_fixed_design(request, tmp_path):
+    """
+    Tests that fixing the design and its binaries of a solved model gives a LP with
+    the same result
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=1)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    pyhub.quick_solve()
+    m = pyhub.model["full"]
+    npv = m.var_npv.value
+
+    pyhub.solve_fixed_design("fix")
+
+    assert pyhub.solution.solver.termination_condition == TerminationCondition.optimal
+    assert not any(
+        var.is_integer() and not var.fixed
+        for var in m.component_data_objects(pyo.Var, descend_into=True)
+    )
+    assert np.isclose(m.var_npv.value, npv, rtol=1e-4)
+
+
+@pytest.mark.parametrize("binaries", ["keep", "fix", "relax"])
+def test_solve_fixed_design_operation(request, tmp_path, binaries):
+    """
+    Tests keeping, fixing and relaxing the on/off binaries of a technology when
+    fixing the design of a solved model
+    """
+    path = tmp_path / "case"
+    shutil.copytree(Path("tests/case_study_full_pipeline"), path)
+    tec_file = (
+        path / "period1/node_data/node1/technology_data/TestTec_GasTurbine_simple.json"
+    )
+    with open(tec_file) as f:
+        tec_data = json.load(f)
+    tec_data["Performance"]["performance_function_type"] = 2
+    tec_data["Performance"]["min_part_load"] = 0.5
+    with open(tec_file, "w") as f:
+        json.dump(tec_data, f)
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=6)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    pyhub.quick_solve()
+    m = pyhub.model["full"]
+    npv = m.var_npv.value
+
+    def count_inactive_bigm_constraints():
+        return sum(
+            1
+            for con in m.component_data_objects(
+                pyo.Constraint, active=None, descend_into=True
+            )
+            if not con.active and "_pyomo_gdp_bigm_reformulation" in con.name
+        )
+
+    inactive_bigm_constraints = count_inactive_bigm_constraints()
+
+    pyhub.solve_fixed_design(binaries)
+
+    assert pyhub.solution.solver.termination_condition == TerminationCondition.optimal
+    integer_variables = [
+        var
+        for var in m.component_data_objects(pyo.Var, descend_into=True)
+        if var.is_integer() and not var.fixed
+    ]
+    if binaries == "keep":
+        assert integer_variables
+        assert np.isclose(m.var_npv.value, npv, rtol=1e-4)
+    elif binaries == "fix":
+        assert not integer_variables
+        # Big-m constraints of inactive on/off disjuncts are removed
+        assert count_inactive_bigm_constraints() > inactive_bigm_constraints
+        assert np.isclose(m.var_npv.value, npv, rtol=1e-4)
+    else:
+        assert not integer_variables
+        assert m.var_npv.value <= npv * (1 + 1e-4)
+
+
 def test_scaling(request):
     """
     Tests model scaling
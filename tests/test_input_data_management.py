@@ -1,4 +1,10 @@
 import pytest
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
 
 from adopt_net0.data_management import DataHandle
 
@@ -44,3 +50,158 @@ def test_data_handle_reading(request):
 #     dh.read_input_data(case_study_folder_path)
 #     dh.model_config["optimization"]["timestaging"]["value"] = 2
 #     dh._average_data()
+
+
+@pytest.mark.data_management
+def test_data_handle_time_series_cache(request):
+    """
+    Tests caching of time series
+    - time series read from cache equal time series read from csv files
+    - cache is renewed if a csv file changes
+    """
+    case_study_folder_path = request.config.case_study_folder_path
+
+    def read_time_series(start_period=None, end_period=None, cache=1):
+        dh = DataHandle()
+        dh.set_settings(case_study_folder_path, start_period, end_period)
+        dh._read_topology()
+        dh._read_model_config()
+        dh.model_config["caching"]["time_series"]["value"] = cache
+        dh._read_time_series()
+        return dh.time_series["full"]
+
+    time_series_csv = read_time_series(cache=0)
+    time_series_first_read = read_time_series()
+    assert (case_study_folder_path / ".cache" / "time_series.h5").is_file()
+    time_series_cached = read_time_series()
+    pd.testing.assert_frame_equal(time_series_csv, time_series_first_read)
+    pd.testing.assert_frame_equal(time_series_csv, time_series_cached)
+
+    # Shortened time series
+    pd.testing.assert_frame_equal(
+        read_time_series(10, 20, cache=0), read_time_series(10, 20)
+    )
+
+    # Changed input data
+    carrier_path = (
+        case_study_folder_path
+        / "period1"
+        / "node_data"
+        / "node1"
+        / "carrier_data"
+        / "electricity.csv"
+    )
+    carrier_data = pd.read_csv(carrier_path, sep=";", index_col=0)
+    carrier_data["Demand"] = 1.5
+    carrier_data.to_csv(carrier_path, sep=";")
+    time_series_changed = read_time_series()
+    assert (
+        time_series_changed["period1"]["node1"]["CarrierData"]["electricity"]["Demand"]
+        == 1.5
+    ).all()
+
+
+@pytest.mark.data_management
+def test_data_handle_clustering_cache(request):
+    """
+    Tests caching of clustering and averaging results
+    - clustered/averaged data read from the cache equals the data obtained before
+    """
+    case_study_folder_path = request.config.case_study_folder_path
+
+    dh = DataHandle()
+    dh.set_settings(case_study_folder_path, 0, 24 * 4)
+    dh.read_data()
+    dh.model_config["caching"]["clustering"]["value"] = 1
+    dh.model_config["optimization"]["typicaldays"]["N"]["value"] = 2
+    dh.model_config["optimization"]["timestaging"]["value"] = 2
+
+    dh._cluster_data()
+    dh._average_data()
+    clustered = dh.time_series["clustered"]
+    sequence = dh.k_means_specs["period1"]["sequence"]
+    averaged = dh.time_series["averaged"]
+    assert len(os.listdir(case_study_folder_path / ".cache" / "clustering")) == 2
+
+    dh._cluster_data()
+    dh._average_data()
+    pd.testing.assert_frame_equal(clustered, dh.time_series["clustered"])
+    pd.testing.assert_frame_equal(averaged, dh.time_series["averaged"])
+    assert sequence == dh.k_means_specs["period1"]["sequence"]
+
+
+@pytest.mark.data_management
+def test_data_handle_technology_cache(tmp_path):
+    """
+    Tests reusing fitted technologies
+    - identical technologies in several nodes are only fitted once, but each node
+      holds its own copy
+    - fitted technologies read from the cache equal the fitted technologies
+    """
+    case_study_folder_path = tmp_path / "case_study"
+    shutil.copytree(Path("tests/case_study_full_pipeline"), case_study_folder_path)
+    node_path = case_study_folder_path / "period1" / "node_data"
+    shutil.copy(
+        node_path / "node1" / "technology_data" / "TestTec_WindTurbine.json",
+        node_path / "node2" / "technology_data",
+    )
+    with open(node_path / "node2" / "Technologies.json", "w") as json_file:
+        json.dump(
+            {"existing": {}, "new": ["TestTec_BoilerEl", "TestTec_WindTurbine"]},
+            json_file,
+        )
+
+    dh = DataHandle()
+    dh.set_settings(case_study_folder_path, 0, 2 * 24)
+    dh.read_data()
+    dh.model_config["caching"]["technologies"]["value"] = 1
+    dh._read_technology_data()
+    technology_data = dh.technology_data["period1"]
+    assert len(os.listdir(case_study_folder_path / ".cache" / "technologies")) == 3
+    assert (
+        technology_data["node1"]["TestTec_WindTurbine"]
+        is not technology_data["node2"]["TestTec_WindTurbine"]
+    )
+
+    dh._read_technology_data()
+    for node in technology_data:
+        for tec in technology_data[node]:
+            coeff = technology_data[node][tec].processed_coeff.time_dependent_full
+            coeff_cached = dh.technology_data["period1"][node][
+                tec
+            ].processed_coeff.time_dependent_full
+            for series in coeff:
+                np.testing.assert_array_equal(coeff[series], coeff_cached[series])
+
+
+@pytest.mark.data_management
+def test_data_handle_parallel_preprocessing():
+    """
+    Tests fitting technologies and averaging in a pool of processes
+    - results are identical to fitting technologies/averaging in the main process
+    """
+    dh = DataHandle()
+    dh.set_settings(Path("tests/case_study_full_pipeline"), 0, 2 * 24)
+    dh.read_data()
+    dh.model_config["optimization"]["timestaging"]["value"] = 2
+    dh._average_data()
+    technology_data_serial = dh.technology_data
+    averaged_serial = dh.time_series["averaged"]
+
+    dh.model_config["parallelization"]["preprocessing_workers"]["value"] = 2
+    dh._read_technology_data()
+    dh._average_data()
+
+    pd.testing.assert_frame_equal(averaged_serial, dh.time_series["averaged"])
+    for node in technology_data_serial["period1"]:
+        for tec in technology_data_serial["period1"][node]:
+            coeff_serial = technology_data_serial["period1"][node][
+                tec
+            ].processed_coeff.time_dependent_full
+            coeff_parallel = dh.technology_data["period1"][node][
+                tec
+            ].processed_coeff.time_dependent_full
+            for series in coeff_serial:
+                np.testing.assert_array_equal(
+                    coeff_serial[series], coeff_parallel[series]
+                )
@@ -1,6 +1,7 @@
 from pathlib import Path
 import json
 import pyomo.environ as pyo
+import pytest
 
 from adopt_net0.components.networks import Network
 from tests.utilities import make_data_for_testing, run_model
@@ -12,6 +13,7 @@ def define_network(
     load_path: Path,
     allow_only_one_direction: bool = False,
     energyconsumption: bool = False,
+    compact_formulation: bool = False,
 ):
     """
     reads TestNetwork from path and creates network object
@@ -19,6 +21,7 @@ def define_network(
     :param Path load_path:
     :param bool allow_only_one_direction:
     :param bool energyconsumption:
+    :param bool compact_formulation:
     :return: Network object
     """
     with open(load_path / ("TestNetwork.json")) as json_file:
@@ -35,6 +38,8 @@ def define_network(
     if not energyconsumption:
         netw_data["Performance"]["energyconsumption"] = {}
 
+    netw_data["Performance"]["compact_formulation"] = int(compact_formulation)
+
     netw_data = Network(netw_data)
 
     return netw_data
@@ -75,7 +80,8 @@ def construct_netw_model(
     return m
 
 
-def test_network_unidirectional(request):
+@pytest.mark.parametrize("compact_formulation", [False, True])
+def test_network_unidirectional(request, compact_formulation):
     """
     Tests a network that can only transport in one direction
 
@@ -91,6 +97,7 @@ def test_network_unidirectional(request):
         request.config.network_data_folder_path,
         allow_only_one_direction=True,
         energyconsumption=False,
+        compact_formulation=compact_formulation,
     )
 
     # INFEASIBILITY CASE
@@ -115,13 +122,14 @@ def test_network_unidirectional(request):
 
     termination = run_model(m, request.config.solver, objective="capex")
     assert termination == pyo.TerminationCondition.optimal
-    assert round(m.arc_block["node2", "node1"].var_size.value, 3) == round(
-        m.arc_block["node1", "node2"].var_size.value, 3
-    )
+    assert round(
+        netw.get_arc_component(m, "var_size", "node2", "node1").value, 3
+    ) == round(netw.get_arc_component(m, "var_size", "node1", "node2").value, 3)
     assert m.var_capex.value > 0
 
 
-def test_network_bidirectional(request):
+@pytest.mark.parametrize("compact_formulation", [False, True])
+def test_network_bidirectional(request, compact_formulation):
     """
     Tests a network that can transport in two directions
 
@@ -134,6 +142,7 @@ def test_network_bidirectional(request):
         request.config.network_data_folder_path,
         allow_only_one_direction=False,
         energyconsumption=False,
+        compact_formulation=compact_formulation,
     )
 
     # FEASIBILITY CASE
@@ -146,14 +155,15 @@ def test_network_bidirectional(request):
     )
     termination = run_model(m, request.config.solver, objective="capex")
     assert termination == pyo.TerminationCondition.optimal
-    assert round(m.arc_block["node2", "node1"].var_size.value, 3) >= 1
-    assert round(m.arc_block["node2", "node1"].var_size.value, 3) <= 2
-    assert round(m.arc_block["node1", "node2"].var_size.value, 3) >= 2
-    assert round(m.arc_block["node1", "node2"].var_size.value, 3) <= 3
+    assert round(netw.get_arc_component(m, "var_size", "node2", "node1").value, 3) >= 1
+    assert round(netw.get_arc_component(m, "var_size", "node2", "node1").value, 3) <= 2
+    assert round(netw.get_arc_component(m, "var_size", "node1", "node2").value, 3) >= 2
+    assert round(netw.get_arc_component(m, "var_size", "node1", "node2").value, 3) <= 3
     assert m.var_capex.value > 0
 
 
-def test_network_energyconsumption(request):
+@pytest.mark.parametrize("compact_formulation", [False, True])
+def test_network_energyconsumption(request, compact_formulation):
     """
     Tests a network with an energy consumption
 
@@ -169,6 +179,7 @@ def test_network_energyconsumption(request):
         request.config.network_data_folder_path,
         allow_only_one_direction=True,
         energyconsumption=True,
+        compact_formulation=compact_formulation,
     )
 
     # INFEASIBILITY CASE
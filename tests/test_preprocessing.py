@@ -1,7 +1,9 @@
+import os
 import pytest
 import pandas as pd
 
 import adopt_net0.data_preprocessing as dp
+from adopt_net0.components.json_catalogue import JsonCatalogue
 from adopt_net0.data_management.utilities import check_input_data_consistency
 from tests.utilities import (
     select_random_list_from_list,
@@ -139,3 +141,40 @@ def test_copy_technology_data(request):
 
     # Check it jsons are there
     check_input_data_consistency(case_study_folder_path)
+
+
+@pytest.mark.data_preprocessing
+def test_json_catalogue(tmp_path):
+    """
+    Tests the catalogue of json files
+    - json files in subdirectories are found and parsed
+    - catalogue is renewed if files are added, modified or removed
+    """
+    (tmp_path / "sub").mkdir()
+    save_json({"a": 1}, tmp_path / "sub" / "TecA.json")
+    catalogue = JsonCatalogue(tmp_path)
+
+    assert catalogue.get_path("TecA") == (tmp_path / "sub" / "TecA.json").resolve()
+    assert catalogue.get_path("teca", case_sensitive=False) is not None
+    assert catalogue.get_path("teca") is None
+    data = catalogue.get_data("TecA")
+    data["a"] = 2
+    assert catalogue.get_data("TecA") == {"a": 1}
+
+    # Modified file
+    save_json({"a": 3}, tmp_path / "sub" / "TecA.json")
+    os.utime(tmp_path / "sub" / "TecA.json", ns=(0, 0))
+    assert catalogue.get_data("TecA") == {"a": 3}
+
+    # Added and removed files
+    save_json({"b": 1}, tmp_path / "sub" / "TecB.json")
+    assert catalogue.get_data("TecB") == {"b": 1}
+    os.remove(tmp_path / "sub" / "TecA.json")
+    assert catalogue.get_data("TecA") is None
+    assert catalogue.names() == ["TecB"]
+
+    # Invalid json
+    with open(tmp_path / "TecC.json", "w") as json_file:
+        json_file.write("[1, 2")
+    with pytest.raises(ValueError):
+        catalogue.get_data("TecC")
@@ -0,0 +1,152 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+
+from adopt_net0.modelhub import ModelHub
+from adopt_net0.result_management import (
+    H5ResultReader,
+    append_to_summary,
+    read_summary,
+    write_summary,
+    export_summary_to_excel,
+)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "lzf", "none"])
+def test_write_results_h5(request, tmp_path, compression):
+    """
+    Tests that results written to the h5 file correspond to the model values and
+    that time series are compressed as specified
+    """
+    path = Path("tests/case_study_full_pipeline")
+
+    pyhub = ModelHub()
+    pyhub.read_data(path, start_period=0, end_period=3)
+    config = pyhub.data.model_config
+    config["reporting"]["save_path"]["value"] = str(tmp_path)
+    config["reporting"]["save_summary_path"]["value"] = str(tmp_path)
+    config["reporting"]["compression"]["value"] = compression
+    config["solveroptions"]["solver"]["value"] = request.config.solver
+    pyhub.quick_solve()
+
+    m = pyhub.model["full"]
+    b_node = m.periods["period1"].node_blocks["node1"]
+    b_tec = b_node.tech_blocks_active["TestTec_GasTurbine_simple_existing"]
+
+    h5_path = pyhub.last_solve_info["result_folder_path"] / "optimization_results.h5"
+    with h5py.File(h5_path, "r") as f:
+        ebalance = f["operation/energy_balance/period1/node1"]
+        assert np.allclose(
+            ebalance["gas/import"][:],
+            [b_node.var_import_flow[t, "gas"].value for t in range(1, 4)],
+        )
+        assert np.allclose(
+            ebalance["gas/technology_inputs"][:],
+            [b_tec.var_input[t, "gas"].value for t in range(1, 4)],
+        )
+        assert np.allclose(
+            ebalance["electricity/demand"][:],
+            [b_node.para_demand[t, "electricity"] for t in range(1, 4)],
+        )
+
+        tec_operation = f[
+            "operation/technology_operation/period1/node1/"
+            "TestTec_GasTurbine_simple_existing"
+        ]
+        assert np.allclose(
+            tec_operation["gas_input"][:],
+            [b_tec.var_input_tot[t, "gas"].value for t in range(1, 4)],
+        )
+
+        expected_compression = None if compression == "none" else compression
+        assert ebalance["gas/import"].compression == expected_compression
+        assert tec_operation["gas_input"].compression == expected_compression
+
+
+def test_h5_result_reader(tmp_path):
+    """
+    Tests selecting and aggregating datasets with the lazy h5 result reader
+    """
+    h5_path = tmp_path / "optimization_results.h5"
+    with h5py.File(h5_path, "w") as f:
+        for node in ["node1", "node2"]:
+            for car in ["electricity", "gas"]:
+                group = f.create_group(f"operation/energy_balance/period1/{node}/{car}")
+                group.create_dataset("import", data=np.arange(4.0))
+                group.create_dataset("import_price", data=np.ones(4))
+        f.create_dataset("design/nodes/period1/node1/tec/size", data=[2.0])
+
+    with H5ResultReader(h5_path) as reader:
+        assert len(reader.get_paths()) == 9
+        # Wildcards do not match across levels
+        assert reader.get_paths("operation/*/import") == []
+        assert reader.get_paths("operation/energy_balance/*/node1/*/import") == [
+            "operation/energy_balance/period1/node1/electricity/import",
+            "operation/energy_balance/period1/node1/gas/import",
+        ]
+        imports = reader.aggregate("operation/energy_balance/*/*/gas/import", np.sum)
+        assert imports == {
+            "operation/energy_balance/period1/node1/gas/import": 6.0,
+            "operation/energy_balance/period1/node2/gas/import": 6.0,
+        }
+        assert reader.read_first("design/nodes/period1/node1/tec/size") == 2.0
+        df = reader.to_dataframe("operation/energy_balance/period1/*/*/import_price")
+        assert df.shape == (4, 4)
+
+    # Index is renewed, if the file changes
+    with h5py.File(h5_path, "a") as f:
+        f.create_dataset("design/nodes/period1/node2/tec/size", data=[1.0])
+    reader = H5ResultReader(h5_path)
+    assert len(reader.get_paths("design/nodes/*/*/tec/size")) == 2
+    reader.close()
+
+
+def _append_runs(summary_path, runs):
+    for run in runs:
+        append_to_summary(summary_path, [{"monte_carlo_run": run, "total_npv": 1.0}])
+
+
+@pytest.mark.parametrize("summary_format", ["xlsx", "sqlite"])
+def test_summary_store(tmp_path, summary_format):
+    """
+    Tests appending to, rewriting and exporting the summary file
+    """
+    summary_path = tmp_path / f"Summary.{summary_format}"
+
+    append_to_summary(
+        summary_path, [{"monte_carlo_run": 0, "total_npv": np.float64(1.5)}]
+    )
+    # New columns are added
+    append_to_summary(
+        summary_path,
+        [{"monte_carlo_run": np.int64(1), "total_npv": 2.5, "emissions_net": 3}],
+    )
+    summary = read_summary(summary_path)
+    assert list(summary["monte_carlo_run"]) == [0, 1]
+    assert list(summary["total_npv"]) == [1.5, 2.5]
+    assert np.isnan(summary["emissions_net"][0])
+
+    summary["total_npv"] = [5, 6]
+    write_summary(summary_path, summary)
+    assert list(read_summary(summary_path)["total_npv"]) == [5, 6]
+
+    excel_path = export_summary_to_excel(summary_path, tmp_path / "Export.xlsx")
+    assert pd.read_excel(excel_path).shape == (2, 3)
+
+    # Concurrent appends from several processes
+    if summary_format == "sqlite":
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(
+                executor.map(
+                    _append_runs,
+                    [summary_path] * 4,
+                    [range(i * 10, (i + 1) * 10) for i in range(4)],
+                )
+            )
+        summary = read_summary(summary_path)
+        assert len(summary) == 42
+        assert set(summary["monte_carlo_run"]) == set(range(40)) | {0, 1}
@@ -1,10 +1,14 @@
+import os
 import warnings
 
 import pytest
 from pathlib import Path
 from pyomo.environ import ConcreteModel, Set, Constraint, TerminationCondition
+import h5py
 import json
 import numpy as np
+import pandas as pd
+import statsmodels.api as sm
 
 from tests.utilities import (
     make_climate_data,
@@ -15,6 +19,24 @@ from adopt_net0.components.technologies.technology import Technology
 from adopt_net0.data_management.utilities import open_json, select_technology
 from adopt_net0.components.utilities import annualize
 from adopt_net0.components.utilities import perform_disjunct_relaxation
+from adopt_net0.components.technologies.genericTechnologies import (
+    capacity_factors as capacity_factor_module,
+)
+from adopt_net0.components.technologies.genericTechnologies.capacity_factors import (
+    CAPACITY_FACTOR_CACHE_FOLDER,
+    set_capacity_factor_cache_path,
+)
+from adopt_net0.components.technologies.specificTechnologies.dac_adsorption import (
+    PERFORMANCE_DATA_PATH,
+    PERFORMANCE_VARIABLES,
+    get_performance_interpolators,
+)
+from adopt_net0.components.technologies.utilities import (
+    fit_linear_function,
+    fit_linear_function_vectorised,
+    fit_piecewise_function,
+    fit_piecewise_function_vectorised,
+)
 
 
 def define_technology(
@@ -279,6 +301,52 @@ def test_res_pv(request):
     assert termination == TerminationCondition.optimal
 
 
+@pytest.fixture
+def capacity_factor_cache(tmp_path):
+    """
+    Caches capacity factors in tmp_path (starting with an empty memory cache) and
+    restores the global cache state afterwards
+    """
+    disk_cache_path = capacity_factor_module._disk_cache_path
+    memory_cache = dict(capacity_factor_module._memory_cache)
+    capacity_factor_module._memory_cache.clear()
+    set_capacity_factor_cache_path(tmp_path)
+    try:
+        yield tmp_path
+    finally:
+        set_capacity_factor_cache_path(disk_cache_path)
+        capacity_factor_module._memory_cache.clear()
+        capacity_factor_module._memory_cache.update(memory_cache)
+
+
+@pytest.mark.technologies
+def test_res_capacity_factor_cache(request, capacity_factor_cache):
+    """
+    tests caching of capacity factors of pv and wind turbines
+    """
+    tmp_path = capacity_factor_cache
+    capacity_factors = {}
+    for technology in ["TestTec_ResPhotovoltaic", "TestTec_WindTurbine"]:
+        tec = define_technology(
+            technology, 5, request.config.technology_data_folder_path
+        )
+        capacity_factors[technology] = tec.processed_coeff.time_dependent_full[
+            "capfactor"
+        ]
+    assert len(os.listdir(tmp_path / CAPACITY_FACTOR_CACHE_FOLDER)) == 2
+
+    # Read from disk
+    capacity_factor_module._memory_cache.clear()
+    for technology in ["TestTec_ResPhotovoltaic", "TestTec_WindTurbine"]:
+        tec = define_technology(
+            technology, 5, request.config.technology_data_folder_path
+        )
+        np.testing.assert_array_equal(
+            capacity_factors[technology],
+            tec.processed_coeff.time_dependent_full["capfactor"],
+        )
+
+
 @pytest.mark.technologies
 def test_res_wt(request):
     """
@@ -946,6 +1014,27 @@ def test_dac(request):
     assert model.var_capex.value > 0
 
 
+def test_dac_performance_interpolation():
+    """
+    tests that the DAC performance interpolators are built once and reproduce the
+    performance data at the data points
+    """
+    min_temp_air, nr_points, interpolators = get_performance_interpolators(
+        PERFORMANCE_DATA_PATH
+    )
+    assert get_performance_interpolators(PERFORMANCE_DATA_PATH)[2] is interpolators
+
+    performance_data = pd.read_csv(PERFORMANCE_DATA_PATH, sep=",")
+    point_data = performance_data[performance_data.Point == 1]
+    performance = np.empty(
+        shape=(len(point_data), nr_points, len(PERFORMANCE_VARIABLES))
+    )
+    for points, interpolator in interpolators:
+        performance[:, points - 1, :] = interpolator(point_data["T"], point_data["RH"])
+    assert min_temp_air == performance_data["T"].min()
+    assert np.allclose(performance[:, 0, 0], point_data["CO2_Out"] / 1000)
+
+
 def test_hydro_open(request):
     """
     tests Open Hydro
@@ -1025,6 +1114,27 @@ def test_heat_pump(request):
         assert model.var_input_tot[1, "electricity"].value >= 0.1
 
 
+def test_fit_functions_vectorised():
+    """
+    Tests that vectorised fitting gives the same coefficients as fitting each
+    series separately
+    """
+    x = np.linspace(0.2, 1, 9)
+    Y = np.array([x**2, 2 * x**2 + 1, np.sqrt(x)])
+
+    # Linear
+    coeff = fit_linear_function_vectorised(sm.add_constant(x), Y)
+    for idx, y in enumerate(Y):
+        assert np.allclose(coeff[idx], fit_linear_function(sm.add_constant(x), y))
+
+    # Piecewise (breakpoints of the first series are used for all series)
+    fit_single = fit_piecewise_function(x, {idx: y for idx, y in enumerate(Y)}, 2)
+    fit = fit_piecewise_function_vectorised(x, Y, 2, bp_x=fit_single[0]["bp_x"])
+    for idx in range(len(Y)):
+        assert np.allclose(fit["alpha1"][idx], fit_single[idx]["alpha1"], rtol=1e-3)
+        assert np.allclose(fit["alpha2"][idx], fit_single[idx]["alpha2"], rtol=1e-3)
+
+
 def test_gasturbine(request):
     """
     tests Gas Turbine
@@ -1118,3 +1228,36 @@ def test_ccs(request):
     assert round(model.var_input_tot[1, "electricity"].value, 3) >= 0.001
     assert cost_ccs > cost_no_ccs * 1.01
     assert emissions_ccs < emissions_no_ccs * 0.11
+
+
+def test_ccs_results(request, tmp_path):
+    """
+    tests that the operation of CCS is written to the results
+    """
+    time_steps = 2
+    technology = "TestTec_Conv1_ccs"
+    tec = define_technology(
+        technology, time_steps, request.config.technology_data_folder_path
+    )
+
+    model = construct_tec_model(tec, nr_timesteps=time_steps)
+    model.test_const_output = Constraint(
+        model.set_t, rule=lambda m, t: m.var_output_tot[t, "electricity"] == 1
+    )
+    termination = run_model(model, request.config.solver, objective="emissions")
+    assert termination == TerminationCondition.optimal
+
+    with h5py.File(tmp_path / "optimization_results.h5", "w") as f:
+        tec.write_results_tec_operation(f.create_group("operation"), model)
+
+        for car in model.set_input_carriers_ccs:
+            assert np.allclose(
+                f["operation"][f"{car}_var_input_ccs"][:],
+                [model.var_input_ccs[t, car].value for t in model.set_t],
+            )
+        for car in model.set_output_carriers_ccs:
+            assert np.allclose(
+                f["operation"][f"{car}_var_output_ccs"][:],
+                [model.var_output_ccs[t, car].value for t in model.set_t],
+            )
+        assert f["operation/CO2captured_var_output_ccs"][:].sum() > 0